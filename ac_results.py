@@ -0,0 +1,213 @@
+"""
+AC Results — parsing of Assetto Corsa result files.
+
+Two formats exist in the wild:
+  • classic  Documents/Assetto Corsa/results/<date>_<SESSION>.json
+             {Type, TrackName, TrackConfig, Result: [...], Laps: [...]}
+  • race_out Documents/Assetto Corsa/out/race_out.json (Content Manager)
+             {track, players: [...], sessions: [{type, laps, raceResult, ...}]}
+
+Both are normalised to the classic shape — a results list of
+{DriverName, CarModel, Laps, BestLap, TotalTime} in finishing order plus a
+data dict with a top-level 'Laps' array — so the live race reader, the debrief
+and the bulk importer all share one parser.
+"""
+
+import json
+import os
+
+# race_out.json session.type → classic Type string
+SESSION_TYPES = {1: 'PRACTICE', 2: 'QUALIFY', 3: 'RACE'}
+
+
+def load_json(path):
+    """Read a result file; returns None if it is missing or not valid JSON."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def result_key(path, mtime=None):
+    """Stable identity of a result file (name + whole-second mtime)."""
+    if mtime is None:
+        mtime = os.path.getmtime(path)
+    return f"{os.path.basename(path)}|{int(mtime)}"
+
+
+def _race_out_session_type(session):
+    stype = SESSION_TYPES.get(session.get('type'))
+    return stype or (session.get('name') or '').upper()
+
+
+def parse_race_out(raw, session_type='RACE'):
+    """Convert the last *session_type* session of a race_out.json dict.
+
+    Returns (data, results) in classic shape, or None if the file has no such
+    session.  results is empty when the session has no classification yet.
+    """
+    if not isinstance(raw, dict):
+        return None
+    players  = raw.get('players', [])
+    sessions = raw.get('sessions', [])
+    if not players or not sessions:
+        return None
+
+    # Take the last matching session if there are several
+    session = None
+    for s in reversed(sessions):
+        if isinstance(s, dict) and _race_out_session_type(s) == session_type:
+            session = s
+            break
+    if session is None:
+        return None
+
+    laps_raw = session.get('laps', [])
+
+    # Group laps by car index
+    car_laps = {}
+    for lap in laps_raw:
+        ci = lap.get('car')
+        if ci is not None:
+            car_laps.setdefault(ci, []).append(lap)
+
+    # Best-lap lookup per car
+    best_laps_raw = {bl['car']: bl['time'] for bl in session.get('bestLaps', [])
+                     if isinstance(bl, dict)}
+
+    # Race sessions are classified by raceResult; other sessions by best lap
+    order = session.get('raceResult', [])
+    if session_type != 'RACE' and not order:
+        order = sorted(best_laps_raw, key=best_laps_raw.get)
+
+    results = []
+    for car_idx in order:
+        if not isinstance(car_idx, int) or car_idx >= len(players):
+            continue
+        p = players[car_idx]
+        p_laps = car_laps.get(car_idx, [])
+        results.append({
+            'DriverName': p.get('name', ''),
+            'CarModel':   p.get('car', ''),
+            'Laps':       len(p_laps),
+            'BestLap':    best_laps_raw.get(car_idx, 0),
+            'TotalTime':  sum(l.get('time', 0) for l in p_laps),
+            '_car_idx':   car_idx,
+        })
+
+    # Build a top-level 'Laps' array in classic format for debrief analysis
+    classic_laps = []
+    for lap in laps_raw:
+        ci = lap.get('car')
+        if ci is None or ci >= len(players):
+            continue
+        classic_laps.append({
+            'DriverName': players[ci].get('name', ''),
+            'LapTime':    lap.get('time', 0),
+            'Sectors':    lap.get('sectors', []),
+            'Cuts':       lap.get('cuts', 0),
+            'Tyre':       lap.get('tyre', ''),
+            'CarModel':   players[ci].get('car', ''),
+        })
+
+    data = {'Laps': classic_laps, '_source': 'race_out'}
+    return data, results
+
+
+def session_type(raw):
+    """Classify a parsed result file: 'RACE', 'QUALIFY', 'PRACTICE', … or ''."""
+    if not isinstance(raw, dict):
+        return ''
+    if 'Type' in raw:
+        return str(raw.get('Type') or '').upper()
+    sessions = raw.get('sessions') or []
+    types = [_race_out_session_type(s) for s in sessions if isinstance(s, dict)]
+    if 'RACE' in types:
+        return 'RACE'
+    return types[-1] if types else ''
+
+
+def track_id(raw):
+    """Track id in config.json style ('ks_brands_hatch/gp', 'monza')."""
+    if not isinstance(raw, dict):
+        return ''
+    if 'TrackName' in raw:
+        name, layout = raw.get('TrackName') or '', raw.get('TrackConfig') or ''
+    else:
+        name = raw.get('track') or ''
+        layout = raw.get('track_config') or raw.get('config') or ''
+    if layout and '/' not in name:
+        return f'{name}/{layout}'
+    return name
+
+
+def parse_result(raw):
+    """Normalise either format.  Returns (type, data, results) or None."""
+    stype = session_type(raw)
+    if not stype:
+        return None
+    if 'Type' in raw:
+        results = raw.get('Result') or []
+        return stype, raw, [r for r in results if isinstance(r, dict)]
+    parsed = parse_race_out(raw, stype)
+    if parsed is None:
+        return None
+    return (stype,) + parsed
+
+
+def find_driver(results, driver_names):
+    """First result row whose DriverName matches any of *driver_names*.
+
+    Returns (row, position) — position is 1-based — or (None, None).
+    """
+    wanted = {n.lower() for n in driver_names if n}
+    for i, r in enumerate(results):
+        if (r.get('DriverName') or '').lower() in wanted:
+            return r, i + 1
+    return None, None
+
+
+def summarise_file(path, driver_names):
+    """Parse one result file for bulk import.
+
+    Module-level and return-value-only so it can run in a thread or process
+    pool.  Returns a dict with 'status': 'ok' | 'error' | 'unknown', the
+    session type, track, and — when the player drove — their classification
+    and the race laps (classic shape).
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {'path': path, 'status': 'error'}
+    raw = load_json(path)
+    if raw is None:
+        return {'path': path, 'status': 'error'}
+    parsed = parse_result(raw)
+    if parsed is None:
+        return {'path': path, 'status': 'unknown'}
+    stype, data, results = parsed
+
+    summary = {
+        'path':   path,
+        'status': 'ok',
+        'key':    result_key(path, mtime),
+        'mtime':  mtime,
+        'type':   stype,
+        'track':  track_id(raw),
+        'field':  len(results),
+    }
+    row, position = find_driver(results, driver_names)
+    if row is None:
+        return summary
+    summary.update({
+        'position':   position,
+        'car':        row.get('CarModel', ''),
+        'best_lap':   row.get('BestLap', 0) or 0,
+        'laps_done':  row.get('Laps', 0) or 0,
+        'total_time': row.get('TotalTime', 0) or 0,
+        'driver':     row.get('DriverName', ''),
+    })
+    if stype == 'RACE':
+        summary['laps'] = data.get('Laps', [])
+    return summary
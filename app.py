@@ -3,14 +3,15 @@ AC Career Manager - Flask Backend
 Main application entry point
 """
 
-from flask import Flask, render_template, jsonify, request, send_file, abort
+import startup_profile      # first: starts the --startup-profile clock
+from flask import Flask, Response, render_template, jsonify, request, send_file, abort
 from flask_cors import CORS
 import base64
+import functools
 import json
 import os
 import subprocess
 import sys
-import statistics
 import threading
 import random
 import zlib
@@ -18,6 +19,9 @@ from datetime import datetime
 from urllib.parse import urlsplit
 
 from career_manager import CareerManager
+from career_ids import expand_career, intern_career
+from career_state import CareerState, StaleWriteError, atomic_write
+from content_index import ContentIndex
 from driver_progress import (
     DRIVER_SKILL_KEYS,
     _seed_int,
@@ -31,14 +35,26 @@ from driver_progress import (
     update_rivalries,
 )
 from achievements import check_achievements, ACHIEVEMENTS, ACHIEVEMENT_ORDER
+import ac_results
+import json_patch
+from jobs import JobRegistry
+from lap_archive import LapArchive
+import pagination
+from results_retention import ResultsRetention, retention_policy
+from revisions import ReadCache, RevisionTracker, SnapshotStore, delta_token
+from thumbnails import ThumbnailCache
+from debrief import analyse_race
+from race_plan import RacePlanner
+from environment import EnvironmentProbe
 from platform_paths import (
     detect_ac_install_path,
-    get_ac_docs_path,
     get_default_ac_install_path,
     get_user_data_dir,
     get_webview_gui,
 )
 
+startup_profile.mark('imports')
+
 # ---------------------------------------------------------------------------
 # Path helpers — work both as script and as frozen EXE
 # ---------------------------------------------------------------------------
@@ -109,22 +125,54 @@ def _decode_save(blob: bytes) -> dict:
 
 APP_DIR  = get_app_dir()
 DATA_DIR = get_user_data_dir()
-os.makedirs(DATA_DIR, exist_ok=True)
 
 CONFIG_PATH = os.path.join(DATA_DIR, 'config.json')
 DATA_PATH   = os.path.join(DATA_DIR, 'career_data.sav')
-
-_migrate_legacy_files()
-ensure_config()
+IMPORT_LEDGER_PATH = os.path.join(DATA_DIR, 'import_ledger.json')
+
+_data_dir_ready = False
+_data_dir_lock  = threading.Lock()
+
+
+def prepare_data_dir():
+    """Data dir, legacy-file migration and the default config.json, run on
+    first use of the config or the career save instead of at import:
+    career_cli.py, results_import.py and the tools import app without
+    touching the data dir until a command needs it."""
+    global _data_dir_ready
+    if _data_dir_ready:
+        return
+    with _data_dir_lock:
+        if not _data_dir_ready:
+            os.makedirs(DATA_DIR, exist_ok=True)
+            _migrate_legacy_files()
+            ensure_config()
+            _data_dir_ready = True
 
 # ---------------------------------------------------------------------------
 # Flask app
 # ---------------------------------------------------------------------------
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
-ALLOWED_WEB_ORIGINS = {'http://127.0.0.1:5000', 'http://localhost:5000'}
+# Preferred UI port; the embedded server picks a free one when it is taken
+DEFAULT_PORT = 5000
+ALLOWED_WEB_ORIGINS = {f'http://127.0.0.1:{DEFAULT_PORT}', f'http://localhost:{DEFAULT_PORT}'}
 CORS(app, resources={r'/api/*': {'origins': list(ALLOWED_WEB_ORIGINS)}})
 
+
+def allow_web_origins(origins):
+    """Accept write requests (and CORS) from *origins* (call before serving)."""
+    origins = set(origins) - ALLOWED_WEB_ORIGINS
+    if origins:
+        ALLOWED_WEB_ORIGINS.update(origins)
+        CORS(app, resources={r'/api/*': {'origins': sorted(origins)}})
+
+
+def allow_local_port(port):
+    """Accept the local UI origins on *port* (call before serving)."""
+    allow_web_origins([f'http://127.0.0.1:{port}', f'http://localhost:{port}'])
+
+
 TRACK_NAMES = {
     'ks_silverstone/national':         'Silverstone National',
     'ks_brands_hatch/indy':            'Brands Hatch Indy',
@@ -175,21 +223,36 @@ def guard_api_write_origin():
 # ---------------------------------------------------------------------------
 
 def load_config():
+    prepare_data_dir()
     with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
 def save_config(cfg):
-    with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
-        json.dump(cfg, f, indent=2)
+    prepare_data_dir()
+    with _config_lock:
+        atomic_write(CONFIG_PATH, json.dumps(cfg, indent=2).encode('utf-8'))
+        config_revision.written()
 
 
 def load_career_data():
+    """Private copy of the current career (see career_state.py)."""
+    return career_state.load()
+
+
+def save_career_data(data):
+    """Save *data*; StaleWriteError (→ 409) if another request saved since
+    it was loaded."""
+    career_state.save(data)
+
+
+def _read_career_file():
+    prepare_data_dir()
     # Encoded save file (.sav) — primary format
     if os.path.exists(DATA_PATH):
         with open(DATA_PATH, 'rb') as f:
             try:
-                return _decode_save(f.read())
+                return expand_career(_decode_save(f.read()))
             except Exception:
                 return _default_career()
     # Legacy plain JSON — migration from pre-v1.21.2 or old EXE-dir installs.
@@ -199,7 +262,7 @@ def load_career_data():
         try:
             with open(legacy, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            save_career_data(data)
+            career_state.replace(data)
             try:
                 os.remove(legacy)
             except OSError:
@@ -210,9 +273,78 @@ def load_career_data():
     return _default_career()
 
 
-def save_career_data(data):
-    with open(DATA_PATH, 'wb') as f:
-        f.write(_encode_save(data))
+def _write_career_file(data):
+    # Every save is a new revision; in-memory caches (race plans, read
+    # endpoint bodies) key on it.
+    prepare_data_dir()
+    data['revision'] = career_revision.next_revision(data.get('revision'))
+    atomic_write(DATA_PATH, _encode_save(intern_career(data)))
+    career_revision.written(data['revision'])
+
+
+def _stored_career_revision():
+    """Revision recorded in the save file (decodes it; see revisions.py)."""
+    try:
+        with open(DATA_PATH, 'rb') as f:
+            return _decode_save(f.read()).get('revision', 0)
+    except Exception:
+        return 0
+
+
+career_revision = RevisionTracker(DATA_PATH, _stored_career_revision)
+config_revision = RevisionTracker(CONFIG_PATH)
+career_state    = CareerState(_read_career_file, _write_career_file, career_revision.get)
+_config_lock    = threading.Lock()
+read_cache      = ReadCache()
+snapshots       = SnapshotStore()
+# ETags are only valid for this process (response shapes change between versions)
+_BOOT_ID = os.urandom(4).hex()
+
+
+def _revision_cached(view, content=False):
+    """For GET endpoints that depend only on the career save and config.
+
+    The ETag is (career revision, config revision): a matching If-None-Match
+    gets a 304 before the save is loaded, and bodies are memoized per
+    (endpoint, args, revisions).  content=True adds the content index
+    revision (see _content_revision_cached).
+    """
+    def _revs():
+        revs = (career_revision.get(), config_revision.get())
+        if content:
+            ac_path = career.config.get('paths', {}).get('ac_install', '')
+            revs += (content_index.ensure(ac_path).revision if ac_path else None,)
+        return revs
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        revs = _revs()
+        etag = '-'.join([_BOOT_ID] + [str(r) for r in revs])
+        if request.if_none_match.contains_weak(etag):
+            resp = Response(status=304)
+        else:
+            key = (request.endpoint, tuple(sorted((request.view_args or {}).items())),
+                   tuple(sorted(request.args.items(multi=True))), revs)
+            hit = read_cache.get(key)
+            if hit is None:
+                resp = app.make_response(view(*args, **kwargs))
+                # Not cacheable if the view (or another request) saved meanwhile
+                if resp.status_code != 200 or _revs() != revs:
+                    return resp
+                hit = (resp.get_data(), resp.mimetype)
+                read_cache.put(key, hit)
+            resp = Response(hit[0], mimetype=hit[1])
+        resp.set_etag(etag, weak=True)
+        resp.headers['Cache-Control'] = 'no-cache'
+        return resp
+    return wrapper
+
+
+def _content_revision_cached(view):
+    """_revision_cached for bodies that also depend on the installed AC
+    content: standings and driver profiles leave out teams whose car is
+    not installed (CareerManager._is_car_usable)."""
+    return _revision_cached(view, content=True)
 
 
 
@@ -706,21 +838,6 @@ def _get_career_tracks(tier_key, tier_info, career_data):
     return ct.get(tier_key) or tier_info['tracks']
 
 
-def _parse_length(raw):
-    """Parse track length from ui_track.json — may be int, float, or string."""
-    if not raw:
-        return 0
-    if isinstance(raw, (int, float)):
-        return int(raw)
-    s = str(raw).strip().lower().replace(',', '.').replace(' ', '')
-    s = s.replace('km', '').replace('m', '')
-    try:
-        val = float(s)
-        return int(val * 1000 if val < 100 else val)
-    except ValueError:
-        return 0
-
-
 def _fmt_lap_ms(ms):
     """Format a lap time from milliseconds → MM:SS.mmm string."""
     if not ms or ms <= 0:
@@ -730,11 +847,16 @@ def _fmt_lap_ms(ms):
     return f'{mins}:{secs:06.3f}'
 
 
-def _generate_engineer_report(position, total_drivers, valid_laps):
-    """Generate a short engineer debrief text from race result + individual lap times."""
+def _generate_engineer_report(position, total_drivers, valid_laps, degradation=None):
+    """Generate a short engineer debrief text from race result + individual lap times.
+
+    degradation: optional {'slope_ms_per_lap', 'trend'} from debrief.analyse_race;
+    when given, the pace-trend comment uses the regression instead of thirds.
+    """
     if not valid_laps or len(valid_laps) < 2:
         return 'Not enough lap data for analysis.'
 
+    import statistics   # deferred: pulls in fractions / decimal, only needed here
     std_ms = statistics.stdev(valid_laps)
 
     # Position comment
@@ -762,7 +884,15 @@ def _generate_engineer_report(position, total_drivers, valid_laps):
     # Pace trend: compare first third vs last third (only if enough laps)
     n = len(valid_laps)
     trend_msg = ''
-    if n >= 6:
+    if degradation and n >= 6:
+        slope = degradation.get('slope_ms_per_lap', 0)
+        if degradation.get('trend') == 'improving':
+            trend_msg = f'You found ~{abs(slope) / 1000:.2f}s per lap as the race progressed – great tyre management.'
+        elif degradation.get('trend') == 'degrading':
+            trend_msg = f'Lap times drifted up ~{slope / 1000:.2f}s per lap over the stint – possible tyre wear.'
+        else:
+            trend_msg = 'Pace was stable throughout – solid race management.'
+    elif n >= 6:
         third     = n // 3
         early_avg = sum(valid_laps[:third]) / third
         late_avg  = sum(valid_laps[-third:]) / third
@@ -793,8 +923,84 @@ def _effective_tier_info(tier_key, tier_info, career_data):
 # ---------------------------------------------------------------------------
 # Initialise career manager
 # ---------------------------------------------------------------------------
-config = load_config()
-career = CareerManager(config)
+jobs          = JobRegistry()
+content_index = ContentIndex(os.path.join(DATA_DIR, 'content_index.json'), jobs=jobs)
+# The config is read when the career manager first needs it, not at import
+career = CareerManager(load_config, content_index=content_index)
+lap_archive       = LapArchive(os.path.join(DATA_DIR, 'lap_archive'))
+results_retention = ResultsRetention(os.path.join(DATA_DIR, 'results_archive'))
+thumbnails        = ThumbnailCache(os.path.join(DATA_DIR, 'thumbnails'))
+environment       = EnvironmentProbe()
+race_planner      = RacePlanner(career)
+_live_telemetry   = None
+_live_telemetry_lock = threading.Lock()
+
+
+def get_live_telemetry():
+    """The UDP telemetry listener, created on first use: live_telemetry.py
+    pulls in asyncio, which no other start-up path needs."""
+    global _live_telemetry
+    with _live_telemetry_lock:
+        if _live_telemetry is None:
+            from live_telemetry import LiveTelemetry
+            _live_telemetry = LiveTelemetry()
+        return _live_telemetry
+
+
+def _migrate_career_save():
+    """One-time upgrades of an existing save, run at startup so that read
+    endpoints never have to write: paddock news backfilled from race results
+    (saves from before the news feed) and driver progress for every driver."""
+    if not os.path.exists(DATA_PATH):
+        return
+    # Under the write lock: may run while requests are already served
+    with career_state.lock:
+        career_data = load_career_data()
+        if not career_data.get('team'):
+            # No career started (or an unreadable save — never overwrite that)
+            return
+        if _upgrade_career_save(career_data):
+            save_career_data(career_data)
+
+
+def _upgrade_career_save(career_data):
+    changed = False
+    if not career_data.get('paddock_news') and career_data.get('race_results'):
+        tier_key = career.tiers[career_data.get('tier', 0)]
+        _tier_labels = {'mx5_cup': 'MX5 Cup', 'gt4': 'GT4 SuperCup', 'gt3': 'British GT GT3', 'wec': 'WEC / Elite'}
+        tier_label = _tier_labels.get(tier_key, tier_key)
+        news = []
+        for r in career_data['race_results']:
+            pos = r.get('position', 0)
+            track = _fmt_track(r.get('track', ''))
+            pts = r.get('points', 0)
+            icon = 'trophy' if pos <= 3 else 'flag'
+            text = f"{tier_label} Rd {r.get('race',0)} at {track}: You finished P{pos} (+{pts} pts)"
+            news.append({'season': career_data.get('season', 1), 'race': r.get('race', 0),
+                         'type': 'race_result', 'text': text, 'icon': icon, 'tier': tier_key})
+        # Newest first, like _add_news
+        career_data['paddock_news'] = news[::-1]
+        changed = True
+    if ensure_driver_progress(career_data):
+        changed = True
+    return changed
+
+
+def run_startup_migrations(background=False):
+    """Save-file upgrades, kept off the import path: the server and window
+    come up first and run them on a background thread (GETs never depend on
+    them having run)."""
+    if background:
+        threading.Thread(target=run_startup_migrations, name='startup-migrations',
+                         daemon=True).start()
+        return
+    try:
+        _migrate_career_save()
+    except Exception as e:
+        print(f"Warning: career save migration failed: {e}")
+
+
+startup_profile.mark('career manager + stores')
 
 # ---------------------------------------------------------------------------
 # Routes
@@ -802,9 +1008,11 @@ career = CareerManager(config)
 
 @app.route('/')
 def index():
+    # First paint needs no extra round-trips: the dashboard payload is embedded
     career_data = load_career_data()
     cfg         = load_config()
-    return render_template('dashboard.html', career_data=career_data, config=cfg)
+    return render_template('dashboard.html', career_data=career_data, config=cfg,
+                           bootstrap=_dashboard_payload(career_data, cfg))
 
 
 @app.route('/api/setup-status')
@@ -847,17 +1055,80 @@ def save_ac_path():
     return jsonify({'status': 'success'})
 
 
+# Default /api/career-status projection: what the UI reads.  Everything that
+# grows with the career (driver_progress, driver_history, paddock_news,
+# swap_log…) is opt-in via ?include= / ?fields= or has its own endpoint.
+CAREER_STATUS_FIELDS = (
+    'tier', 'season', 'team', 'car', 'driver_name', 'player_nationality',
+    'races_completed', 'points', 'race_results', 'player_history', 'rival_name',
+    'contracts', 'final_position', 'career_settings', 'revision',
+    'total_races', 'csp_status',
+)
+# Derived fields, computed only when requested
+_CAREER_STATUS_COMPUTED = ('total_races', 'csp_status')
+# Never exposed (save-internal id table, see career_ids.py)
+_CAREER_STATUS_HIDDEN = ('ids',)
+
+
+def _project(out, key, value, rest):
+    """Add *value* (or its dotted sub-path *rest*) to *out* by reference."""
+    if not rest:
+        out[key] = value
+        return
+    if not isinstance(value, dict) or out.get(key) is value:
+        return
+    sub, _, rest = rest.partition('.')
+    if sub in value:
+        _project(out.setdefault(key, {}), sub, value[sub], rest)
+
+
+def _career_status_fields(args):
+    """Requested paths: ?fields= replaces the default projection (fields=all:
+    everything), ?include= adds to it."""
+    fields = list(CAREER_STATUS_FIELDS)
+    if args.get('fields'):
+        fields = [f.strip() for f in args['fields'].split(',') if f.strip()]
+    if args.get('include'):
+        fields += [f.strip() for f in args['include'].split(',') if f.strip()]
+    return fields
+
+
+def _career_status_payload(career_data, cfg, fields=CAREER_STATUS_FIELDS):
+    """Projection of the career for the UI.  *fields* are top-level keys or
+    dotted paths (career_settings.weather_mode); values are referenced, not
+    copied, so only what is requested gets serialized."""
+    ac_path = cfg.get('paths', {}).get('ac_install', '')
+    _warm_tier_liveries(career_data, ac_path)
+    if 'all' in fields:
+        fields = list(career_data) + list(_CAREER_STATUS_COMPUTED) + list(fields)
+    out = {}
+    for path in dict.fromkeys(fields):
+        head, _, rest = path.partition('.')
+        if head in _CAREER_STATUS_HIDDEN:
+            continue
+        if head == 'total_races':
+            value = career.get_tier_races(career_data)
+        elif head == 'csp_status':
+            value = detect_csp(ac_path)
+        elif head in career_data:
+            value = career_data[head]
+        else:
+            continue
+        _project(out, head, value, rest)
+    return out
+
+
 @app.route('/api/career-status')
 def get_career_status():
-    career_data = load_career_data()
-    career_data['total_races'] = career.get_tier_races(career_data)
-    cfg = load_config()
-    ac_path = cfg.get('paths', {}).get('ac_install', '')
-    career_data['csp_status'] = detect_csp(ac_path)
-    return jsonify(career_data)
+    """Lean career status (CAREER_STATUS_FIELDS).  ?include=driver_progress,
+    paddock_news adds sections; ?fields= picks exact paths; ?fields=all
+    returns the whole career."""
+    return jsonify(_career_status_payload(load_career_data(), load_config(),
+                                          _career_status_fields(request.args)))
 
 
 @app.route('/api/standings')
+@_content_revision_cached
 def get_standings():
     career_data = load_career_data()
     tier_info   = career.get_tier_info(career_data['tier'])
@@ -870,29 +1141,57 @@ def get_standings():
 
 
 @app.route('/api/all-standings')
+@_content_revision_cached
 def get_all_standings():
-    career_data = load_career_data()
-    all_s, tier_progress = career.generate_all_standings(career_data)
+    return jsonify(_all_standings_payload(load_career_data()))
+
+
+def _annotate_form(career_data, tier_data):
+    """Annotate each driver entry with their form score."""
     form_scores = career_data.get('form_scores', {})
-    # Annotate each driver entry with their form score
-    for tier_data in all_s.values():
-        for entry in tier_data.get('drivers', []):
-            dname = entry.get('driver', '')
-            if dname in form_scores:
-                entry['form_score'] = round(form_scores[dname], 2)
-    return jsonify({
+    for entry in tier_data.get('drivers', []):
+        dname = entry.get('driver', '')
+        if dname in form_scores:
+            entry['form_score'] = round(form_scores[dname], 2)
+    return tier_data
+
+
+def _all_standings_payload(career_data, tiers=None):
+    """Standings payload; *tiers* limits which tiers get drivers / teams
+    (tier_progress always covers all of them — it is cheap)."""
+    tiers = career.tiers if tiers is None else tiers
+    all_s = {tk: _annotate_form(career_data, career.generate_tier_standings(career_data, tk))
+             for tk in tiers}
+    return {
         'all_standings':   all_s,
-        'tier_progress':   tier_progress,
+        'tier_progress':   career.get_tier_progress(career_data),
         'current_tier':    career_data.get('tier', 0),
         'races_completed': career_data.get('races_completed', 0),
         'total_races':     career.get_tier_races(career_data),
-    })
+    }
+
+
+@app.route('/api/standings/<tier_key>')
+@_content_revision_cached
+def get_tier_standings(tier_key):
+    """One tier's drivers / teams / progress (standings tabs load lazily)."""
+    if tier_key not in career.tiers:
+        return jsonify({'status': 'error', 'message': f'Unknown tier: {tier_key}'}), 404
+    career_data = load_career_data()
+    tier_data   = _annotate_form(career_data, career.generate_tier_standings(career_data, tier_key))
+    return jsonify(dict(tier_data,
+                        tier_key=tier_key,
+                        progress=career.get_tier_progress(career_data)[tier_key],
+                        revision=career_data.get('revision', 0)))
 
 
 @app.route('/api/season-calendar')
+@_revision_cached
 def get_season_calendar():
-    career_data    = load_career_data()
-    cfg            = load_config()
+    return jsonify(_season_calendar_payload(load_career_data(), load_config()))
+
+
+def _season_calendar_payload(career_data, cfg):
     tier_key       = career.tiers[career_data['tier']]
     tier_info      = cfg['tiers'][tier_key]
     tracks         = _get_career_tracks(tier_key, tier_info, career_data)
@@ -917,174 +1216,309 @@ def get_season_calendar():
             'status':     status,
             'result':     result,
         })
-    return jsonify(cal)
+    return cal
+
+
+def _race_plan(career_data, cfg=None):
+    """Deterministic plan for the player's next race (see race_plan.py)."""
+    cfg        = cfg or load_config()
+    ac_path    = cfg.get('paths', {}).get('ac_install', '')
+    tier_index = career_data['tier']
+    tier_key   = career.tiers[tier_index]
+    tier_info  = _effective_tier_info(tier_key, career.get_tier_info(tier_index), career_data)
+    content_rev = content_index.ensure(ac_path).revision if ac_path else None
+    return race_planner.plan(career_data, tier_key, tier_info, ac_path=ac_path,
+                             content_revision=content_rev)
+
+
+def _next_race_payload(career_data, cfg=None):
+    plan = _race_plan(career_data, cfg)
+    return dict(plan['race'], grid_position=plan['grid_position'])
 
 
 @app.route('/api/next-race')
 def get_next_race():
-    career_data  = load_career_data()
-    cfg          = load_config()
-    tier_index   = career_data['tier']
-    tier_key     = career.tiers[tier_index]
-    tier_info    = _effective_tier_info(tier_key, career.get_tier_info(tier_index), career_data)
-    race_num     = career_data['races_completed'] + 1
-    season       = career_data.get('season', 1)
-    cs           = career_data.get('career_settings') or {}
-    weather_mode = cs.get('weather_mode', 'realistic')
-    if not cs.get('dynamic_weather', True):
-        weather_mode = 'always_clear'
-    night_cycle  = cs.get('night_cycle', True)
-    race = career.generate_race(tier_info, race_num, career_data['team'], career_data['car'],
-                                tier_key=tier_key, season=season, weather_mode=weather_mode,
-                                night_cycle=night_cycle, career_data=career_data)
-    ai_offset = cs.get('ai_offset', 0)
-    if ai_offset:
-        race['ai_difficulty'] = max(60, min(100, race['ai_difficulty'] + ai_offset))
-    return jsonify(race)
+    return jsonify(_next_race_payload(load_career_data()))
+
+
+# /api/dashboard sections, in the order the UI applies them
+DASHBOARD_FIELDS = ('career', 'config', 'standings', 'calendar', 'preflight', 'next_race')
+# Sections /api/dashboard?since= can send as a JSON Patch
+DELTA_FIELDS = ('career', 'standings')
+
+
+def _dashboard_payload(career_data, cfg, fields=DASHBOARD_FIELDS, since=None):
+    """Everything the main view loads, built from one career snapshot.
+
+    Sections that depend on the AC install (preflight, next_race) are None
+    when they cannot be built, as are next_race between seasons.
+
+    since: 'delta_token' of a response the client already holds.  DELTA_FIELDS
+    sections whose snapshot under that token is still retained are sent under
+    'patches' as RFC 6902 operations instead of in full.  The token covers the
+    sections' content, not just the career revision: the career section also
+    depends on the config and on CSP detection, which change without a save.
+    """
+    revision = career_data.get('revision', 0)
+    out = {'revision': revision}
+
+    sections = {}
+    if 'career' in fields:
+        sections['career'] = json.dumps(_career_status_payload(career_data, cfg))
+    if 'standings' in fields:
+        # Only the player's tier; the other tabs use /api/standings/<tier_key>
+        sections['standings'] = json.dumps(_all_standings_payload(
+            career_data, tiers=[career.tiers[career_data.get('tier', 0)]]))
+    if sections:
+        token = delta_token(revision, config_revision.get(), sections)
+        out['delta_token'] = token
+    for section, text in sections.items():
+        current = snapshots.put(section, token, text)
+        base = snapshots.get(section, since) if since else None
+        patch = json_patch.diff(base, current) if base is not None else None
+        # A patch that would not be smaller than the section itself is not worth it
+        if patch is None or len(json.dumps(patch)) >= len(text):
+            out[section] = current
+        else:
+            out.setdefault('patches', {})[section] = patch
+
+    if 'config' in fields:
+        out['config'] = cfg
+    if 'calendar' in fields:
+        out['calendar'] = _season_calendar_payload(career_data, cfg)
+    if 'preflight' in fields:
+        try:
+            out['preflight'] = _preflight_season_payload(career_data, cfg)
+        except Exception as e:
+            print(f"Dashboard preflight failed: {e}")
+            out['preflight'] = None
+    if 'next_race' in fields:
+        out['next_race'] = None
+        if not career_data.get('contracts') and career_data.get('final_position') is None:
+            try:
+                out['next_race'] = _next_race_payload(career_data, cfg)
+            except Exception as e:
+                print(f"Dashboard next-race preview failed: {e}")
+    return out
+
+
+@app.route('/api/dashboard')
+def dashboard():
+    """Career status, config, the player's tier standings (plus every tier's
+    progress), calendar, season preflight and the next-race preview in one
+    response (one save decode).
+
+    ?fields=career,standings,... limits the sections (see DASHBOARD_FIELDS).
+    ?since=<delta_token> returns career / standings as patches against the
+    payloads of the response that carried that token when the server still
+    has them (see _dashboard_payload); otherwise they come in full.
+    """
+    fields = DASHBOARD_FIELDS
+    if request.args.get('fields'):
+        fields = tuple(f.strip() for f in request.args['fields'].split(',') if f.strip())
+        unknown = [f for f in fields if f not in DASHBOARD_FIELDS]
+        if unknown:
+            return jsonify({'status': 'error',
+                            'message': f"Unknown fields: {', '.join(unknown)}"}), 400
+    since = request.args.get('since') or None
+    return jsonify(_dashboard_payload(load_career_data(), load_config(), fields, since))
 
 
 @app.route('/api/start-race', methods=['POST'])
 def start_race():
     career_data  = load_career_data()
     cfg          = load_config()
-    tier_index   = career_data['tier']
-    tier_key     = career.tiers[tier_index]
-    tier_info    = _effective_tier_info(tier_key, career.get_tier_info(tier_index), career_data)
-    race_num     = career_data['races_completed'] + 1
-    season       = career_data.get('season', 1)
-    cs           = career_data.get('career_settings') or {}
-    weather_mode = cs.get('weather_mode', 'realistic')
-    if not cs.get('dynamic_weather', True):
-        weather_mode = 'always_clear'
-    night_cycle  = cs.get('night_cycle', True)
-    race         = career.generate_race(tier_info, race_num, career_data['team'], career_data['car'],
-                                        tier_key=tier_key, season=season, weather_mode=weather_mode,
-                                        night_cycle=night_cycle, career_data=career_data)
-    ai_offset = cs.get('ai_offset', 0)
-    if ai_offset:
-        race['ai_difficulty'] = max(60, min(100, race['ai_difficulty'] + ai_offset))
-    race['driver_name'] = career_data.get('driver_name', 'Player')
     data, err = _require_json_object()
     if err:
         return err
     mode    = data.get('mode', 'race_only')
 
-    # Simulate qualifying to determine AI grid order and career standings position.
-    # The player always starts P1 in Race Only mode (AC constraint: player = CAR_0 = P1).
-    opponents     = race.get('opponents', [])
-    ai_lvl        = int(race['ai_difficulty'])
-    quali_grid    = career.simulate_qualifying(opponents, ai_lvl, career_data=career_data)
-
+    # Same plan the preview showed: opponents, weather, AI level, simulated
+    # qualifying grid (AI grid order) and skins are already resolved.
+    plan = _race_plan(career_data, cfg)
+    race = plan['race']
     success = career.launch_ac_race(race, cfg, mode=mode, career_data=career_data,
-                                    grid=quali_grid)
+                                    grid=plan['quali_grid'],
+                                    rng=race_planner.launch_rng(plan, mode))
     if success:
-        career_data['race_started_at'] = datetime.now().isoformat()
-        career_data['last_race_weather'] = race.get('weather', '3_clear')
-        save_career_data(career_data)
+        season = career_data.get('season', 1)
+        # AC is launched without the write lock held; only the bookkeeping
+        # is applied to the current save
+        with career_state.transaction() as career_data:
+            career_data['race_started_at'] = datetime.now().isoformat()
+            career_data['last_race_weather'] = race.get('weather', '3_clear')
+            career_data['race_plan'] = {
+                'race_num':      race['race_num'],
+                'season':        season,
+                'seed':          plan['seed'],
+                'track':         race['track'],
+                'laps':          race['laps'],
+                'weather':       race.get('weather', '3_clear'),
+                'ai_difficulty': race['ai_difficulty'],
+                'grid_position': plan['grid_position'],
+            }
+        _start_live_telemetry(cfg, race['driver_name'], race.get('laps', 0))
         return jsonify({'status': 'success', 'message': 'AC launched!', 'race': race})
     else:
         return jsonify({'status': 'error', 'message': 'Failed to launch AC'}), 500
 
 
+def _start_live_telemetry(cfg, driver_name, expected_laps):
+    """Listen to AC's UDP telemetry for the race just launched (config 'telemetry')."""
+    tcfg = cfg.get('telemetry') or {}
+    if not tcfg.get('enabled', True):
+        return
+    from live_telemetry import AC_TELEMETRY_PORT
+    telemetry = get_live_telemetry()
+    telemetry.host = tcfg.get('host', '127.0.0.1')
+    telemetry.port = int(tcfg.get('port', AC_TELEMETRY_PORT))
+    try:
+        telemetry.start(driver_name, expected_laps)
+    except Exception as e:
+        print(f"Warning: live telemetry unavailable: {e}")
+
+
+@app.route('/api/live/status')
+def live_status():
+    return jsonify(get_live_telemetry().snapshot())
+
+
+@app.route('/api/live/stream')
+def live_stream():
+    """Server-sent events: one 'data:' line per live state change."""
+    telemetry = get_live_telemetry()
+
+    def events():
+        version = -1
+        while True:
+            new = telemetry.wait_for_change(version, timeout=15)
+            if new == version:
+                yield ': keepalive\n\n'
+                continue
+            version = new
+            yield f'data: {json.dumps(telemetry.snapshot())}\n\n'
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/live/provisional')
+def live_provisional():
+    """Provisional classification from live telemetry (final once the player
+    has completed the race distance), with a debrief built from it."""
+    telemetry = get_live_telemetry()
+    prov = telemetry.provisional_result()
+    driver_name = telemetry.driver_name or load_career_data().get('driver_name', 'Player')
+    player_result, position = ac_results.find_driver(prov['results'], [driver_name])
+    lap_analysis = {}
+    if player_result is not None:
+        lap_analysis = _build_lap_analysis(prov['data'], prov['results'], driver_name,
+                                           player_result, position)
+    return jsonify({
+        'status':       'final' if prov['final'] else 'running',
+        'position':     position,
+        'results':      prov['results'],
+        'lap_analysis': lap_analysis,
+    })
+
+
 def _try_race_out_json(driver_name, start_time, race_seen):
     """Fallback: read out/race_out.json (Content Manager / newer AC format).
 
     Returns (data, results, player_result, player_position, race_seen) matching
     the shape expected by read_race_result().  On failure returns all-None tuple.
     """
-    out_file = os.path.join(get_ac_docs_path('out'), 'race_out.json')
+    out_file = os.path.join(environment.docs_path('out'), 'race_out.json')
     if not os.path.isfile(out_file):
         return None, [], None, None, race_seen
     mtime = datetime.fromtimestamp(os.path.getmtime(out_file))
     if mtime < start_time:
         return None, [], None, None, race_seen
 
-    try:
-        with open(out_file, 'r', encoding='utf-8') as f:
-            raw = json.load(f)
-    except Exception:
+    # Convert the RACE session to classic shape (see ac_results.parse_race_out)
+    parsed = ac_results.parse_race_out(ac_results.load_json(out_file))
+    if parsed is None:
         return None, [], None, None, race_seen
 
-    players  = raw.get('players', [])
-    sessions = raw.get('sessions', [])
-    if not players or not sessions:
+    race_seen = True
+    data, results = parsed
+    if not results:
         return None, [], None, None, race_seen
 
-    # Find the RACE session (type 3) — take the last one if multiple
-    race_session = None
-    for s in reversed(sessions):
-        if s.get('type') == 3 or (s.get('name') or '').upper() == 'RACE':
-            race_session = s
-            break
-    if race_session is None:
-        return None, [], None, None, race_seen
+    player_result, player_position = ac_results.find_driver(results, [driver_name])
+    if player_result is None:
+        return None, results, None, None, race_seen
 
-    race_seen = True
-    race_result_indices = race_session.get('raceResult', [])
-    if not race_result_indices:
-        return None, [], None, None, race_seen
+    return data, results, player_result, player_position, race_seen
 
-    # Build a results list that mirrors the classic AC format:
-    #   [{DriverName, Laps, BestLap, TotalTime, ...}, ...]
-    laps_raw = race_session.get('laps', [])
 
-    # Group laps by car index
-    car_laps = {}
-    for lap in laps_raw:
-        ci = lap.get('car')
-        if ci is not None:
-            car_laps.setdefault(ci, []).append(lap)
+def _locate_race_result(driver_name, start_time):
+    """Find the newest RACE result for *driver_name* written since *start_time*.
 
-    # Best-lap lookup per car
-    best_laps_raw = {bl['car']: bl['time'] for bl in race_session.get('bestLaps', [])
-                     if isinstance(bl, dict)}
+    Checks the classic results/ folder first, then out/race_out.json.
+    Returns (data, results, player_result, player_position, race_seen, source)
+    where *source* is the path of the file the result came from (or None).
+    """
+    results_dir = environment.docs_path('results')
+    if not os.path.exists(results_dir):
+        return None, [], None, None, False, None
 
-    results = []
-    for car_idx in race_result_indices:
-        if car_idx >= len(players):
-            continue
-        p = players[car_idx]
-        p_laps = car_laps.get(car_idx, [])
-        total_time = sum(l.get('time', 0) for l in p_laps)
-        best_lap   = best_laps_raw.get(car_idx, 0)
-        results.append({
-            'DriverName': p.get('name', ''),
-            'Laps':       len(p_laps),
-            'BestLap':    best_lap,
-            'TotalTime':  total_time,
-            '_car_idx':   car_idx,
-        })
+    # scandir: one directory read; on Windows the mtime comes with the entry
+    candidates = []
+    with os.scandir(results_dir) as it:
+        for entry in it:
+            if not entry.name.endswith('.json'):
+                continue
+            mtime = datetime.fromtimestamp(entry.stat().st_mtime)
+            if mtime >= start_time:
+                candidates.append((mtime, entry.path))
+
+    # ── Strategy 1: classic results/ folder (AC vanilla format) ──────────────
+    if candidates:
+        candidates.sort(key=lambda x: x[0], reverse=True)
 
-    # Build a top-level 'Laps' array in classic format for debrief analysis
-    classic_laps = []
-    for lap in laps_raw:
-        ci = lap.get('car')
-        if ci is None or ci >= len(players):
+    race_seen = False
+    for _, result_file in (candidates or []):
+        candidate_data = ac_results.load_json(result_file)
+        if ac_results.session_type(candidate_data) != 'RACE' or 'Type' not in candidate_data:
             continue
-        sectors = lap.get('sectors', [])
-        classic_laps.append({
-            'DriverName': players[ci].get('name', ''),
-            'LapTime':    lap.get('time', 0),
-            'Sectors':    sectors,
-            'Cuts':       lap.get('cuts', 0),
-            'Tyre':       lap.get('tyre', ''),
-        })
 
-    # Find player
-    player_result = None
-    player_position = None
-    for i, r in enumerate(results):
-        if r['DriverName'].lower() == driver_name.lower():
-            player_result = r
-            player_position = i + 1
-            break
+        race_seen = True
+        candidate_results = candidate_data.get('Result', [])
+        r, pos = ac_results.find_driver(candidate_results, [driver_name])
+        if r is not None:
+            return candidate_data, candidate_results, r, pos, race_seen, result_file
 
-    if player_result is None:
-        return None, results, None, None, race_seen
+    # ── Strategy 2: out/race_out.json (Content Manager / newer AC format) ──
+    data, results, player_result, player_position, race_seen = \
+        _try_race_out_json(driver_name, start_time, race_seen)
+    source = os.path.join(environment.docs_path('out'), 'race_out.json') if player_result else None
+    return data, results, player_result, player_position, race_seen, source
 
-    # Package as a data dict with classic 'Laps' key for debrief compatibility
-    data = {'Laps': classic_laps, '_source': 'race_out'}
-    return data, results, player_result, player_position, race_seen
+
+def _build_lap_analysis(data, results, driver_name, player_result, player_position):
+    """Debrief dict for a located race result (see debrief.analyse_race)."""
+    # ── Lap-by-lap debrief analysis ──────────────────────────────────────────
+    # AC results JSON has a top-level 'Laps' array with per-lap times for every
+    # driver (Sectors, Cuts, Tyre) — grouped in one pass for a field-wide debrief.
+    lap_analysis, valid_laps = analyse_race(
+        data.get('Laps', []), results, driver_name,
+        car_class=lambda car: (content_index.car(car) or {}).get('class', ''))
+    if lap_analysis:
+        lap_analysis['engineer_report'] = _generate_engineer_report(
+            player_position, len(results), valid_laps,
+            lap_analysis.get('degradation'),
+        )
+
+        # ── Gap to leader ────────────────────────────────────────────────────
+        if player_position and player_position > 1 and results:
+            p1_time = results[0].get('TotalTime', 0)
+            pl_time = player_result.get('TotalTime', 0)
+            gap_ms  = pl_time - p1_time
+            if gap_ms > 0:
+                lap_analysis['gap_to_leader_ms'] = gap_ms
+
+    return lap_analysis
 
 
 @app.route('/api/read-race-result')
@@ -1107,58 +1541,18 @@ def read_race_result():
     if _is_ac_running():
         return jsonify({'status': 'waiting', 'message': 'Race in progress. Close AC to import result.'})
 
+    # Race distance from the plan that was launched (per-race lap counts)
+    plan = career_data.get('race_plan') or {}
+    if plan.get('race_num') != career_data['races_completed'] + 1:
+        plan = {}
     tier_info     = career.get_tier_info(career_data['tier'])
-    expected_laps = tier_info.get('race_format', {}).get('laps', 20)
+    expected_laps = plan.get('laps') or tier_info.get('race_format', {}).get('laps', 20)
 
-    results_dir = get_ac_docs_path('results')
-    if not os.path.exists(results_dir):
+    if not os.path.exists(environment.docs_path('results')):
         return jsonify({'status': 'not_found', 'message': 'Results folder not found'})
 
-    candidates = []
-    for fname in os.listdir(results_dir):
-        if not fname.endswith('.json'):
-            continue
-        fpath = os.path.join(results_dir, fname)
-        mtime = datetime.fromtimestamp(os.path.getmtime(fpath))
-        if mtime >= start_time:
-            candidates.append((mtime, fpath))
-
-    # ── Strategy 1: classic results/ folder (AC vanilla format) ──────────────
-    if candidates:
-        candidates.sort(key=lambda x: x[0], reverse=True)
-
-    data = None
-    results = []
-    player_result = None
-    player_position = None
-    race_seen = False
-
-    for _, result_file in (candidates or []):
-        try:
-            with open(result_file, 'r', encoding='utf-8') as f:
-                candidate_data = json.load(f)
-        except Exception:
-            continue
-
-        if candidate_data.get('Type', '').upper() != 'RACE':
-            continue
-
-        race_seen = True
-        candidate_results = candidate_data.get('Result', [])
-        for i, r in enumerate(candidate_results):
-            if r.get('DriverName', '').lower() == driver_name.lower():
-                data = candidate_data
-                results = candidate_results
-                player_result = r
-                player_position = i + 1
-                break
-        if player_result is not None:
-            break
-
-    # ── Strategy 2: out/race_out.json (Content Manager / newer AC format) ──
-    if player_result is None:
-        data, results, player_result, player_position, race_seen = \
-            _try_race_out_json(driver_name, start_time, race_seen)
+    data, results, player_result, player_position, race_seen, _ = \
+        _locate_race_result(driver_name, start_time)
 
     if player_result is None:
         msg = 'Driver not found in results' if race_seen else 'No race session result found yet'
@@ -1181,78 +1575,7 @@ def read_race_result():
         secs         = (best_lap_ms % 60000) / 1000
         best_lap_fmt = f'{mins:02d}:{secs:06.3f}'
 
-    # ── Lap-by-lap debrief analysis ──────────────────────────────────────────
-    # AC results JSON has a top-level 'Laps' array with per-lap times per driver.
-    # Each lap object also carries Sectors, Cuts, and Tyre — used for rich debrief.
-    raw_laps         = data.get('Laps', [])
-    player_lap_objs  = [
-        l for l in raw_laps
-        if isinstance(l, dict)
-        and l.get('DriverName', '').lower() == driver_name.lower()
-        and isinstance(l.get('LapTime'), (int, float))
-        and l['LapTime'] > 0
-    ]
-    all_player_laps = [l['LapTime'] for l in player_lap_objs]
-    lap_analysis = {}
-    if all_player_laps:
-        lap_best_ms = min(all_player_laps)
-        # Exclude in/out-lap style outliers (> 150% of the best lap)
-        valid_laps     = [lt for lt in all_player_laps if lt <= lap_best_ms * 1.5]
-        valid_lap_objs = [o for o in player_lap_objs if o['LapTime'] <= lap_best_ms * 1.5]
-        if len(valid_laps) >= 2:
-            avg_ms      = sum(valid_laps) / len(valid_laps)
-            std_ms      = statistics.stdev(valid_laps)
-            # consistency: 100 = perfect, drops ~1pt per 30ms of std dev
-            consistency = max(0, min(100, int(100 - std_ms / 30)))
-            total_d     = len(results)
-            lap_analysis = {
-                'lap_times':       valid_laps,
-                'lap_count':       len(valid_laps),
-                'best_lap_ms':     lap_best_ms,
-                'avg_lap_ms':      round(avg_ms),
-                'std_ms':          round(std_ms),
-                'consistency':     consistency,
-                'engineer_report': _generate_engineer_report(
-                    player_position, total_d, valid_laps
-                ),
-            }
-
-            # ── Sector analysis (S1/S2/S3) ───────────────────────────────────
-            sector_rows = [o.get('Sectors', []) for o in valid_lap_objs]
-            if (sector_rows and all(
-                    len(s) == 3 and all(isinstance(v, (int, float)) and v > 0 for v in s)
-                    for s in sector_rows)):
-                sector_analysis = []
-                for idx in range(3):
-                    times = [row[idx] for row in sector_rows]
-                    sector_analysis.append({
-                        'best_ms': min(times),
-                        'avg_ms':  round(sum(times) / len(times)),
-                        'std_ms':  round(statistics.stdev(times)) if len(times) >= 2 else 0,
-                    })
-                # Weakest sector = highest (avg − best) delta → most room to improve
-                worst_idx = max(range(3), key=lambda i:
-                    sector_analysis[i]['avg_ms'] - sector_analysis[i]['best_ms'])
-                lap_analysis['sector_analysis'] = sector_analysis
-                lap_analysis['weakest_sector']  = worst_idx + 1  # 1-indexed
-
-            # ── Track cuts ───────────────────────────────────────────────────
-            total_cuts = sum(int(o.get('Cuts', 0)) for o in valid_lap_objs)
-            if total_cuts:
-                lap_analysis['total_cuts'] = total_cuts
-
-            # ── Tyre compound ────────────────────────────────────────────────
-            tyres = [o.get('Tyre', '') for o in player_lap_objs if o.get('Tyre')]
-            if tyres:
-                lap_analysis['tyre'] = max(set(tyres), key=tyres.count)
-
-            # ── Gap to leader ────────────────────────────────────────────────
-            if player_position and player_position > 1 and results:
-                p1_time = results[0].get('TotalTime', 0)
-                pl_time = player_result.get('TotalTime', 0)
-                gap_ms  = pl_time - p1_time
-                if gap_ms > 0:
-                    lap_analysis['gap_to_leader_ms'] = gap_ms
+    lap_analysis = _build_lap_analysis(data, results, driver_name, player_result, player_position)
 
     margin_to_p2_ms = None
     if player_position == 1 and len(results) > 1:
@@ -1274,29 +1597,181 @@ def read_race_result():
         'driver_name':    driver_name,
         'margin_to_p2_ms': margin_to_p2_ms,
         'lap_analysis':   lap_analysis,
+        'grid_position':  plan.get('grid_position'),
     })
 
 
+def _race_archive_source(career_data, result_file=None):
+    """Locate the AC result of the race being finished (read-only).
+
+    result_file: the result to use (career_cli.py finish-race); otherwise the
+    newest race result written since the race was started from the app.
+    Best-effort: a missing/unreadable result file (e.g. manual entry) gives
+    None so the career result is always recorded.  Otherwise the race's
+    archive metadata: source file, laps, track, season, tier, race number.
+    """
+    started = career_data.get('race_started_at')
+    if not result_file and not started:
+        return None
+    try:
+        driver_name = career_data.get('driver_name', 'Player')
+        if result_file:
+            source = result_file
+            raw = ac_results.load_json(source)
+            parsed = ac_results.parse_result(raw) if raw is not None else None
+            if parsed is None or parsed[0] != 'RACE':
+                return None
+            _, data, results = parsed
+            player_result, _ = ac_results.find_driver(results, [driver_name])
+        else:
+            start_time = datetime.fromisoformat(started).replace(microsecond=0)
+            data, _, player_result, _, _, source = _locate_race_result(driver_name, start_time)
+        if player_result is None or not isinstance(data, dict) or not source:
+            return None
+        tier_key  = career.tiers[career_data.get('tier', 0)]
+        tier_info = career.get_tier_info(career_data.get('tier', 0))
+        tracks    = _get_career_tracks(tier_key, tier_info, career_data)
+        race_num  = career_data['races_completed'] + 1
+        return {
+            'source':   source,
+            'key':      ac_results.result_key(source),
+            'laps':     data.get('Laps', []),
+            'track':    tracks[(race_num - 1) % len(tracks)],
+            'car':      career_data.get('car') or '',
+            'season':   career_data.get('season', 1),
+            'tier':     tier_key,
+            'race_num': race_num,
+            'driver':   driver_name,
+        }
+    except Exception as e:
+        print(f"Warning: could not read the race result: {e}")
+        return None
+
+
+def _archive_race_laps(meta):
+    """Append every lap of a finished race (see _race_archive_source) to the
+    lap archive.  Only called once the result is saved: appended laps cannot
+    be taken back."""
+    if not meta:
+        return
+    try:
+        lap_archive.append_race(
+            meta['key'], meta['laps'],
+            track=meta['track'],
+            car=meta['car'],
+            season=meta['season'],
+            tier=meta['tier'],
+            race_num=meta['race_num'],
+            player_name=meta['driver'],
+        )
+    except Exception as e:
+        print(f"Warning: could not archive race laps: {e}")
+
+
+def career_start_time(career_data):
+    """Epoch seconds the career started, or None if unknown.
+
+    career_started_at is set by new careers; older saves fall back to the
+    oldest career race in the lap archive (its key carries the file mtime).
+    """
+    started = career_data.get('career_started_at')
+    if started:
+        try:
+            return datetime.fromisoformat(started).timestamp()
+        except ValueError:
+            pass
+    times = []
+    for key in lap_archive.keys(min_season=1):
+        try:
+            times.append(int(key.rsplit('|', 1)[1]))
+        except (IndexError, ValueError):
+            continue
+    return min(times) if times else None
+
+
+def _retain_race_result(meta, career_data):
+    """Move the ingested result file into the compressed results archive and
+    sweep the live results folder down to the retention policy (if enabled)."""
+    policy = retention_policy(load_config())
+    if not policy.get('enabled'):
+        return
+    results_dir = environment.docs_path('results')
+    try:
+        if meta:
+            # Files from elsewhere (career_cli.py finish-race FILE) are copied
+            in_results = (os.path.normcase(os.path.dirname(os.path.abspath(meta['source'])))
+                          == os.path.normcase(os.path.abspath(results_dir)))
+            results_retention.archive_race(
+                meta['source'], meta['season'], race_num=meta['race_num'],
+                tier=meta['tier'], track=meta['track'],
+                driver=career_data.get('driver_name', 'Player'),
+                move=None if in_results else False,
+            )
+        season = meta['season'] if meta else career_data.get('season', 1)
+        results_retention.enforce_policy(results_dir, policy, season,
+                                         career_start=career_start_time(career_data))
+    except Exception as e:
+        print(f"Warning: results retention failed: {e}")
+
+
 @app.route('/api/finish-race', methods=['POST'])
 def finish_race():
     data, err = _require_json_object()
     if err:
         return err
-    career_data = load_career_data()
     try:
         position = int(data.get('position', 1))
     except (TypeError, ValueError):
         return jsonify({'status': 'error', 'message': 'Invalid position'}), 400
     if position < 1:
         return jsonify({'status': 'error', 'message': 'Position must be >= 1'}), 400
+    margin_ms = _parse_optional_int(data.get('margin_ms'))
+    # result_file: archive that AC result (CLI); archive: false skips the
+    # result files altogether (positions entered by hand, simulations)
+    result_file = data.get('result_file') or None
+    if result_file is not None and not (isinstance(result_file, str)
+                                        and os.path.isfile(result_file)):
+        return jsonify({'status': 'error', 'message': 'Result file not found'}), 400
+    use_results = data.get('archive', True) is not False
+    if _live_telemetry is not None:
+        _live_telemetry.stop()
+    # Under the write lock, so a save made meanwhile (another request, the
+    # background import) is built on rather than lost or turned into a 409
+    with career_state.transaction() as career_data:
+        archived = (_race_archive_source(career_data, result_file)
+                    if use_results else None)
+        result, ai_delta = _record_race_result(
+            career_data, position, data.get('lap_time', ''), margin_ms)
+        # The started race is finished: a later finish must not pick up
+        # this race's (or a newer, unrelated) result file
+        career_data.pop('race_started_at', None)
+    # Saved: only now archive the laps and move the AC result file away —
+    # neither can be undone, and a failed save must leave them for a retry
+    if use_results:
+        _archive_race_laps(archived)
+        _retain_race_result(archived, career_data)
+    if career_data['races_completed'] >= career.get_tier_races(career_data):
+        return _do_end_season()
+    return jsonify({
+        'status': 'success',
+        'result': result,
+        'total_points': career_data['points'],
+        'ai_change': ai_delta,
+        'ai_offset': career_data['career_settings'].get('ai_offset', 0),
+    })
+
+
+def _record_race_result(career_data, position, lap_time, margin_ms):
+    """Apply the player's race result to *career_data*: points, AI level,
+    driver progress, form, rivalries and the paddock news it triggers.
+    Returns (result row, AI offset change)."""
     pts_table   = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
     pts         = pts_table[min(position - 1, 9)] if position <= 10 else 0
-    margin_ms   = _parse_optional_int(data.get('margin_ms'))
     result = {
         'race_num': career_data['races_completed'] + 1,
         'position': position,
         'points':   pts,
-        'lap_time': data.get('lap_time', ''),
+        'lap_time': lap_time,
     }
     career_data['races_completed'] += 1
     career_data['points']          += pts
@@ -1535,16 +2010,7 @@ def finish_race():
         prev_ai[tk] = ai_done
     career_data['_prev_ai_races'] = prev_ai
 
-    save_career_data(career_data)
-    if career_data['races_completed'] >= career.get_tier_races(career_data):
-        return _do_end_season()
-    return jsonify({
-        'status': 'success',
-        'result': result,
-        'total_points': career_data['points'],
-        'ai_change': ai_delta,
-        'ai_offset': cs.get('ai_offset', 0),
-    })
+    return result, ai_delta
 
 
 @app.route('/api/end-season', methods=['POST'])
@@ -1553,8 +2019,22 @@ def end_season():
 
 
 def _do_end_season():
-    career_data = load_career_data()
-    cfg         = load_config()
+    cfg = load_config()
+    with career_state.transaction() as career_data:
+        position, contracts, recap = _close_season(career_data, cfg)
+    return jsonify({
+        'status':       'season_complete',
+        'position':     position,
+        'total_points': career_data['points'],
+        'contracts':    contracts,
+        'recap':        recap,
+    })
+
+
+def _close_season(career_data, cfg):
+    """Season end on *career_data*: history snapshots, team development,
+    retirements, news, contract offers and the season recap.
+    Returns (final position, contracts, recap)."""
     tier_index  = career_data['tier']
     tier_key    = career.tiers[tier_index]
     tier_info   = career.get_tier_info(tier_index)
@@ -1720,7 +2200,6 @@ def _do_end_season():
         )
     career_data['contracts']      = contracts
     career_data['final_position'] = position
-    save_career_data(career_data)
 
     # Build season recap (consumed by frontend recap screen before contracts)
     race_results = career_data.get('race_results', [])
@@ -1743,15 +2222,7 @@ def _do_end_season():
         'boss_message':   _team_boss_message(position, wins, podiums, team_count, tier_key, season),
     }
     career_data['last_recap'] = recap
-    save_career_data(career_data)
-
-    return jsonify({
-        'status':       'season_complete',
-        'position':     position,
-        'total_points': career_data['points'],
-        'contracts':    contracts,
-        'recap':        recap,
-    })
+    return position, contracts, recap
 
 
 @app.route('/api/season-recap')
@@ -1772,59 +2243,59 @@ def accept_contract():
     data, err = _require_json_object()
     if err:
         return err
-    career_data = load_career_data()
-    contract_id = data.get('contract_id')
-    contracts = career_data.get('contracts') or []
-    selected    = next((c for c in contracts if c.get('id') == contract_id), None)
-    if not selected:
-        return jsonify({'status': 'error', 'message': 'Contract not found'}), 400
-
-    # Use target_tier from the contract — supports promotion, stay, AND relegation.
-    # Fall back to tier+1 for contracts created before v1.8.0 (backwards compat).
-    new_tier = selected.get('target_tier')
-    if new_tier is None:
-        new_tier = career_data['tier'] + 1
-    new_tier = max(0, min(len(career.tiers) - 1, new_tier))  # clamp to valid range
-
-    move = selected.get('move', 'promotion')
-
-    career_data['tier']            = new_tier
-    career_data['season']          += 1
-    career_data['team']             = selected['team_name']
-    career_data['car']              = selected['car']
-    career_data['races_completed']  = 0
-    career_data['points']           = 0
-    career_data['race_results']     = []
-    career_data['contracts']        = None
-    career_data['standings']        = []
-    career_data['final_position']   = None
-    # Preserve career_settings (difficulty, weather, custom tracks) across seasons
-    # career_settings is intentionally NOT reset here
-
-    # Clear mid-season swap overrides and AI race tracking for the new season
-    career_data['driver_swaps'] = {}
-    career_data['_prev_ai_races'] = {}
-
-    # Player move news (promotion/relegation/stay)
-    new_tier_key = career.tiers[new_tier]
-    new_tier_label = career.tier_names.get(new_tier_key, new_tier_key)
-    player_name = career_data.get('driver_name', 'Player')
-    move_templates = _MOVE_TEMPLATES.get(move, _MOVE_TEMPLATES['stay'])
-    move_seed = f"move|{player_name}|{career_data['season']}"
-    move_text = _pick_template(move_templates, move_seed).format(
-        name=player_name, tier=new_tier_label)
-    _add_news(career_data, 'player_move', move_text, 'clipboard')
-
-    # New season announcement
-    _add_news(career_data, 'new_season',
-              f"Season {career_data['season']} begins!",
-              'flag')
-
-    # Pick new rival for the new tier/season
-    advance_driver_progress_season(career_data)
-    career_data['rival_name'] = career.pick_rival(new_tier_key, career_data.get('season', 1), career_data=career_data)
-
-    save_career_data(career_data)
+    # A contract that is not on offer returns before anything changes, so
+    # the transaction writes nothing
+    with career_state.transaction() as career_data:
+        contract_id = data.get('contract_id')
+        contracts = career_data.get('contracts') or []
+        selected    = next((c for c in contracts if c.get('id') == contract_id), None)
+        if not selected:
+            return jsonify({'status': 'error', 'message': 'Contract not found'}), 400
+
+        # Use target_tier from the contract — supports promotion, stay, AND relegation.
+        # Fall back to tier+1 for contracts created before v1.8.0 (backwards compat).
+        new_tier = selected.get('target_tier')
+        if new_tier is None:
+            new_tier = career_data['tier'] + 1
+        new_tier = max(0, min(len(career.tiers) - 1, new_tier))  # clamp to valid range
+
+        move = selected.get('move', 'promotion')
+
+        career_data['tier']            = new_tier
+        career_data['season']          += 1
+        career_data['team']             = selected['team_name']
+        career_data['car']              = selected['car']
+        career_data['races_completed']  = 0
+        career_data['points']           = 0
+        career_data['race_results']     = []
+        career_data['contracts']        = None
+        career_data['standings']        = []
+        career_data['final_position']   = None
+        # Preserve career_settings (difficulty, weather, custom tracks) across seasons
+        # career_settings is intentionally NOT reset here
+
+        # Clear mid-season swap overrides and AI race tracking for the new season
+        career_data['driver_swaps'] = {}
+        career_data['_prev_ai_races'] = {}
+
+        # Player move news (promotion/relegation/stay)
+        new_tier_key = career.tiers[new_tier]
+        new_tier_label = career.tier_names.get(new_tier_key, new_tier_key)
+        player_name = career_data.get('driver_name', 'Player')
+        move_templates = _MOVE_TEMPLATES.get(move, _MOVE_TEMPLATES['stay'])
+        move_seed = f"move|{player_name}|{career_data['season']}"
+        move_text = _pick_template(move_templates, move_seed).format(
+            name=player_name, tier=new_tier_label)
+        _add_news(career_data, 'player_move', move_text, 'clipboard')
+
+        # New season announcement
+        _add_news(career_data, 'new_season',
+                  f"Season {career_data['season']} begins!",
+                  'flag')
+
+        # Pick new rival for the new tier/season
+        advance_driver_progress_season(career_data)
+        career_data['rival_name'] = career.pick_rival(new_tier_key, career_data.get('season', 1), career_data=career_data)
 
     move_labels = {
         'promotion': 'Promoted to',
@@ -1878,6 +2349,7 @@ def new_career():
         'team_development': {},
         'rival_name':      career.pick_rival('mx5_cup', 1),
         'driver_seed':     random.randint(0, 2**31 - 1),
+        'career_started_at': datetime.now().isoformat(),
         'career_settings': {
             'difficulty':    difficulty,
             'ai_offset':     ai_offset,
@@ -1888,126 +2360,174 @@ def new_career():
     }
     ensure_driver_progress(initial)
     initial['rival_name'] = career.pick_rival('mx5_cup', 1, career_data=initial)
-    save_career_data(initial)
+    # A new career replaces whatever is on disk, whichever revision it has
+    career_state.replace(initial)
     return jsonify({'status': 'success', 'message': 'New career started!', 'career_data': initial})
 
 
+def _scan_car_item(car_id, car):
+    """Wizard car entry, or None if the car is not a usable GT3/GT4."""
+    # Need ui_car.json + data/ folder
+    if car['has_ui'] and car['has_data'] and car['class']:
+        return {'id': car_id, 'name': car['name']}
+    return None
+
+
+def _scan_track_items(track):
+    return [{'id': lay['id'], 'name': lay['name'], 'length': lay['length']}
+            for lay in track['layouts']]
+
+
+def _scan_result():
+    """/api/scan-content payload built from the (refreshed) content index."""
+    result = {'cars': {'gt4': [], 'gt3': []}, 'tracks': []}
+    for car_id, car in sorted(content_index.cars().items()):
+        item = _scan_car_item(car_id, car)
+        if item:
+            result['cars'][car['class']].append(item)
+    for _, track in sorted(content_index.tracks().items()):
+        result['tracks'].extend(_scan_track_items(track))
+    result['tracks'].sort(key=lambda t: t['length'])
+    return result
+
+
+def _scan_ac_path():
+    """AC install path for content scans, or None if acs.exe is missing."""
+    ac_path = load_config().get('paths', {}).get('ac_install', '')
+    return ac_path if os.path.exists(os.path.join(ac_path, 'acs.exe')) else None
+
+
 @app.route('/api/scan-content')
 def scan_content():
     """Scan AC content/cars and content/tracks for valid GT3/GT4 cars and all tracks."""
-    cfg     = load_config()
-    ac_path = cfg.get('paths', {}).get('ac_install', '')
-
-    if not os.path.exists(os.path.join(ac_path, 'acs.exe')):
+    ac_path = _scan_ac_path()
+    if ac_path is None:
         return jsonify({'error': 'AC installation not found. Check your AC path.'}), 400
 
-    result = {'cars': {'gt4': [], 'gt3': []}, 'tracks': []}
+    # Incremental: only car / track folders whose mtimes changed are re-read
+    content_index.refresh(ac_path)
+    return jsonify(_scan_result())
 
-    # ── Cars ────────────────────────────────────────────────────────────────
-    cars_dir = os.path.join(ac_path, 'content', 'cars')
-    if os.path.isdir(cars_dir):
-        for car_name in sorted(os.listdir(cars_dir)):
-            car_path  = os.path.join(cars_dir, car_name)
-            if not os.path.isdir(car_path):
-                continue
-            ui_car   = os.path.join(car_path, 'ui', 'ui_car.json')
-            data_dir = os.path.join(car_path, 'data')
-            if not os.path.exists(ui_car) or not os.path.isdir(data_dir):
-                continue
-            try:
-                with open(ui_car, 'r', encoding='utf-8', errors='ignore') as f:
-                    car_data = json.load(f)
-            except Exception:
-                continue
-            display  = car_data.get('name', car_name)
-            tags     = [t.lower() for t in (car_data.get('tags') or [])]
-            nm_lower = car_name.lower()
-            if 'gt4' in tags or 'gt4' in nm_lower:
-                result['cars']['gt4'].append({'id': car_name, 'name': display})
-            elif 'gt3' in tags or 'gt3' in nm_lower:
-                result['cars']['gt3'].append({'id': car_name, 'name': display})
-
-    # ── Tracks ──────────────────────────────────────────────────────────────
-    tracks_dir = os.path.join(ac_path, 'content', 'tracks')
-    if os.path.isdir(tracks_dir):
-        for track_name in sorted(os.listdir(tracks_dir)):
-            track_path = os.path.join(tracks_dir, track_name)
-            if not os.path.isdir(track_path):
-                continue
-            layouts = []
-            try:
-                for item in sorted(os.listdir(track_path)):
-                    item_path = os.path.join(track_path, item)
-                    if not os.path.isdir(item_path) or item == 'ui':
-                        continue
-                    layout_ui = os.path.join(item_path, 'ui', 'ui_track.json')
-                    if not os.path.exists(layout_ui):
-                        continue
-                    try:
-                        with open(layout_ui, 'r', encoding='utf-8', errors='ignore') as f:
-                            td = json.load(f)
-                        layouts.append({
-                            'id':     f'{track_name}/{item}',
-                            'name':   td.get('name') or f'{track_name} – {item}',
-                            'length': _parse_length(td.get('length', 0)),
-                        })
-                    except Exception:
-                        continue
-            except PermissionError:
-                continue
-            # Single-layout track (no layout subdirs found)
-            if not layouts:
-                root_ui = os.path.join(track_path, 'ui', 'ui_track.json')
-                if os.path.exists(root_ui):
-                    try:
-                        with open(root_ui, 'r', encoding='utf-8', errors='ignore') as f:
-                            td = json.load(f)
-                        layouts.append({
-                            'id':     track_name,
-                            'name':   td.get('name') or track_name,
-                            'length': _parse_length(td.get('length', 0)),
-                        })
-                    except Exception:
-                        pass
-            result['tracks'].extend(layouts)
 
-    result['tracks'].sort(key=lambda t: t['length'])
-    return jsonify(result)
+def _run_content_scan(job, ac_path):
+    def on_item(kind, item_id, entry, done, total):
+        if kind == 'tracks':
+            items = [dict(t, type='track') for t in _scan_track_items(entry)]
+        else:
+            car = _scan_car_item(item_id, entry)
+            items = [dict(car, type='car', **{'class': entry['class']})] if car else []
+        for item in items:
+            job.emit(item)
+        job.update(done=done, total=total)
 
+    content_index.refresh(ac_path, on_item=on_item)
+    return _scan_result()
 
-@app.route('/api/driver-profile')
-def driver_profile():
-    name        = request.args.get('name', '')
-    career_data = load_career_data()
-    changed = ensure_driver_progress(career_data)
-
-    profile = career.get_driver_profile(name, career_data=career_data)
-    progress = (career_data.get('driver_progress') or {}).get(name, {})
-    profile['age'] = progress.get('age')
-    profile['potential'] = progress.get('potential')
-    profile['skill_deltas'] = compute_progress_deltas(progress) if progress else {
-        'race': {k: 0.0 for k in DRIVER_SKILL_KEYS},
-        'season': {k: 0.0 for k in DRIVER_SKILL_KEYS},
-        'career': {k: 0.0 for k in DRIVER_SKILL_KEYS},
-    }
-    profile['trend_label'] = driver_trend_label(progress) if progress else 'Stable'
 
-    history     = career_data.get('driver_history', {}).get(name, {'seasons': []})
-    # Find current standings entry for this driver across all tiers
-    all_s, _      = career.generate_all_standings(career_data)
-    current_entry = None
+@app.route('/api/scan-content/start', methods=['POST'])
+def scan_content_start():
+    """Start a background content scan; follow it on /api/scan-content/stream."""
+    ac_path = _scan_ac_path()
+    if ac_path is None:
+        return jsonify({'error': 'AC installation not found. Check your AC path.'}), 400
+    job = jobs.start('scan-content', _run_content_scan, ac_path)
+    return jsonify({'status': 'started', 'job': job.to_dict()})
+
+
+@app.route('/api/scan-content/stream')
+def scan_content_stream():
+    """Server-sent events for a scan job: batches of tracks / cars as folders
+    finish ('data:' {items, progress}), then 'event: done' with the full
+    /api/scan-content result (or 'event: failed')."""
+    job = jobs.get(request.args.get('job', ''))
+    if job is None or job.kind != 'scan-content':
+        return jsonify({'status': 'error', 'message': 'Unknown job'}), 404
+
+    def events():
+        cursor = 0
+        while True:
+            items, cursor, progress, status = job.wait_items(cursor, timeout=15)
+            if items or status == 'running':
+                yield f"data: {json.dumps({'items': items, 'progress': progress})}\n\n"
+            if status == 'done':
+                yield f'event: done\ndata: {json.dumps(job.result)}\n\n'
+                return
+            if status == 'error':
+                yield f"event: failed\ndata: {json.dumps({'error': job.error})}\n\n"
+                return
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def _driver_profiles_payload(career_data, names):
+    """{name: profile card} for *names* from one career snapshot: one
+    standings computation and a name index instead of a scan per driver."""
+    progress_all = career_data.get('driver_progress') or {}
+    history_all  = career_data.get('driver_history', {})
+    all_s, _     = career.generate_all_standings(career_data)
+    # Current standings entry per driver (first tier wins, as before)
+    current = {}
     for tier_data in all_s.values():
         for entry in tier_data['drivers']:
-            if entry.get('driver') == name:
-                current_entry = entry
-                break
-        if current_entry:
-            break
+            current.setdefault(entry.get('driver'), entry)
+
+    cards = {}
+    for name in names:
+        profile  = career.get_driver_profile(name, career_data=career_data)
+        progress = progress_all.get(name, {})
+        profile['age'] = progress.get('age')
+        profile['potential'] = progress.get('potential')
+        profile['skill_deltas'] = compute_progress_deltas(progress) if progress else {
+            'race': {k: 0.0 for k in DRIVER_SKILL_KEYS},
+            'season': {k: 0.0 for k in DRIVER_SKILL_KEYS},
+            'career': {k: 0.0 for k in DRIVER_SKILL_KEYS},
+        }
+        profile['trend_label'] = driver_trend_label(progress) if progress else 'Stable'
+        seasons, next_cursor = _recent_seasons(history_all.get(name, {}).get('seasons', []))
+        cards[name] = {'name': name, 'profile': profile, 'current': current.get(name),
+                       'history': {'seasons': seasons}, 'history_next_cursor': next_cursor}
+    return cards
+
+
+def _load_profile_snapshot():
+    # Fills in progress for drivers the save has not seen yet, in memory
+    # only: GETs never write (the startup migration persists it once)
+    career_data = load_career_data()
+    ensure_driver_progress(career_data)
+    return career_data
 
-    if changed:
-        save_career_data(career_data)
 
-    return jsonify({'name': name, 'profile': profile, 'current': current_entry, 'history': history})
+@app.route('/api/driver-profile')
+@_content_revision_cached
+def driver_profile():
+    name = request.args.get('name', '')
+    return jsonify(_driver_profiles_payload(_load_profile_snapshot(), [name])[name])
+
+
+# Upper bound for one /api/driver-profiles request (the whole driver pool)
+MAX_PROFILE_BATCH = 200
+
+
+@app.route('/api/driver-profiles')
+@_content_revision_cached
+def driver_profiles():
+    """Batch /api/driver-profile: ?names=a,b,c (or repeated ?name=).
+
+    Returns {revision, profiles: {name: {name, profile, current, history}}}.
+    """
+    names = request.args.getlist('name')
+    if request.args.get('names'):
+        names += [n.strip() for n in request.args['names'].split(',') if n.strip()]
+    names = list(dict.fromkeys(names))
+    if not names:
+        return jsonify({'status': 'error', 'message': 'names required'}), 400
+    if len(names) > MAX_PROFILE_BATCH:
+        return jsonify({'status': 'error',
+                        'message': f'At most {MAX_PROFILE_BATCH} names per request'}), 400
+    career_data = _load_profile_snapshot()
+    return jsonify({'revision': career_data.get('revision', 0),
+                    'profiles': _driver_profiles_payload(career_data, names)})
 
 def _synthetic_team_history(team_name, career_data):
     """Generate plausible pre-career season history seeded by team name."""
@@ -2056,45 +2576,116 @@ def _synthetic_team_history(team_name, career_data):
 
 
 @app.route('/api/team-profile')
+@_revision_cached
 def team_profile():
-    name        = request.args.get('name', '')
-    career_data = load_career_data()
-    recorded    = career_data.get('team_history', {}).get(name, {}).get('seasons', [])
+    name    = request.args.get('name', '')
+    seasons = _team_seasons(name, load_career_data())
+    best = min((s['pos'] for s in seasons), default=None)
+    wins = sum(1 for s in seasons if s.get('pos') == 1)
+    recent, next_cursor = _recent_seasons(seasons)
+    return jsonify({'name': name, 'history': {'seasons': recent},
+                    'history_next_cursor': next_cursor, 'best_result': best, 'titles': wins})
+
+
+@app.route('/api/paddock-news')
+@_revision_cached
+def paddock_news():
+    """Paddock news, newest first.
+
+    Without parameters: the whole feed as a list (legacy shape).  With
+    ?limit= / ?cursor= / ?tier= / ?type=: one page, {items, next_cursor}.
+    """
+    if not any(request.args.get(k) for k in ('limit', 'cursor', 'tier', 'type')):
+        return jsonify(load_career_data().get('paddock_news', []))
+    return _paged('paddock_news', lambda c: c.get('paddock_news', []),
+                  tier=request.args.get('tier'), type=request.args.get('type'))
+
+
+# ---------------------------------------------------------------------------
+# Paginated history / log endpoints (see pagination.py)
+# ---------------------------------------------------------------------------
+
+# Seasons embedded in a profile card; older ones via the history endpoints
+HISTORY_PAGE = pagination.DEFAULT_LIMIT
+
+
+page_indexes = pagination.IndexCache()
+
+
+def _paged(name, entries_of, **filters):
+    """One page of the list entries_of(career_data) for the request's
+    ?cursor= / ?limit=, filtered by the given field values; 400 for a
+    malformed cursor or limit.  *name* identifies the list in the index
+    cache, so paging through it sorts it once per (career, config) revision."""
+    def load():
+        config_rev = config_revision.get()
+        career_data = load_career_data()
+        return (career_data.get('revision', 0), config_rev), entries_of(career_data)
 
+    try:
+        limit = pagination.parse_limit(request.args.get('limit'))
+        revs = (career_revision.get(), config_revision.get())
+        index = page_indexes.get(revs, name, filters, load)
+        items, next_cursor = index.page(request.args.get('cursor'), limit)
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid cursor or limit'}), 400
+    return jsonify({'items': items, 'next_cursor': next_cursor})
+
+
+def _recent_seasons(seasons):
+    """(newest HISTORY_PAGE seasons in ascending order, cursor for the rest)."""
+    items, next_cursor = pagination.KeyIndex(seasons).page(limit=HISTORY_PAGE)
+    return items[::-1], next_cursor
+
+
+def _team_seasons(name, career_data):
+    """Recorded seasons of *name* plus synthetic pre-career ones, ascending."""
+    recorded = career_data.get('team_history', {}).get(name, {}).get('seasons', [])
     # Synthetic pre-career seasons for seasons not yet recorded
     recorded_season_nums = {s['season'] for s in recorded}
     synthetic = [s for s in _synthetic_team_history(name, career_data)
                  if s['season'] not in recorded_season_nums]
+    return sorted(synthetic + recorded, key=lambda s: s['season'])
 
-    seasons = sorted(synthetic + recorded, key=lambda s: s['season'])
-    best = min((s['pos'] for s in seasons), default=None)
-    wins = sum(1 for s in seasons if s.get('pos') == 1)
-    return jsonify({'name': name, 'history': {'seasons': seasons}, 'best_result': best, 'titles': wins})
 
+@app.route('/api/driver-history')
+@_revision_cached
+def driver_history():
+    name = request.args.get('name', '')
+    return _paged(('driver_history', name),
+                  lambda c: c.get('driver_history', {}).get(name, {}).get('seasons', []),
+                  tier=request.args.get('tier'))
 
-@app.route('/api/paddock-news')
-def paddock_news():
-    career_data = load_career_data()
-    news = career_data.get('paddock_news', [])
-    # One-time backfill: generate news from existing race results if empty
-    if not news and career_data.get('race_results'):
-        tier_key = career.tiers[career_data.get('tier', 0)]
-        _tier_labels = {'mx5_cup': 'MX5 Cup', 'gt4': 'GT4 SuperCup', 'gt3': 'British GT GT3', 'wec': 'WEC / Elite'}
-        tier_label = _tier_labels.get(tier_key, tier_key)
-        for r in career_data['race_results']:
-            pos = r.get('position', 0)
-            track = _fmt_track(r.get('track', ''))
-            pts = r.get('points', 0)
-            icon = 'trophy' if pos <= 3 else 'flag'
-            text = f"{tier_label} Rd {r.get('race',0)} at {track}: You finished P{pos} (+{pts} pts)"
-            news.append({'season': career_data.get('season', 1), 'race': r.get('race', 0),
-                         'type': 'race_result', 'text': text, 'icon': icon, 'tier': tier_key})
-        career_data['paddock_news'] = news
-        save_career_data(career_data)
-    return jsonify(news)
+
+@app.route('/api/team-history')
+@_revision_cached
+def team_history():
+    name = request.args.get('name', '')
+    return _paged(('team_history', name), lambda c: _team_seasons(name, c),
+                  tier=request.args.get('tier'))
+
+
+@app.route('/api/player-history')
+@_revision_cached
+def player_history():
+    return _paged('player_history', lambda c: c.get('player_history', []),
+                  tier=request.args.get('tier'))
+
+
+@app.route('/api/swap-log')
+@_revision_cached
+def swap_log():
+    return _paged('swap_log', lambda c: c.get('swap_log', []), tier=request.args.get('tier'))
+
+
+@app.route('/api/retirement-log')
+@_revision_cached
+def retirement_log():
+    return _paged('retirement_log', lambda c: c.get('retirement_log', []))
 
 
 @app.route('/api/achievements')
+@_revision_cached
 def achievements():
     career_data = load_career_data()
     unlocked = career_data.get('achievements', [])
@@ -2106,12 +2697,14 @@ def achievements():
 
 
 @app.route('/api/player-profile')
+@_revision_cached
 def player_profile():
     career_data = load_career_data()
     results  = career_data.get('race_results', [])
     wins     = sum(1 for r in results if r.get('position') == 1)
     podiums  = sum(1 for r in results if r.get('position', 99) <= 3)
     avg      = round(sum(r['position'] for r in results) / len(results), 1) if results else None
+    history, history_next = _recent_seasons(career_data.get('player_history', []))
     return jsonify({
         'driver_name':  career_data.get('driver_name', 'Player'),
         'nationality':  career_data.get('player_nationality', ''),
@@ -2123,31 +2716,195 @@ def player_profile():
         'podiums':     podiums,
         'avg_finish':  avg,
         'points':      career_data.get('points', 0),
-        'history':     career_data.get('player_history', []),
+        'history':     history,
+        'history_next_cursor': history_next,
+        'imported':    _imported_stats_summary(career_data.get('imported_stats')),
     })
 
 
+def _imported_stats_summary(stats):
+    """Pre-career races backfilled by /api/import-results (None if never run)."""
+    if not stats or not stats.get('races'):
+        return None
+    return {
+        'races':      stats['races'],
+        'wins':       stats.get('wins', 0),
+        'podiums':    stats.get('podiums', 0),
+        'avg_finish': round(stats.get('position_sum', 0) / stats['races'], 1),
+        'laps':       stats.get('laps', 0),
+        'best_laps':  stats.get('best_laps', {}),
+    }
+
+
+def _run_results_import(job, folder, driver_name, aliases, career_start):
+    from results_import import ImportLedger, import_results, merge_import_stats
+    report = import_results(folder, lap_archive, driver_name, aliases=aliases,
+                            progress=job.update, ledger=ImportLedger(IMPORT_LEDGER_PATH),
+                            career_start=career_start)
+    if report['races_imported']:
+        # Background thread: merge under the write lock so a race finished
+        # meanwhile is neither lost nor turns this into a stale write
+        with career_state.transaction() as career_data:
+            merge_import_stats(career_data, report['stats'])
+    return report
+
+
+@app.route('/api/import-results', methods=['POST'])
+def import_results_start():
+    """Start a background import of a historical AC results folder.
+
+    Body (all optional): {folder: path (defaults to AC's results folder),
+    aliases: [other driver names used in older results]}.
+    Poll GET /api/jobs/<id> for progress.
+    """
+    data = request.get_json(silent=True) or {}
+    folder = (data.get('folder') or '').strip() or environment.docs_path('results')
+    if not os.path.isdir(folder):
+        return jsonify({'status': 'error', 'message': 'Results folder not found'}), 400
+    career_data = load_career_data()
+    driver_name = career_data.get('driver_name')
+    if not driver_name:
+        return jsonify({'status': 'error', 'message': 'No active career'}), 400
+    aliases = [str(a).strip() for a in (data.get('aliases') or []) if str(a).strip()]
+    job = jobs.start('import-results', _run_results_import, folder, driver_name, aliases,
+                     career_start_time(career_data))
+    return jsonify({'status': 'started', 'job': job.to_dict()})
+
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown job'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/lap-archive/summary')
+def lap_archive_summary():
+    return jsonify(lap_archive.summary())
+
+
+@app.route('/api/lap-archive/personal-bests')
+def lap_archive_personal_bests():
+    """Best lap per track/car across the whole career (player by default)."""
+    driver = request.args.get('driver') or load_career_data().get('driver_name', 'Player')
+    return jsonify(lap_archive.personal_bests(
+        driver,
+        track=request.args.get('track') or None,
+        car=request.args.get('car') or None,
+    ))
+
+
+@app.route('/api/lap-archive/pace')
+def lap_archive_pace():
+    """Race-by-race pace evolution at one track."""
+    track = request.args.get('track', '')
+    if not track:
+        return jsonify({'status': 'error', 'message': 'track is required'}), 400
+    driver = request.args.get('driver') or load_career_data().get('driver_name', 'Player')
+    return jsonify(lap_archive.pace_evolution(driver, track, car=request.args.get('car') or None))
+
+
+@app.route('/api/lap-archive/sectors')
+def lap_archive_sectors():
+    """Sector-time percentiles at one track — player by default, ?field=1 for everyone."""
+    track = request.args.get('track', '')
+    if not track:
+        return jsonify({'status': 'error', 'message': 'track is required'}), 400
+    if request.args.get('field'):
+        driver = None
+    else:
+        driver = request.args.get('driver') or load_career_data().get('driver_name', 'Player')
+    return jsonify(lap_archive.sector_percentiles(track, driver=driver,
+                                                  car=request.args.get('car') or None))
+
+
+@app.route('/api/results-archive')
+def results_archive_list():
+    """Result files moved into the compressed archive (?season= to filter)."""
+    season = request.args.get('season', type=int)
+    return jsonify({
+        'policy': retention_policy(load_config()),
+        'files':  results_retention.list(season),
+    })
+
+
+@app.route('/api/results-archive/debrief')
+def results_archive_debrief():
+    """Regenerate the engineer debrief of an archived race.
+
+    ?key=<archive key>, or ?season=&race= for a career race.
+    """
+    key = request.args.get('key', '')
+    if not key:
+        entry = results_retention.find_race(request.args.get('season', type=int),
+                                            request.args.get('race', type=int))
+        key = entry['key'] if entry else ''
+    raw = results_retention.read(key) if key else None
+    parsed = ac_results.parse_result(raw) if raw is not None else None
+    if parsed is None or parsed[0] != 'RACE':
+        return jsonify({'status': 'not_found', 'message': 'Archived race not found'}), 404
+    _, data, results = parsed
+    driver_name = request.args.get('driver') or load_career_data().get('driver_name', 'Player')
+    player_result, player_position = ac_results.find_driver(results, [driver_name])
+    if player_result is None:
+        return jsonify({'status': 'not_found', 'message': 'Driver not found in results'}), 404
+    return jsonify({
+        'status':       'found',
+        'key':          key,
+        'track':        ac_results.track_id(raw),
+        'position':     player_position,
+        'lap_analysis': _build_lap_analysis(data, results, driver_name,
+                                            player_result, player_position),
+    })
+
+
+# Thumbnails are keyed by source mtime, but the skin behind car+index can
+# change when liveries are (un)installed — revalidate after an hour.
+LIVERY_MAX_AGE_S = 3600
+
+_warmed_liveries = set()
+_warmed_liveries_lock = threading.Lock()
+
+
 @app.route('/api/livery-preview')
 def livery_preview():
+    """Downscaled skin preview (?size=sm|md, default md) with ETag /
+    Last-Modified / Cache-Control so the webview reuses its copy."""
     car   = request.args.get('car', '')
-    index = int(request.args.get('index', 0))
+    index = request.args.get('index', 0, type=int)
     cfg     = load_config()
     ac_path = cfg.get('paths', {}).get('ac_install', '')
     if not car or not ac_path:
         abort(404)
-    skins_dir = os.path.join(ac_path, 'content', 'cars', car, 'skins')
-    try:
-        skins = sorted(os.listdir(skins_dir))
-        if not skins:
-            abort(404)
-        skin = skins[index % len(skins)]
-        for fname in ('preview.jpg', 'preview.png'):
-            preview = os.path.join(skins_dir, skin, fname)
-            if os.path.isfile(preview):
-                return send_file(preview)
-        abort(404)
-    except Exception:
+    preview = content_index.ensure(ac_path).skin_preview(ac_path, car, index)
+    path = thumbnails.thumbnail(preview, request.args.get('size', 'md')) if preview else None
+    if not path or not os.path.isfile(path):
         abort(404)
+    return send_file(path, conditional=True, etag=True, max_age=LIVERY_MAX_AGE_S)
+
+
+def _warm_tier_liveries(career_data, ac_path):
+    """Render the current tier's standings swatches in the background, once
+    per (tier, content revision)."""
+    if not ac_path or not career_data.get('driver_name'):
+        return
+    tier_idx = career_data.get('tier', 0)
+    if not (0 <= tier_idx < len(career.tiers)):
+        return
+    index = content_index.ensure(ac_path)
+    key = (ac_path, tier_idx, index.revision)
+    with _warmed_liveries_lock:
+        # While a warm job runs another one cannot start; leave the key
+        # unmarked so a later call renders this tier
+        if key in _warmed_liveries or jobs.running('warm-liveries') is not None:
+            return
+        cars = {t.get('car') for t in career.get_tier_info(tier_idx).get('teams', [])}
+        sources = [p for car in sorted(c for c in cars if c)
+                   for p in index.skin_previews(ac_path, car)]
+        if sources:
+            jobs.start('warm-liveries', lambda job: thumbnails.warm(sources, progress=job.update))
+        _warmed_liveries.add(key)
 
 
 @app.route('/api/config', methods=['GET'])
@@ -2171,90 +2928,199 @@ def preflight_check():
     ac_path = cfg.get('paths', {}).get('ac_install', '')
     track   = request.args.get('track', '')
     car     = request.args.get('car', '')
-    result  = _check_preflight(ac_path, track, car)
+    career_data = None
+    if not track:
+        # No explicit pair: check the planned next race
+        career_data = load_career_data()
+        race  = _race_plan(career_data, cfg)['race']
+        track = race['track']
+        car   = car or race['car']
+    result  = _check_preflight(ac_path, track, car, career_data=career_data)
     return jsonify(result)
 
 
+@app.route('/api/preflight-season')
+def preflight_season():
+    """Preflight the whole season at once: every calendar round's track and
+    every team car in the player's tier.
+
+    Returns {ok, revision, issues (install / CSP), rounds: [{round, track, ok,
+    issues}], cars: [{car, ok, issues}]}.  ?refresh=1 rescans the content
+    folders first (e.g. right after installing a mod).
+    """
+    return jsonify(_preflight_season_payload(load_career_data(), load_config(),
+                                             refresh=bool(request.args.get('refresh'))))
+
+
+def _preflight_season_payload(career_data, cfg, refresh=False):
+    ac_path     = cfg.get('paths', {}).get('ac_install', '')
+    tier_idx    = career_data.get('tier', 0)
+    tier_key    = career.tiers[tier_idx]
+    tier_info   = career.get_tier_info(tier_idx)
+    tracks      = _get_career_tracks(tier_key, tier_info, career_data)
+    cars        = sorted({t.get('car') for t in tier_info.get('teams', []) if t.get('car')}
+                         | ({career_data['car']} if career_data.get('car') else set()))
+
+    global_issues = _install_issues(ac_path)
+    if global_issues:
+        return {'ok': False, 'revision': None, 'issues': global_issues,
+                'rounds': [], 'cars': []}
+
+    index = content_index.ensure(ac_path)
+    if refresh:
+        index.refresh(ac_path)
+    verdicts = _content_verdicts(index, ac_path)
+    global_issues = _csp_issues(ac_path, career_data)
+
+    rounds = []
+    for i, track in enumerate(tracks, start=1):
+        issues = _track_issues(verdicts, index, track)
+        rounds.append({'round': i, 'track': track, 'ok': not issues, 'issues': issues})
+    car_rows = []
+    for car in cars:
+        issues = _car_issues(verdicts, index, car)
+        car_rows.append({'car': car, 'ok': not any(x['type'] == 'error' for x in issues),
+                         'issues': issues})
+
+    ok = (all(r['ok'] for r in rounds) and all(c['ok'] for c in car_rows)
+          and not any(x['type'] == 'error' for x in global_issues))
+    return {'ok': ok, 'revision': verdicts['revision'], 'issues': global_issues,
+            'rounds': rounds, 'cars': car_rows}
+
+
 def detect_csp(ac_path):
-    """Return CSP / Pure installation status.
+    """Return CSP / Pure installation status (memoized, see environment.py).
     CSP  detected → <AC>/extension/ folder exists
     Pure detected → <AC>/extension/weather/pure/ folder exists
     """
-    ext  = os.path.join(ac_path, 'extension')
-    pure = os.path.join(ac_path, 'extension', 'weather', 'pure')
-    return {
-        'csp':  os.path.isdir(ext),
-        'pure': os.path.isdir(pure),
-    }
+    return environment.csp(ac_path)
 
 
-def _check_preflight(ac_path, track, car):
-    """Validate that track and car exist in the AC content folder.
+@app.route('/api/environment')
+def environment_status():
+    """Diagnostics: resolved AC install, Documents / results / out / cfg
+    folders, Steam libraries and CSP / Pure status.  ?refresh=1 re-probes."""
+    if request.args.get('refresh'):
+        environment.refresh()
+    cfg = load_config()
+    return jsonify(environment.get(cfg.get('paths', {}).get('ac_install', '')))
 
-    Returns {'ok': bool, 'issues': [{'type': 'error'|'warning', 'msg': str}]}
-    """
-    issues = []
 
-    if not os.path.exists(os.path.join(ac_path, 'acs.exe')):
-        issues.append({
-            'type': 'error',
-            'msg':  'AC installation not found. Check your AC path in Settings.',
-        })
-        return {'ok': False, 'issues': issues}
+# Track / car verdicts only change when the content index does, so they are
+# cached per (AC path, index revision); a launch check is then a dict lookup.
+_preflight_lock  = threading.Lock()
+_preflight_cache = {'key': None, 'revision': None, 'tracks': {}, 'cars': {}}
+
 
+def _content_verdicts(index, ac_path):
+    key = (os.path.normcase(ac_path), index.revision)
+    with _preflight_lock:
+        if _preflight_cache['key'] != key:
+            _preflight_cache.update(key=key, revision=key[1], tracks={}, cars={})
+        return _preflight_cache
+
+
+def _track_issues(verdicts, index, track):
     # Track: strip layout suffix (e.g. "ks_silverstone/gp" → "ks_silverstone")
-    track_folder = track.split('/')[0]
-    track_path   = os.path.join(ac_path, 'content', 'tracks', track_folder)
-    if not os.path.isdir(track_path):
-        issues.append({
-            'type': 'error',
-            'msg':  f'Track not found: {track_folder}. Install this track mod before racing.',
-        })
+    track_folder = (track or '').split('/')[0]
+    issues = verdicts['tracks'].get(track_folder)
+    if issues is None:
+        issues = []
+        if index.track(track_folder) is None:
+            issues.append({
+                'type': 'error',
+                'msg':  f'Track not found: {track_folder}. Install this track mod before racing.',
+            })
+        verdicts['tracks'][track_folder] = issues
+    return list(issues)
 
-    # Car: needs the car folder + either data/ (mods) or data.acd (Kunos stock cars)
-    if car:
-        car_path      = os.path.join(ac_path, 'content', 'cars', car)
-        car_data_path = os.path.join(car_path, 'data')
-        car_data_acd  = os.path.join(car_path, 'data.acd')
-        if not os.path.isdir(car_path):
+
+def _car_issues(verdicts, index, car):
+    issues = verdicts['cars'].get(car)
+    if issues is None:
+        # Car: needs the car folder + either data/ (mods) or data.acd (Kunos stock cars)
+        issues = []
+        if index.car(car) is None:
             issues.append({
                 'type': 'error',
                 'msg':  f'Car not found: {car}. Install this car mod before racing.',
             })
-        elif not os.path.isdir(car_data_path) and not os.path.isfile(car_data_acd):
+        elif not index.car_usable(car):
             issues.append({
                 'type': 'warning',
                 'msg':  f'Car "{car}" may be incomplete (missing data folder).',
             })
+        verdicts['cars'][car] = issues
+    return list(issues)
 
-    # CSP checks
-    csp_status = detect_csp(ac_path)
-    cd_check   = load_career_data()
-    cs_check   = cd_check.get('career_settings', {})
 
-    if cs_check.get('night_cycle', True) and not csp_status['csp']:
-        issues.append({
+def _install_issues(ac_path):
+    if not os.path.exists(os.path.join(ac_path, 'acs.exe')):
+        return [{
+            'type': 'error',
+            'msg':  'AC installation not found. Check your AC path in Settings.',
+        }]
+    return []
+
+
+def _csp_issues(ac_path, career_data=None):
+    """Night-cycle warning when CSP is missing.  The save is only read (or
+    career_data consulted) when CSP is actually absent."""
+    if detect_csp(ac_path)['csp']:
+        return []
+    if career_data is None:
+        career_data = load_career_data()
+    if (career_data.get('career_settings') or {}).get('night_cycle', True):
+        return [{
             'type': 'warning',
             'msg':  'Night cycle is enabled but Custom Shader Patch (CSP) was not found. '
                     'Install CSP via Content Manager for full day/night progression. '
                     'Without CSP the race will start at a fixed sun angle.',
-        })
+        }]
+    return []
+
+
+def _check_preflight(ac_path, track, car, career_data=None):
+    """Validate that track and car exist in the AC content folder.
+
+    Returns {'ok': bool, 'issues': [{'type': 'error'|'warning', 'msg': str}]}
+    """
+    issues = _install_issues(ac_path)
+    if issues:
+        return {'ok': False, 'issues': issues}
+
+    index = content_index.ensure(ac_path)
+    # Something just installed may be newer than the index TTL — rescan once
+    if index.track(track) is None or (car and index.car(car) is None):
+        index.refresh(ac_path)
+    verdicts = _content_verdicts(index, ac_path)
+
+    issues = _track_issues(verdicts, index, track)
+    if car:
+        issues += _car_issues(verdicts, index, car)
+    issues += _csp_issues(ac_path, career_data)
 
     return {'ok': len(issues) == 0, 'issues': issues}
 
 
 @app.route('/api/career-settings', methods=['POST'])
 def update_career_settings():
-    career_data = load_career_data()
     patch, err = _require_json_object()
     if err:
         return err
-    cs          = career_data.setdefault('career_settings', {})
-    cs.update(patch)
-    save_career_data(career_data)
+    with career_state.transaction() as career_data:
+        career_data.setdefault('career_settings', {}).update(patch)
     return jsonify({'status': 'success'})
 
 
+@app.errorhandler(StaleWriteError)
+def stale_write(e):
+    # Another request saved the career while this one worked on an older copy
+    return jsonify({'status': 'error', 'code': 'stale_write',
+                    'message': 'Career changed in the meantime, please reload and retry',
+                    'revision': e.current}), 409
+
+
 @app.errorhandler(404)
 def not_found(e):
     return jsonify({'error': 'Not found'}), 404
@@ -2265,13 +3131,71 @@ def server_error(e):
     return jsonify({'error': 'Server error', 'detail': str(e)}), 500
 
 
+startup_profile.mark('routes')
+
+
 # ---------------------------------------------------------------------------
-# Entry point — launches pywebview window (works as script and as EXE)
+# Entry point — launches pywebview window (works as script and as EXE),
+# or with --headless only the server
+# Batch operations without any server: career_cli.py
 # ---------------------------------------------------------------------------
 
-if __name__ == '__main__':
+def _parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='AC Career GT Edition')
+    parser.add_argument('--headless', action='store_true',
+                        help='serve the UI / API without opening a window (no GUI imports)')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='headless: interface to bind (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=None,
+                        help=f'headless: port (default {DEFAULT_PORT}, or a free one if taken)')
+    parser.add_argument('--startup-profile', action='store_true',
+                        help='print a per-phase start-up timing breakdown to stderr')
+    parser.add_argument('--allow-origin', action='append', default=[], metavar='URL',
+                        help='headless: extra browser origin allowed to write, e.g. '
+                             'http://my-pc.lan:5000 (repeatable)')
+    return parser.parse_args(argv)
+
+
+def run_headless(host='127.0.0.1', port=None, origins=()):
+    """Serve the UI / API until interrupted (Ctrl+C)."""
+    import time
+    from embedded_server import EmbeddedServer
+
+    # An explicit --port is used as given; the default falls back to a free one
+    server = EmbeddedServer(app, host=host, port=DEFAULT_PORT if port is None else port,
+                            fallback_to_free_port=port is None).bind()
+    allow_local_port(server.port)
+    if host not in ('127.0.0.1', 'localhost', '0.0.0.0', '::', ''):
+        allow_web_origins([f'http://{host}:{server.port}'])
+    allow_web_origins(origins)
+    server.start()
+    startup_profile.mark('server bound')
+    print(f'AC Career GT Edition serving on {server.url} (Ctrl+C to stop)', flush=True)
+    startup_profile.report()
+    run_startup_migrations(background=True)
+    try:
+        while True:             # sleep, not Event.wait(): Ctrl+C on Windows
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+def _run_gui():
+    """Desktop mode: embedded server + pywebview window."""
     import time
     import ctypes
+    from embedded_server import EmbeddedServer
+
+    # Server first: it is bound before start() returns, and the save
+    # migrations run on a background thread while the GUI toolkit loads
+    server = EmbeddedServer(app, port=DEFAULT_PORT).bind()
+    allow_local_port(server.port)
+    server.start()
+    startup_profile.mark('server bound')
+    run_startup_migrations(background=True)
 
     # Configure pythonnet to use .NET 8 Desktop Runtime (needed for WinForms/EdgeChromium)
     try:
@@ -2284,6 +3208,7 @@ if __name__ == '__main__':
         pass  # fall back to auto-detect (netfx or env var)
 
     import webview
+    startup_profile.mark('gui toolkit (pythonnet, webview)')
 
     class JsApi:
         """Python functions exposed to JavaScript via window.pywebview.api"""
@@ -2320,25 +3245,26 @@ if __name__ == '__main__':
         user32.SendMessageW(hwnd, WM_SETICON, ICON_SMALL, hicon)
         user32.SendMessageW(hwnd, WM_SETICON, ICON_BIG, hicon)
 
-    def run_flask():
-        app.run(debug=False, host='127.0.0.1', port=5000, use_reloader=False)
-
-    flask_thread = threading.Thread(target=run_flask, daemon=True)
-    flask_thread.start()
-    time.sleep(0.8)  # let Flask start up
-
     api    = JsApi()
     window_title = 'AC Career GT Edition'
     window = webview.create_window(
         window_title,
-        'http://127.0.0.1:5000',
+        server.url,
         width=1440, height=920,
         min_size=(1000, 700),
         js_api=api,
     )
+    startup_profile.mark('window created')
     icon_path = os.path.join(APP_DIR, 'static', 'logo.ico')
 
+    def on_page_loaded():
+        startup_profile.mark('dashboard loaded')
+        startup_profile.report()
+
+    window.events.loaded += on_page_loaded
+
     def on_webview_ready():
+        startup_profile.mark('window shown')
         _set_windows_titlebar_icon(window_title, icon_path)
 
     gui_backend = get_webview_gui()   # 'gtk' on Linux, 'edgechromium' on Windows
@@ -2346,3 +3272,13 @@ if __name__ == '__main__':
         webview.start(func=on_webview_ready, gui=gui_backend)
     except Exception:
         webview.start(func=on_webview_ready)  # last-resort fallback (auto-detect)
+    # Window closed: let in-flight requests (a save) finish before exiting
+    server.stop()
+
+
+if __name__ == '__main__':
+    args = _parse_args()
+    if args.headless:
+        run_headless(args.host, args.port, args.allow_origin)
+    else:
+        _run_gui()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Career CLI — batch operations on the career save, without the window.
+
+    python career_cli.py finish-race RESULT.json     record a race from an AC result file
+    python career_cli.py finish-race --position 3    record a race by position
+    python career_cli.py end-season                  close the season, offer contracts
+    python career_cli.py accept-contract [ID]        sign a contract (default: the first)
+    python career_cli.py export [-o career.json]     career save as plain JSON
+    python career_cli.py simulate --seasons 3        play whole seasons with random finishes
+    python career_cli.py rebuild-indexes             full rescan of the AC content index
+
+Commands go through the same API handlers as the UI (Flask's in-process
+test client), so validation, news, progression and saves behave exactly as
+in the app; nothing is served and no GUI toolkit is imported.  To serve the
+UI / API without a window use `python app.py --headless`.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+
+def _client():
+    # Deferred: importing app loads the config and career save
+    import app
+    app.run_startup_migrations()
+    return app, app.app.test_client()
+
+
+def _post(client, path, body=None):
+    """POST *path*; (status code, JSON body)."""
+    from app import DEFAULT_PORT
+    # Write endpoints only accept requests from the local UI origin
+    resp = client.post(path, json=body or {},
+                       headers={'Origin': f'http://127.0.0.1:{DEFAULT_PORT}'})
+    return resp.status_code, resp.get_json(silent=True) or {}
+
+
+def _fail(message):
+    print(message, file=sys.stderr)
+    return 1
+
+
+def _require_career(app):
+    career_data = app.load_career_data()
+    if not career_data.get('team'):
+        return None
+    return career_data
+
+
+def _result_from_file(path, driver_name):
+    """{position, lap_time, margin_ms} of *driver_name* in an AC result file."""
+    import ac_results
+    raw = ac_results.load_json(path)
+    parsed = ac_results.parse_result(raw) if raw is not None else None
+    if parsed is None:
+        raise ValueError(f'{path}: not an AC result file')
+    stype, _, results = parsed
+    if stype != 'RACE':
+        raise ValueError(f'{path}: {stype} session, not a race')
+    row, position = ac_results.find_driver(results, [driver_name])
+    if row is None:
+        raise ValueError(f'{path}: {driver_name} not found in the results')
+    best = row.get('BestLap') or 0
+    lap_time = f'{best // 60000:02d}:{(best % 60000) / 1000:06.3f}' if best > 0 else ''
+    margin = None
+    if position == 1 and len(results) > 1:
+        try:
+            gap = int(results[1].get('TotalTime', 0)) - int(row.get('TotalTime', 0))
+            margin = gap if gap > 0 else None
+        except (TypeError, ValueError):
+            margin = None
+    return {'position': position, 'lap_time': lap_time, 'margin_ms': margin}
+
+
+def _report(status, body):
+    if status != 200:
+        return _fail(body.get('message') or body.get('error') or f'HTTP {status}')
+    print(json.dumps(body, indent=2, ensure_ascii=False))
+    return 0
+
+
+def cmd_finish_race(args):
+    app, client = _client()
+    career_data = _require_career(app)
+    if career_data is None:
+        return _fail('No career found — start a career first.')
+    if args.result:
+        try:
+            body = _result_from_file(args.result, career_data.get('driver_name', 'Player'))
+        except ValueError as e:
+            return _fail(str(e))
+        # The laps of this file go to the lap archive and debrief
+        body['result_file'] = os.path.abspath(args.result)
+    elif args.position:
+        # No AC result behind a hand-entered position: archive nothing
+        body = {'position': args.position, 'lap_time': args.lap_time or '', 'archive': False}
+    else:
+        return _fail('Give a result file or --position.')
+    return _report(*_post(client, '/api/finish-race', body))
+
+
+def cmd_end_season(args):
+    app, client = _client()
+    if _require_career(app) is None:
+        return _fail('No career found — start a career first.')
+    return _report(*_post(client, '/api/end-season'))
+
+
+def cmd_accept_contract(args):
+    app, client = _client()
+    career_data = _require_career(app)
+    if career_data is None:
+        return _fail('No career found — start a career first.')
+    contracts = career_data.get('contracts') or []
+    if not contracts:
+        return _fail('No contracts on offer — finish the season first.')
+    contract_id = args.contract_id or contracts[0].get('id')
+    return _report(*_post(client, '/api/accept-contract', {'contract_id': contract_id}))
+
+
+def cmd_export(args):
+    app, _ = _client()
+    text = json.dumps(app.load_career_data(), indent=2, ensure_ascii=False)
+    if args.output in (None, '-'):
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f'Career exported to {args.output}')
+    return 0
+
+
+def cmd_simulate(args):
+    """Finish every race of N seasons with seeded random positions,
+    signing the first contract offered after each season."""
+    app, client = _client()
+    if _require_career(app) is None:
+        return _fail('No career found — start a career first.')
+    rng = random.Random(args.seed)
+    for n in range(args.seasons):
+        races = 0
+        while True:
+            position = rng.randint(1, args.worst)
+            status, body = _post(client, '/api/finish-race',
+                                 {'position': position, 'lap_time': '', 'archive': False})
+            if status != 200 or body.get('status') == 'error':
+                return _fail(body.get('message') or f'finish-race: HTTP {status}')
+            races += 1
+            if body.get('status') == 'season_complete':
+                break
+        contracts = body.get('contracts') or []
+        signed = contracts[0] if contracts else None
+        if signed is not None:
+            status, accepted = _post(client, '/api/accept-contract',
+                                     {'contract_id': signed.get('id')})
+            if status != 200 or accepted.get('status') == 'error':
+                return _fail(accepted.get('message') or f'accept-contract: HTTP {status}')
+        print(f"Season {n + 1}/{args.seasons}: {races} races, P{body.get('position')} "
+              f"({body.get('total_points')} pts)"
+              + (f" → {signed.get('team_name')}" if signed else ''))
+    return 0
+
+
+def cmd_rebuild_indexes(args):
+    app, _ = _client()
+    ac_path = app._scan_ac_path()
+    if ac_path is None:
+        return _fail('AC installation not found. Check the AC path in the settings.')
+    app.content_index.rebuild(ac_path)
+    print(f'Content index rebuilt: {len(app.content_index.cars())} cars, '
+          f'{len(app.content_index.tracks())} tracks')
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch operations on the AC Career save.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('finish-race', help='record the next race result')
+    p.add_argument('result', nargs='?', help='AC result JSON (results/*.json or race_out.json)')
+    p.add_argument('--position', type=int, help='finishing position (no result file)')
+    p.add_argument('--lap-time', help='best lap, e.g. 01:40.123 (with --position)')
+    p.set_defaults(func=cmd_finish_race)
+
+    p = sub.add_parser('end-season', help='close the season and offer contracts')
+    p.set_defaults(func=cmd_end_season)
+
+    p = sub.add_parser('accept-contract', help='sign an offered contract')
+    p.add_argument('contract_id', nargs='?', help='contract id (default: the first offer)')
+    p.set_defaults(func=cmd_accept_contract)
+
+    p = sub.add_parser('export', help='write the career save as plain JSON')
+    p.add_argument('-o', '--output', help='output file (default: stdout)')
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('simulate', help='play whole seasons with random finishing positions')
+    p.add_argument('--seasons', type=int, default=1)
+    p.add_argument('--seed', type=int, default=None)
+    p.add_argument('--worst', type=int, default=10, help='worst random finishing position')
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser('rebuild-indexes', help='re-read every AC car and track folder')
+    p.set_defaults(func=cmd_rebuild_indexes)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Career IDs — interned driver / team ids for the save file.
+
+Driver names used to be repeated as keys and values all over career_data
+(driver_progress, form_scores, driver_history, rivalries, driver_swaps,
+retired_drivers, _prev_standings_order, swap_log) and team names across
+team_development and swap_log.
+
+The save now stores one id table
+
+    career_data['ids'] = {'drivers': [name, ...], 'teams': [name, ...]}
+
+and those structures keyed / valued by the integer index into it.  Ids are
+append-only: a name keeps its id for the lifetime of the career, so other
+stores can index by them.  Curated drivers are pre-seeded in DRIVER_NAMES
+order.
+
+app._read_career_file() expands an interned save back to names (request
+handlers and the UI only ever see names); app._write_career_file() interns
+a copy.  Saves without an id table (older versions) load as-is and are
+interned on their next save.
+"""
+
+from driver_data import DRIVER_NAMES
+
+# Top-level career_data keys whose driver names are interned
+DRIVER_KEYED   = ('driver_progress', 'form_scores', 'driver_history')
+DRIVER_LISTS   = ('retired_drivers',)
+# {tier_key: [names]} / {slot: name}
+TIER_ORDERS    = ('_prev_standings_order',)
+SLOT_MAPS      = ('driver_swaps',)
+
+
+class IdTable:
+    """Bidirectional name ↔ id table (append-only)."""
+
+    def __init__(self, drivers=None, teams=None):
+        self.drivers = list(DRIVER_NAMES if drivers is None else drivers)
+        self.teams   = list(teams or [])
+        self._driver_ids = {n: i for i, n in enumerate(self.drivers)}
+        self._team_ids   = {n: i for i, n in enumerate(self.teams)}
+
+    @classmethod
+    def from_dict(cls, d):
+        d = d or {}
+        return cls(d.get('drivers'), d.get('teams'))
+
+    def to_dict(self):
+        return {'drivers': list(self.drivers), 'teams': list(self.teams)}
+
+    def driver_id(self, name):
+        i = self._driver_ids.get(name)
+        if i is None:
+            i = self._driver_ids[name] = len(self.drivers)
+            self.drivers.append(name)
+        return i
+
+    def team_id(self, name):
+        i = self._team_ids.get(name)
+        if i is None:
+            i = self._team_ids[name] = len(self.teams)
+            self.teams.append(name)
+        return i
+
+    def driver(self, i):
+        return self.drivers[int(i)]
+
+    def team(self, i):
+        return self.teams[int(i)]
+
+
+def _map_name(value, fn):
+    # Non-string values (None, already-missing swaps) pass through
+    return fn(value) if isinstance(value, (str, int)) and value != '' else value
+
+
+def _convert(data, driver, team, key_driver, key_team):
+    """Copy of *data* with every interned field mapped through the given
+    functions (value functions and dict-key functions)."""
+    out = dict(data)
+    for field in DRIVER_KEYED:
+        if isinstance(data.get(field), dict):
+            out[field] = {key_driver(k): v for k, v in data[field].items()}
+    for field in DRIVER_LISTS:
+        if isinstance(data.get(field), list):
+            out[field] = [_map_name(n, driver) for n in data[field]]
+    for field in TIER_ORDERS:
+        if isinstance(data.get(field), dict):
+            out[field] = {tier: [_map_name(n, driver) for n in names]
+                          for tier, names in data[field].items()}
+    for field in SLOT_MAPS:
+        if isinstance(data.get(field), dict):
+            out[field] = {slot: _map_name(n, driver) for slot, n in data[field].items()}
+    if isinstance(data.get('rivalries'), dict):
+        out['rivalries'] = {
+            tier: [{**r, 'drivers': [_map_name(n, driver) for n in r.get('drivers', [])]}
+                   for r in rivals]
+            for tier, rivals in data['rivalries'].items()
+        }
+    if isinstance(data.get('swap_log'), list):
+        out['swap_log'] = [
+            {**e,
+             'dropped':     _map_name(e.get('dropped'), driver),
+             'replacement': _map_name(e.get('replacement'), driver),
+             'team':        _map_name(e.get('team'), team)}
+            for e in data['swap_log']
+        ]
+    if isinstance(data.get('team_development'), dict):
+        out['team_development'] = {key_team(k): v for k, v in data['team_development'].items()}
+    return out
+
+
+def intern_career(data):
+    """Copy of *data* ready to be written: names replaced by ids, with the
+    id table under 'ids'.  data['ids'] is updated with any new names so the
+    in-memory career keeps the same ids on later saves."""
+    table = IdTable.from_dict(data.get('ids'))
+    out = _convert(data, table.driver_id, table.team_id,
+                   lambda k: str(table.driver_id(k)), lambda k: str(table.team_id(k)))
+    data['ids'] = out['ids'] = table.to_dict()
+    return out
+
+
+def expand_career(data):
+    """Names in place of ids (inverse of intern_career).  Saves without an
+    id table are returned unchanged."""
+    if not isinstance(data.get('ids'), dict):
+        return data
+    table = IdTable.from_dict(data['ids'])
+    return _convert(data, table.driver, table.team, table.driver, table.team)
@@ -9,10 +9,23 @@ import hashlib
 from datetime import datetime
 import subprocess
 import os
+import threading
 
 from platform_paths import get_ac_docs_path, is_linux
+from driver_table import ProfileTables
+from race_config import RaceConfigCompiler
 from driver_data import (DRIVER_NAMES, DRIVER_PROFILES, DRIVERS_PER_TEAM,
-                         TIER_SLOT_OFFSET, TRACK_PREFERENCES, get_driver_style)
+                         TIER_SLOT_OFFSET, get_driver_style)
+
+# Entries kept per name-pool cache (one per season / retirement set in use)
+MAX_NAME_CACHE = 8
+
+
+def _cache_put(cache, key, value):
+    # Insertion-ordered dict: drop the oldest entries beyond MAX_NAME_CACHE
+    cache[key] = value
+    while len(cache) > MAX_NAME_CACHE:
+        del cache[next(iter(cache))]
 
 
 class CareerManager:
@@ -45,10 +58,20 @@ class CareerManager:
         # 'zandvoort', 'ks_barcelona/layout_gp', 'imola' → default 'balanced'
     }
 
-    def __init__(self, config):
-        self.config = config
+    def __init__(self, config, content_index=None):
+        # The config dict, or a callable that loads it on first use
+        self._config = config
+        # Optional content_index.ContentIndex — replaces per-call folder stats
+        self.content_index = content_index
+        # race.ini writer with per-career driver tables (race_config.py)
+        self.race_config = RaceConfigCompiler(self)
+        # Effective driver profiles per career state (driver_table.py)
+        self.profile_tables = ProfileTables()
         self.tiers = ['mx5_cup', 'gt4', 'gt3', 'wec']
+        # Name pools per (season, seed[, retired]); shared by request threads
         self._procedural_name_cache = {}
+        self._roster_cache = {}
+        self._cache_lock = threading.Lock()
         self.tier_names = {
             'mx5_cup': 'MX5 Cup',
             'gt4':     'GT4 SuperCup',
@@ -56,18 +79,19 @@ class CareerManager:
             'wec':     'WEC / Elite'
         }
 
+    @property
+    def config(self):
+        if callable(self._config):
+            self._config = self._config()
+        return self._config
+
+    def profile_view(self, name, career_data=None):
+        """Read-only effective profile (hot paths; no per-call merge)."""
+        return self.profile_tables.get(career_data).view(name)
+
     def get_driver_profile(self, name, career_data=None):
         """Return profile dict for a driver name, with derived style field."""
-        defaults = {"nationality": "GBR", "skill": 80, "aggression": 40,
-                     "wet_skill": 65, "quali_pace": 65, "consistency": 65, "nickname": None}
-        p = {**defaults, **self.DRIVER_PROFILES.get(name, {})}
-        if career_data:
-            progress = (career_data.get('driver_progress') or {}).get(name, {})
-            current = progress.get('current') or {}
-            for key in ['skill', 'aggression', 'wet_skill', 'quali_pace', 'consistency']:
-                if key in current:
-                    p[key] = int(round(float(current[key])))
-        return {**p, "style": get_driver_style(p["skill"], p["aggression"])}
+        return dict(self.profile_view(name, career_data))
 
     def get_tier_info(self, tier_index):
         """Get tier configuration by index"""
@@ -90,17 +114,19 @@ class CareerManager:
 
     def generate_race(self, tier_info, race_num, team_name, car,
                       tier_key=None, season=1, weather_mode='realistic', night_cycle=True,
-                      career_data=None):
+                      career_data=None, rng=None):
         """Generate next race configuration.
         weather_mode: 'realistic' (default pool) | 'always_clear' | 'wet_challenge'
         night_cycle: if True and laps >= 30, enables time-of-day progression via SUN_ANGLE + TIME_OF_DAY_MULT
+        rng: optional random.Random for AI level / opponent jitter (see race_plan.py);
+             defaults to the global random module.
         """
         tracks = tier_info['tracks']
         track = tracks[(race_num - 1) % len(tracks)]
 
-        ai_difficulty = self._calculate_ai_difficulty(team_name, tier_info)
+        ai_difficulty = self._calculate_ai_difficulty(team_name, tier_info, rng=rng)
         opponents = self._generate_opponent_field(tier_info, race_num, tier_key=tier_key,
-                                                  season=season, career_data=career_data)
+                                                  season=season, career_data=career_data, rng=rng)
 
         weather_seed = season * 1000 + race_num
         weather = self._pick_weather(tier_info['race_format'], track, weather_mode=weather_mode,
@@ -175,23 +201,26 @@ class CareerManager:
 
         return chosen
 
-    def _calculate_ai_difficulty(self, team_name, tier_info):
+    def _calculate_ai_difficulty(self, team_name, tier_info, rng=None):
+        rng  = rng or random
         base = self.config['difficulty']['base_ai_level']
         adj  = tier_info['ai_difficulty']
-        var  = random.uniform(
+        var  = rng.uniform(
             -self.config['difficulty']['ai_variance'],
              self.config['difficulty']['ai_variance']
         )
         return max(60, min(100, base + adj + var))
 
-    def _generate_opponent_field(self, tier_info, race_num, tier_key=None, season=1, career_data=None):
+    def _generate_opponent_field(self, tier_info, race_num, tier_key=None, season=1, career_data=None,
+                                 rng=None):
+        rng = rng or random
         opponents = []
         offset = self.TIER_SLOT_OFFSET.get(tier_key, 0) if tier_key else 0
         dpt    = self.DRIVERS_PER_TEAM.get(tier_key, 1) if tier_key else 1
         career_seed = int((career_data or {}).get('driver_seed') or 0)
         name_mode = self._get_name_mode(career_data)
         for i, team in enumerate(tier_info['teams']):
-            perf = team.get('performance', 0) + random.uniform(-0.5, 0.5)
+            perf = team.get('performance', 0) + rng.uniform(-0.5, 0.5)
             global_slot = offset + i * dpt
             driver_name = self._get_driver_name(
                 global_slot, season, career_seed, name_mode,
@@ -212,7 +241,7 @@ class CareerManager:
     # Weekend simulation — practice and qualifying results
     # ------------------------------------------------------------------
 
-    def simulate_qualifying(self, opponents, ai_lvl, career_data=None):
+    def simulate_qualifying(self, opponents, ai_lvl, career_data=None, rng=None):
         """Simulate qualifying for all opponents + player.
 
         Each driver runs 3 hot laps (take best). Pace is driven by quali_pace
@@ -221,16 +250,17 @@ class CareerManager:
         Returns list sorted P1→last:
             [{'name', 'car', 'team', 'is_player', 'pace_score', 'position'}, ...]
         """
+        rng = rng or random
         player_team = (career_data or {}).get('team')
         results = []
         for opp in opponents[:19]:
             if player_team and opp.get('team') == player_team:
                 continue  # player fills this slot — skip the AI stand-in
             name    = opp.get('driver_name') or ''
-            profile = self.get_driver_profile(name, career_data=career_data)
+            profile = self.profile_view(name, career_data=career_data)
             base    = opp.get('performance', 0) + (profile.get('quali_pace', 75) - 75) * 0.4
             spread  = (100 - profile.get('consistency', 75)) * 0.08
-            best    = max(base + random.gauss(0, spread) for _ in range(3))
+            best    = max(base + rng.gauss(0, spread) for _ in range(3))
             results.append({
                 'name': name, 'car': opp.get('car', ''),
                 'team': opp.get('team', ''), 'is_player': False, 'pace_score': best,
@@ -238,7 +268,7 @@ class CareerManager:
 
         # Player pace: relative to field average, scaled by adaptive AI level
         field_avg   = sum(r['pace_score'] for r in results) / len(results) if results else 0
-        player_pace = field_avg + (ai_lvl - 80) * 0.15 + random.gauss(0, 1.5)
+        player_pace = field_avg + (ai_lvl - 80) * 0.15 + rng.gauss(0, 1.5)
         results.append({
             'name': 'PLAYER', 'car': '', 'team': '', 'is_player': True, 'pace_score': player_pace,
         })
@@ -259,7 +289,8 @@ class CareerManager:
 
     def _get_procedural_driver_name(self, global_slot, season, career_seed):
         cache_key = (season, career_seed)
-        pool = self._procedural_name_cache.get(cache_key)
+        with self._cache_lock:
+            pool = self._procedural_name_cache.get(cache_key)
         if pool is None:
             first_names = sorted({name.split(' ', 1)[0] for name in self.DRIVER_NAMES if ' ' in name})
             last_names = sorted({name.split(' ', 1)[1] for name in self.DRIVER_NAMES if ' ' in name})
@@ -270,14 +301,17 @@ class CareerManager:
             pairs = [f"{first} {last}" for first in first_names for last in last_names]
             rng.shuffle(pairs)
             pool = pairs
-            self._procedural_name_cache[cache_key] = pool
+            with self._cache_lock:
+                _cache_put(self._procedural_name_cache, cache_key, pool)
         return pool[global_slot % len(pool)]
 
     def _build_season_roster(self, season, career_seed=0, retired_set=None):
         """Build slot→name mapping for entire season, skipping retired drivers."""
         cache_key = (season, career_seed, frozenset(retired_set or set()))
-        if hasattr(self, '_roster_cache') and cache_key in self._roster_cache:
-            return self._roster_cache[cache_key]
+        with self._cache_lock:
+            roster = self._roster_cache.get(cache_key)
+        if roster is not None:
+            return roster
 
         seed = int(hashlib.md5(
             f"global_drivers|{season}|{career_seed}".encode()
@@ -291,9 +325,8 @@ class CareerManager:
         for slot in range(len(pool)):
             roster[slot] = available[slot % len(available)]
 
-        if not hasattr(self, '_roster_cache'):
-            self._roster_cache = {}
-        self._roster_cache[cache_key] = roster
+        with self._cache_lock:
+            _cache_put(self._roster_cache, cache_key, roster)
         return roster
 
     def _get_driver_name(self, global_slot, season, career_seed=0, name_mode='curated',
@@ -337,6 +370,8 @@ class CareerManager:
         """Return True if the car folder has data/ or data.acd (i.e. is not empty/missing)."""
         if not car or not ac_path:
             return True  # no AC path → don't filter; preflight will warn later
+        if self.content_index is not None:
+            return self.content_index.ensure(ac_path).car_usable(car)
         car_path = os.path.join(ac_path, 'content', 'cars', car)
         return (
             os.path.isdir(os.path.join(car_path, 'data')) or
@@ -496,33 +531,42 @@ class CareerManager:
         Player appears only in their own tier; other tiers show pure AI with
         standings proportional to the player's season progress.
         Also returns tier_progress: {tier_key: {done, total}} via second return value."""
-        result        = {}
-        tier_progress = {}
-        player_tier   = career_data.get('tier', 0)
-        player_races  = career_data.get('races_completed', 0)
-        player_total  = self.get_tier_races(career_data)
+        result = {tk: self.generate_tier_standings(career_data, tk) for tk in self.tiers}
+        return result, self.get_tier_progress(career_data)
 
+    def get_tier_progress(self, career_data):
+        """{tier_key: {'done', 'total'}} for every tier (no standings computed)."""
+        progress    = {}
+        player_tier = career_data.get('tier', 0)
         for idx, tk in enumerate(self.tiers):
-            tier_info = self.config['tiers'][tk]
             if idx == player_tier:
-                sim = career_data
-                tier_progress[tk] = {'done': player_races, 'total': player_total}
+                progress[tk] = {'done': career_data.get('races_completed', 0),
+                                'total': self.get_tier_races(career_data)}
             else:
                 ai_done, ai_total = self.get_ai_tier_races(tk, career_data)
-                sim = {
-                    'tier':            idx,
-                    'season':          career_data.get('season', 1),
-                    'team':            None,
-                    'races_completed': ai_done,
-                    'points':          0,
-                    'driver_name':     '',
-                    'driver_progress': career_data.get('driver_progress', {}),
-                }
-                tier_progress[tk] = {'done': ai_done, 'total': ai_total}
-            drivers = self.generate_standings(tier_info, sim, tier_key=tk)
-            teams   = self.generate_team_standings_from_drivers(drivers)
-            result[tk] = {'drivers': drivers, 'teams': teams}
-        return result, tier_progress
+                progress[tk] = {'done': ai_done, 'total': ai_total}
+        return progress
+
+    def generate_tier_standings(self, career_data, tier_key):
+        """{'drivers': [...], 'teams': [...]} for one tier (see generate_all_standings)."""
+        idx       = self.tiers.index(tier_key)
+        tier_info = self.config['tiers'][tier_key]
+        if idx == career_data.get('tier', 0):
+            sim = career_data
+        else:
+            ai_done, _ = self.get_ai_tier_races(tier_key, career_data)
+            sim = {
+                'tier':            idx,
+                'season':          career_data.get('season', 1),
+                'team':            None,
+                'races_completed': ai_done,
+                'points':          0,
+                'driver_name':     '',
+                'driver_progress': career_data.get('driver_progress', {}),
+            }
+        drivers = self.generate_standings(tier_info, sim, tier_key=tier_key)
+        teams   = self.generate_team_standings_from_drivers(drivers)
+        return {'drivers': drivers, 'teams': teams}
 
     def pick_rival(self, tier_key, season, career_data=None):
         """Pick the AI driver in tier_key whose skill is closest to 82.
@@ -542,7 +586,7 @@ class CareerManager:
             slot    = offset + i * dpt
             name    = self._get_driver_name(slot, season, career_seed, name_mode,
                                           career_data=career_data)
-            profile = self.get_driver_profile(name, career_data=career_data)
+            profile = self.profile_view(name, career_data=career_data)
             diff    = abs(profile.get('skill', 80) - 82)
             if diff < best_diff:
                 best_diff = diff
@@ -831,12 +875,13 @@ class CareerManager:
         return get_ac_docs_path("cfg")
 
     def launch_ac_race(self, race_config, config, mode='race_only', career_data=None,
-                       session_type=None, grid=None):
+                       session_type=None, grid=None, rng=None):
         """Launch Assetto Corsa with race configuration.
 
         mode:         'race_only' (default) | 'full_weekend'
         session_type: 'practice' | 'qualifying' | 'race' — for split weekend sessions.
         grid:         Pre-sorted car list from simulate_qualifying() or AC quali results.
+        rng:          optional random.Random for per-driver AI_LEVEL variance.
         """
         ac_path = config['paths']['ac_install']
 
@@ -851,7 +896,8 @@ class CareerManager:
         # 1. Write race.ini to Documents (where AC actually reads it)
         race_cfg_path = os.path.join(docs_cfg, 'race.ini')
         self._write_race_config(race_cfg_path, race_config, ac_path, mode=mode,
-                                career_data=career_data, session_type=session_type, grid=grid)
+                                career_data=career_data, session_type=session_type, grid=grid,
+                                rng=rng)
 
         # 2. Patch launcher.ini in Documents so AC starts in race mode
         launcher_path = os.path.join(docs_cfg, 'launcher.ini')
@@ -917,6 +963,9 @@ class CareerManager:
     def _get_car_skin(self, car, ac_path, index=0):
         """Return skin at the given index for a car (wraps around if fewer skins).
         Use index=0 for player, index=1..N for AI cars so each gets a distinct livery."""
+        if self.content_index is not None:
+            skins = self.content_index.ensure(ac_path).car_skins(car)
+            return skins[index % len(skins)] if skins else ''
         skins_dir = os.path.join(ac_path, 'content', 'cars', car, 'skins')
         try:
             skins = sorted(os.listdir(skins_dir))
@@ -925,7 +974,7 @@ class CareerManager:
             return ''
 
     def _write_race_config(self, config_path, race_data, ac_path='', mode='race_only',
-                           career_data=None, session_type=None, grid=None):
+                           career_data=None, session_type=None, grid=None, rng=None):
         """Write AC race.ini in the format AC expects (Documents/Assetto Corsa/cfg/race.ini).
 
         mode:         'race_only' (default) | 'full_weekend' (practice + quali + race in one go)
@@ -933,333 +982,23 @@ class CareerManager:
                       When set, overrides mode for session content and AI level calculation.
         grid:         Sorted list from simulate_qualifying() or actual quali results.
                       When provided, cars are written in grid order (player at correct position).
-        """
-        driver           = race_data.get('driver_name', 'Player')
-        player_nation    = (career_data or {}).get('player_nationality', '')
-        car              = race_data['car']
-        laps             = race_data['laps']
-        ai_lvl           = int(race_data['ai_difficulty'])
-        opponents        = race_data.get('opponents', [])
-        practice_minutes = race_data.get('practice_minutes', 10)
-        quali_minutes    = race_data.get('quali_minutes', 10)
-        weather          = race_data.get('weather', '3_clear')
-
-        # Limit to 19 AI cars (20 total including player)
-        ai_cars = opponents[:19]
-        # When grid is provided its length is exact; otherwise ai_cars already contains
-        # the right number of slots (player replaces their own team's AI entry, so the
-        # total stays len(ai_cars), not len(ai_cars)+1).
-        total_cars = len(grid) if grid else len(ai_cars)
-
-        # Track can be "folder/layout" or just "folder"
-        track_raw    = race_data['track']
-        parts        = track_raw.split('/')
-        track_folder = parts[0]
-        config_track = parts[1] if len(parts) > 1 else ''
-
-        # Player gets skin index 0; AI cars get 1, 2, 3… so each has a distinct livery
-        skin = self._get_car_skin(car, ac_path, index=0) if ac_path else ''
-
-        lines = []
-
-        # [RACE] — main race block
-        lines += [
-            "[RACE]",
-            f"TRACK={track_folder}",
-            f"CONFIG_TRACK={config_track}",
-            f"MODEL={car}",
-            f"MODEL_CONFIG=",
-            f"SKIN={skin}",
-            f"PENALTIES=1",
-            f"FIXED_SETUP=0",
-            f"DRIFT_MODE=0",
-            f"RACE_LAPS={laps}",
-            f"CARS={total_cars}",
-            f"AI_LEVEL={ai_lvl}",
-            f"JUMP_START_PENALTY=0",
-            f"WEATHER_0={weather}",
-        ]
-        if race_data.get('sun_angle') is not None:
-            lines.append(f"SUN_ANGLE={race_data['sun_angle']}")
-        if race_data.get('time_of_day_mult') is not None:
-            lines.append(f"TIME_OF_DAY_MULT={race_data['time_of_day_mult']}")
-        lines.append("")
-
-        # [DRIVE] — player config
-        # AI_LEVEL must be empty — a non-empty value tells AC to control this car as AI.
-        lines += [
-            "[DRIVE]",
-            f"MODEL={car}",
-            f"SKIN={skin}",
-            f"MODEL_CONFIG=",
-            f"AI_LEVEL=",
-            f"AI_AGGRESSION=0",
-            f"SETUP=",
-            f"FIXED_SETUP=0",
-            f"VIRTUAL_MIRROR=0",
-            f"DRIVER_NAME={driver}",
-            f"NATIONALITY={player_nation}",
-            "",
-        ]
-
-        # [HEADER] — AC uses VERSION=2 to signal post-qualifying grid format.
-        # Without this, AC may misread the file and misidentify the player car.
-        lines += [
-            "[HEADER]",
-            "VERSION=2",
-            "",
-        ]
+        rng:          optional random.Random for per-driver AI_LEVEL variance.
 
-        # Sessions — single session (split weekend) or combined (full_weekend / race_only)
-        if session_type == 'practice':
-            lines += [
-                "[SESSION_0]",
-                "NAME=PRACTICE",
-                "TYPE=1",
-                "SPAWN_SET=PIT",
-                f"DURATION_MINUTES={practice_minutes}",
-                "LAPS=0",
-                "",
-            ]
-        elif session_type == 'qualifying':
-            lines += [
-                "[SESSION_0]",
-                "NAME=QUALIFY",
-                "TYPE=2",
-                "SPAWN_SET=PIT",
-                f"DURATION_MINUTES={quali_minutes}",
-                "LAPS=0",
-                "",
-            ]
-        elif session_type == 'race':
-            lines += [
-                "[SESSION_0]",
-                "NAME=RACE",
-                "TYPE=3",
-                "SPAWN_SET=START",
-                f"LAPS={laps}",
-                "DURATION_MINUTES=0",
-                "",
-            ]
-        elif mode == 'full_weekend':
-            lines += [
-                "[SESSION_0]",
-                "NAME=PRACTICE",
-                "TYPE=1",
-                "SPAWN_SET=PIT",
-                f"DURATION_MINUTES={practice_minutes}",
-                "LAPS=0",
-                "",
-                "[SESSION_1]",
-                "NAME=QUALIFY",
-                "TYPE=2",
-                "SPAWN_SET=PIT",
-                f"DURATION_MINUTES={quali_minutes}",
-                "LAPS=0",
-                "",
-                "[SESSION_2]",
-                "NAME=RACE",
-                "TYPE=3",
-                "SPAWN_SET=START",
-                f"LAPS={laps}",
-                "DURATION_MINUTES=0",
-                "",
-            ]
-        else:
-            lines += [
-                "[SESSION_0]",
-                "NAME=RACE",
-                "TYPE=3",
-                "SPAWN_SET=START",
-                f"LAPS={laps}",
-                "DURATION_MINUTES=0",
-                "",
-            ]
-
-        # [GROOVE]
-        lines += [
-            "[GROOVE]",
-            "VIRTUAL_LAPS=10",
-            "MAX_LAPS=30",
-            "STARTING_LAPS=0",
-            "",
-        ]
-
-        # Wet weather detection — used for per-driver wet_skill AI adjustment
-        WET_PRESETS = {'rainy', 'heavy_rain', 'wet', 'light_rain', 'drizzle', 'stormy', 'overcast_wet'}
-        is_wet = weather.lower() in WET_PRESETS
-
-        # Night/endurance detection — used for per-driver night_skill AI adjustment
-        sun_angle  = race_data.get('sun_angle')
-        time_mult  = race_data.get('time_of_day_mult') or 1
-        if time_mult > 1:
-            night_weight = 0.5   # endurance: ~half the race in darkness
-        elif sun_angle is not None and sun_angle < -30:
-            night_weight = 1.0   # explicit night race
-        else:
-            night_weight = 0.0
-
-        # Success ballast: car model is the team differentiator; ballast only penalises recent winners.
-        # Count P1 finishes in the last 3 races — each win adds 5 kg (max 15 kg).
-        recent = (career_data or {}).get('race_results', [])[-3:]
-        player_ballast = sum(5 for r in recent if r.get('position') == 1)
-
-        # Base variance from config (used to scale per-driver consistency)
-        base_variance = self.config.get('difficulty', {}).get('ai_level_variance', 1.5)
-
-        # Track affinity: classify current track as fast/technical/balanced
-        track_raw    = race_data['track']
-        track_type   = self.TRACK_TYPE.get(track_raw, 'balanced')
-
-        # Form scores from career_data (season momentum)
-        form_scores  = (career_data or {}).get('form_scores', {})
-
-        # Determine which skill attribute drives AI level for this session
-        # qualifying → quali_pace only; full_weekend → blend; everything else → race skill
-        if session_type == 'qualifying':
-            ai_skill_mode = 'qualifying'
-        elif mode == 'full_weekend':
-            ai_skill_mode = 'blend'
-        else:
-            ai_skill_mode = 'race'
-
-        def _ai_level_for(profile_, driver_name=''):
-            """Compute a single AI level value for one driver."""
-            if ai_skill_mode == 'qualifying':
-                eff = float(profile_.get('quali_pace', 75))
-            elif ai_skill_mode == 'blend':
-                eff = (profile_['skill'] + profile_.get('quali_pace', 75)) / 2
-            else:
-                eff = float(profile_['skill'])
-            s_off = int((eff - 80) * 0.2)
-            w_adj = round((profile_.get('wet_skill', 60) - 50) * 0.08) if is_wet else 0
-            n_adj = round((profile_.get('night_skill', 60) - 60) * 0.12 * night_weight)
-
-            # Track affinity: +1 on preferred track type, -1 on mismatched
-            driver_pref = TRACK_PREFERENCES.get(driver_name, 'balanced')
-            if track_type != 'balanced' and driver_pref != 'balanced':
-                t_adj = 1 if driver_pref == track_type else -1
-            else:
-                t_adj = 0
-
-            # Season momentum / form: ±2 AI_LEVEL based on recent results
-            form_adj = int(form_scores.get(driver_name, 0) * 2.5)
-
-            cons  = profile_.get('consistency', 75)
-            dvar  = min(base_variance * (1 + (50 - cons) / 50), 1.5)
-            v_adj = random.uniform(-dvar, dvar)
-            return max(50, min(100, int(ai_lvl + s_off + w_adj + n_adj + t_adj + form_adj + v_adj)))
-
-        # Build ordered car list: grid order if provided, otherwise player P1 then AI.
-        # grid entries: {'name', 'car', 'team', 'is_player', ...} sorted P1→last.
-        # The player occupies one team slot, so that team must NOT also get an AI entry —
-        # otherwise CARS count and actual CAR blocks diverge, producing a ghost "No name" car.
-        opp_by_name  = {(opp.get('driver_name') or ''): opp for opp in ai_cars}
-        player_team  = (career_data or {}).get('team')
-
-        # Player always occupies CAR_0 — AC identifies the human player by MODEL=- in the
-        # [CAR_0] block. Placing MODEL=- at any other slot causes AC to highlight the wrong
-        # car as the player.  With RACE+SPAWN_SET=START (no qualifying session), CAR_N order
-        # IS the grid order: CAR_0 = P1, CAR_1 = P2, etc.  The player therefore always starts
-        # P1 in Race Only mode — this is a hard AC constraint that cannot be worked around
-        # without the player actually driving a qualifying session.
-        # AI cars follow in simulated qualifying order so they race in a realistic spread.
-        if grid:
-            ai_in_quali_order = [
-                opp_by_name.get(g['name'], {'car': g.get('car', car), 'driver_name': g['name']})
-                for g in grid if not g.get('is_player')
-            ]
-            car_entries = [{'type': 'player'}] + [
-                {'type': 'ai', 'opp': opp} for opp in ai_in_quali_order
-            ]
-        else:
-            # Skip the AI stand-in for the player's own team slot (ghost driver fix).
-            car_entries = [{'type': 'player'}] + [
-                {'type': 'ai', 'opp': opp} for opp in ai_cars
-                if not (player_team and opp.get('team') == player_team)
-            ]
-
-        # Write [CAR_N] blocks in grid order
-        # AI skins start at index 1 to reserve index 0 (00_official) exclusively for the player.
-        # Using index=i would give CAR_0 skin index 0, colliding with the player livery and
-        # causing AC to misidentify which car is the player.
-        ai_skin_counter = 1
-        for i, entry in enumerate(car_entries):
-            if entry['type'] == 'player':
-                # AC identifies the player slot via MODEL=- (a literal dash).
-                # This is the format AC itself writes after a qualifying session.
-                # AI_LEVEL and AI_AGGRESSION are omitted entirely for the player block.
-                lines += [
-                    f"[CAR_{i}]",
-                    f"SETUP=",
-                    f"SKIN={skin}",
-                    f"MODEL=-",
-                    f"MODEL_CONFIG=",
-                    f"BALLAST={player_ballast}",
-                    f"RESTRICTOR=0",
-                    f"DRIVER_NAME={driver}",
-                    f"NATIONALITY={player_nation}",
-                    "",
-                ]
-            else:
-                opp      = entry['opp']
-                opp_car  = opp.get('car', car)
-                opp_skin = self._get_car_skin(opp_car, ac_path, index=ai_skin_counter) if ac_path else ''
-                ai_skin_counter += 1
-                name     = opp.get('driver_name') or self.DRIVER_NAMES[i % len(self.DRIVER_NAMES)]
-                # Prevent name collision with player: if an AI driver shares the player's
-                # career name, read_race_result() would return the AI's result instead of
-                # the player's actual result (the first match wins).
-                if name.lower() == driver.lower():
-                    name = name + ' II'
-                profile  = self.get_driver_profile(name, career_data=career_data)
-                nation   = profile['nationality']
-
-                opp_ai_level  = _ai_level_for(profile, driver_name=name)
-                opp_aggression = profile['aggression']
-                consistency    = profile.get('consistency', 75)
-                if consistency < 50:
-                    opp_aggression = min(100, opp_aggression + int((50 - consistency) * 0.3))
-
-                # Rivalry aggression boost (+5 for active rivals)
-                _tk = self.tiers[(career_data or {}).get('tier', 0)]
-                _tier_rivals = (career_data or {}).get('rivalries', {}).get(_tk, [])
-                _rival_names = set()
-                for _r in _tier_rivals:
-                    if _r.get('intensity', 0) >= 3:
-                        _rival_names.update(_r['drivers'])
-                if name in _rival_names:
-                    opp_aggression = min(100, opp_aggression + 5)
-
-                # Team development: better-rated teams get less ballast (faster)
-                opp_team_name = opp.get('team', '')
-                team_dev      = (career_data or {}).get('team_development', {}).get(opp_team_name, {})
-                dev_offset    = team_dev.get('rating_offset', 0)
-                # +0.5 rating → -5kg ballast (faster); -0.5 → +5kg (slower)
-                opp_ballast   = max(0, int(-dev_offset * 10))
-
-                lines += [
-                    f"[CAR_{i}]",
-                    f"MODEL={opp_car}",
-                    f"SKIN={opp_skin}",
-                    f"MODEL_CONFIG=",
-                    f"DRIVER_NAME={name}",
-                    f"NATION_CODE={nation}",
-                    f"AI_LEVEL={opp_ai_level}",
-                    f"AI_AGGRESSION={opp_aggression}",
-                    f"SETUP=",
-                    f"BALLAST={opp_ballast}",
-                    f"RESTRICTOR=0",
-                    "",
-                ]
-
-        content = "\n".join(lines)
+        The text comes from race_config.RaceConfigCompiler (per-driver tables
+        cached per career revision).  Skins already resolved by a race plan
+        (race_data['skin'], opponent 'skin') are used as-is.
+        """
+        content = self.race_config.compile(race_data, ac_path, mode=mode, career_data=career_data,
+                                           session_type=session_type, grid=grid, rng=rng)
 
         os.makedirs(os.path.dirname(config_path), exist_ok=True)
         with open(config_path, 'w') as f:
             f.write(content)
 
-        print(f"race.ini written: {track_folder}/{config_track} | car={car} | laps={laps} | AI cars={len(ai_cars)}")
+        parts = race_data['track'].split('/')
+        print(f"race.ini written: {parts[0]}/{parts[1] if len(parts) > 1 else ''} | "
+              f"car={race_data['car']} | laps={race_data['laps']} | "
+              f"AI cars={len(race_data.get('opponents', [])[:19])}")
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,110 @@
+"""
+Career state — serialized, revision-checked access to the career save.
+
+Request handlers follow load → mutate → save.  With more than one request
+thread (or a background job) two of them can load the same revision and the
+second save silently overwrites the first.  CareerState closes that gap:
+
+  load()         a private copy of the current career.  Copies come from
+                 one cached JSON snapshot per revision, so readers never
+                 share (or see) another request's in-progress mutations
+  save(data)     compare-and-swap: writes only if *data* was loaded from
+                 the revision currently on disk, else raises
+                 StaleWriteError (the API answers 409 and the client
+                 reloads).  Writes are serialized under one lock
+  replace(data)  unconditional write (a new career)
+  transaction()  load + save under the lock for read-modify-write
+                 handlers, which then can never go stale
+
+Saves are written to a temporary file and renamed into place, so a reader
+never decodes a half-written save.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StaleWriteError(Exception):
+    """Save based on an older revision than the one on disk."""
+
+    def __init__(self, base, current):
+        super().__init__(f'career changed since it was loaded '
+                         f'(revision {base}, now {current})')
+        self.base = base
+        self.current = current
+
+
+def atomic_write(path, payload):
+    """Write *payload* (bytes) to *path* via a temporary file + rename."""
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+    # Windows refuses to replace a file another thread has open; readers
+    # hold it only for the read, so retry briefly
+    for attempt in range(20):
+        try:
+            os.replace(tmp, path)
+            return
+        except PermissionError:
+            if attempt == 19:
+                os.remove(tmp)
+                raise
+            time.sleep(0.01)
+
+
+class CareerState:
+    def __init__(self, read, write, revision):
+        """read() → career dict from disk, write(data) → persist it (and
+        set data['revision']), revision() → revision currently on disk."""
+        self._read = read
+        self._write = write
+        self._revision = revision
+        self._lock = threading.RLock()
+        self._snapshot = None    # (revision, JSON text)
+
+    @property
+    def lock(self):
+        """The write lock (held by save / transaction)."""
+        return self._lock
+
+    def load(self):
+        revision = self._revision()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == revision:
+            return json.loads(snapshot[1])
+        data = self._read()
+        if int(data.get('revision') or 0) == revision:
+            self._snapshot = (revision, json.dumps(data))
+        return data
+
+    def save(self, data):
+        """Write *data* if nothing was saved since it was loaded."""
+        with self._lock:
+            base, current = int(data.get('revision') or 0), self._revision()
+            if base != current:
+                raise StaleWriteError(base, current)
+            self._commit(data)
+
+    def replace(self, data):
+        """Write *data* regardless of the revision on disk."""
+        with self._lock:
+            self._commit(data)
+
+    def _commit(self, data):
+        self._write(data)
+        self._snapshot = (data['revision'], json.dumps(data))
+
+    @contextmanager
+    def transaction(self):
+        """Load the career under the write lock and save it when the block
+        exits normally and changed it (an exception discards the changes;
+        a block that returns early without changes writes nothing)."""
+        with self._lock:
+            data = self.load()
+            before = json.dumps(data)
+            yield data
+            if json.dumps(data) != before:
+                self.save(data)
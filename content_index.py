@@ -0,0 +1,430 @@
+"""
+Content Index — persistent index of the installed AC cars and tracks.
+
+Scanning content/cars and content/tracks means thousands of directory
+listings and ui_*.json reads on a modded install.  ContentIndex keeps the
+result in <user data dir>/content_index.json:
+
+  cars    id → name, tags, class (gt3 / gt4 / ''), ui / data / data.acd
+               presence, sorted skin list and each skin's preview file
+  tracks  id → layouts [{id, name, length, pitboxes}]
+
+Each entry stores a signature built from mtimes (car folder, skins folder,
+each skin folder, ui_car.json; track folder, its layout ui folders and
+every ui_track.json).  refresh()
+lists the two content folders and only re-reads entries whose signature
+changed; removed folders drop out.  `revision` increases whenever anything
+changed, so callers can key their own caches on it.
+
+Folder work runs on a bounded thread pool and refresh() can report each
+folder as it completes (the wizard streams tracks from it while the scan is
+still running).
+
+ensure(ac_path) is the cheap accessor used on hot paths: it answers from
+the current index and, at most every REFRESH_TTL_S seconds, refreshes it as
+a background job.  Until an install has been scanned once, lookups read
+only the car or track folder asked about.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+_INDEX_VERSION = 1
+
+# ensure() starts a background rescan at most this often; scan-content always rescans.
+REFRESH_TTL_S = 60.0
+
+# Folder work is I/O-bound (often NTFS via Proton on Linux), so the pool is
+# larger than the core count — but bounded.
+MAX_SCAN_WORKERS = 16
+
+PREVIEW_FILES = ('preview.jpg', 'preview.png')
+
+
+def parse_length(raw):
+    """Parse track length from ui_track.json — may be int, float, or string."""
+    if not raw:
+        return 0
+    if isinstance(raw, (int, float)):
+        return int(raw)
+    s = str(raw).strip().lower().replace(',', '.').replace(' ', '')
+    s = s.replace('km', '').replace('m', '')
+    try:
+        val = float(s)
+        return int(val * 1000 if val < 100 else val)
+    except ValueError:
+        return 0
+
+
+def _parse_pitboxes(raw):
+    try:
+        return int(str(raw).strip() or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _read_ui_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except Exception:
+        return None
+
+
+def car_signature(car_path):
+    skins = os.path.join(car_path, 'skins')
+    sig = [_mtime(car_path), _mtime(skins),
+           _mtime(os.path.join(car_path, 'ui', 'ui_car.json'))]
+    # A preview added to an existing skin only touches that skin's folder
+    try:
+        with os.scandir(skins) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                if entry.is_dir():
+                    sig.append(entry.stat().st_mtime)
+    except OSError:
+        pass
+    return sig
+
+
+def scan_car(car_path, car_id, sig=None):
+    """Index entry for one content/cars/<car_id> folder."""
+    has_data = has_acd = False
+    try:
+        with os.scandir(car_path) as it:
+            for entry in it:
+                if entry.name == 'data' and entry.is_dir():
+                    has_data = True
+                elif entry.name == 'data.acd' and entry.is_file():
+                    has_acd = True
+    except OSError:
+        pass
+
+    ui = _read_ui_json(os.path.join(car_path, 'ui', 'ui_car.json'))
+    tags = [str(t).lower() for t in ((ui or {}).get('tags') or [])]
+    nm_lower = car_id.lower()
+    if 'gt4' in tags or 'gt4' in nm_lower:
+        car_class = 'gt4'
+    elif 'gt3' in tags or 'gt3' in nm_lower:
+        car_class = 'gt3'
+    else:
+        car_class = ''
+
+    skins, previews = [], {}
+    try:
+        with os.scandir(os.path.join(car_path, 'skins')) as it:
+            skin_dirs = sorted(e.name for e in it if e.is_dir())
+    except OSError:
+        skin_dirs = []
+    for skin in skin_dirs:
+        skins.append(skin)
+        for fname in PREVIEW_FILES:
+            if os.path.isfile(os.path.join(car_path, 'skins', skin, fname)):
+                previews[skin] = fname
+                break
+
+    return {
+        'name':     (ui or {}).get('name') or car_id,
+        'tags':     tags,
+        'class':    car_class,
+        'has_ui':   ui is not None,
+        'has_data': has_data,
+        'has_acd':  has_acd,
+        'skins':    skins,
+        'previews': previews,
+        'sig':      sig if sig is not None else car_signature(car_path),
+    }
+
+
+def track_signature(track_path):
+    # ui_track.json is often edited in place, which leaves its folder's mtime alone
+    sig = [_mtime(track_path), _mtime(os.path.join(track_path, 'ui')),
+           _mtime(os.path.join(track_path, 'ui', 'ui_track.json'))]
+    try:
+        with os.scandir(track_path) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                if entry.is_dir() and entry.name != 'ui':
+                    ui = os.path.join(entry.path, 'ui')
+                    sig += [_mtime(ui), _mtime(os.path.join(ui, 'ui_track.json'))]
+    except OSError:
+        pass
+    return sig
+
+
+def _layout(ui, layout_id, fallback_name):
+    return {
+        'id':       layout_id,
+        'name':     ui.get('name') or fallback_name,
+        'length':   parse_length(ui.get('length', 0)),
+        'pitboxes': _parse_pitboxes(ui.get('pitboxes', 0)),
+    }
+
+
+def scan_track(track_path, track_id, sig=None):
+    """Index entry for one content/tracks/<track_id> folder."""
+    layouts = []
+    try:
+        with os.scandir(track_path) as it:
+            items = sorted((e.name for e in it if e.is_dir() and e.name != 'ui'))
+    except OSError:
+        items = []
+    for item in items:
+        ui = _read_ui_json(os.path.join(track_path, item, 'ui', 'ui_track.json'))
+        if ui is not None:
+            layouts.append(_layout(ui, f'{track_id}/{item}', f'{track_id} – {item}'))
+    # Single-layout track (no layout subdirs found)
+    if not layouts:
+        ui = _read_ui_json(os.path.join(track_path, 'ui', 'ui_track.json'))
+        if ui is not None:
+            layouts.append(_layout(ui, track_id, track_id))
+    return {'layouts': layouts,
+            'sig': sig if sig is not None else track_signature(track_path)}
+
+
+def _refresh_item(kind, item_id, item_path, old):
+    """Pool task: (kind, id, entry, changed) — re-reads only on a new signature."""
+    if kind == 'cars':
+        sig = car_signature(item_path)
+        if old is not None and old.get('sig') == sig:
+            return kind, item_id, old, False
+        return kind, item_id, scan_car(item_path, item_id, sig), True
+    sig = track_signature(item_path)
+    if old is not None and old.get('sig') == sig:
+        return kind, item_id, old, False
+    return kind, item_id, scan_track(item_path, item_id, sig), True
+
+
+def _list_dirs(path):
+    try:
+        with os.scandir(path) as it:
+            return sorted((e.name, e.path) for e in it if e.is_dir())
+    except OSError:
+        return []
+
+
+class ContentIndex:
+    def __init__(self, path, jobs=None):
+        self.path = path
+        # jobs.JobRegistry that runs ensure()'s refreshes; without one they
+        # run on the calling thread
+        self._jobs = jobs
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.RLock()
+        self._data = None
+        self._checked_at = 0.0
+        # AC path the index does not cover yet (lookups read single folders)
+        self._cold = None
+
+    # ── persistence ──────────────────────────────────────────────────────────
+
+    def _empty(self, ac_path=''):
+        return {'version': _INDEX_VERSION, 'ac_path': ac_path, 'revision': 0,
+                'cars': {}, 'tracks': {}}
+
+    def _load(self):
+        if self._data is not None:
+            return self._data
+        data = self._empty()
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if loaded.get('version') == _INDEX_VERSION:
+                    data = loaded
+            except (OSError, ValueError):
+                pass
+        self._data = data
+        return data
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    # ── refresh ──────────────────────────────────────────────────────────────
+
+    def refresh(self, ac_path, workers=None, on_item=None):
+        """Incremental rescan.  Returns the number of entries re-read or removed.
+
+        Per-folder work (signature stats, and a full re-read when it changed)
+        fans out over a bounded thread pool.  on_item(kind, item_id, entry,
+        done, total) is called as each folder completes — changed or not — so
+        callers can stream partial results.  Queries keep answering from the
+        previous index until the new one is swapped in at the end.
+        """
+        with self._refresh_lock:
+            with self._lock:
+                data = self._load()
+                same_path = (os.path.normcase(data.get('ac_path') or '') ==
+                             os.path.normcase(ac_path or ''))
+                old = {kind: dict(data[kind]) if same_path else {}
+                       for kind in ('cars', 'tracks')}
+
+            tasks = []
+            for kind in ('cars', 'tracks'):
+                if ac_path:
+                    for item_id, item_path in _list_dirs(os.path.join(ac_path, 'content', kind)):
+                        tasks.append((kind, item_id, item_path, old[kind].get(item_id)))
+
+            fresh = {'cars': {}, 'tracks': {}}
+            changed = 0
+            total = len(tasks)
+            if tasks:
+                n_workers = max(1, min(workers or MAX_SCAN_WORKERS, total))
+                with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                    futures = [pool.submit(_refresh_item, *t) for t in tasks]
+                    for done, fut in enumerate(as_completed(futures), start=1):
+                        kind, item_id, entry, was_changed = fut.result()
+                        fresh[kind][item_id] = entry
+                        changed += was_changed
+                        if on_item is not None:
+                            on_item(kind, item_id, entry, done, total)
+            changed += sum(1 for kind in fresh for k in old[kind] if k not in fresh[kind])
+
+            with self._lock:
+                revision = self._data.get('revision', 0)
+                if changed or not same_path:
+                    revision += 1
+                self._data = self._empty(ac_path)
+                self._data['revision'] = revision
+                self._data['cars'] = dict(sorted(fresh['cars'].items()))
+                self._data['tracks'] = dict(sorted(fresh['tracks'].items()))
+                if changed or not same_path or not os.path.isfile(self.path):
+                    self._save()
+                self._checked_at = time.monotonic()
+                if self._cold is not None and same_path:
+                    self._cold = None
+            return changed
+
+    def rebuild(self, ac_path, workers=None, on_item=None):
+        """Full rescan: every folder is re-read, whatever its signature.
+        The revision keeps counting up, so caches keyed on it stay valid."""
+        with self._refresh_lock:
+            with self._lock:
+                revision = self._load().get('revision', 0)
+                self._data = self._empty()
+                self._data['revision'] = revision
+            return self.refresh(ac_path, workers=workers, on_item=on_item)
+
+    def ensure(self, ac_path):
+        """Current index, at once; returns self.
+
+        Once the TTL expired a refresh runs in the background (stale while
+        revalidate) — never on the calling thread when a job registry was
+        given.  While no index covers *ac_path* (first run, AC path changed)
+        lookups read just the folder they ask about until the scan lands.
+        """
+        with self._lock:
+            data = self._load()
+            if ac_path and (os.path.normcase(data.get('ac_path') or '') !=
+                            os.path.normcase(ac_path)):
+                self._data = self._empty(ac_path)
+                self._data['revision'] = data.get('revision', 0) + 1
+                self._cold = ac_path
+                self._checked_at = 0.0
+            now = time.monotonic()
+            stale = now - self._checked_at > REFRESH_TTL_S
+            if stale:
+                self._checked_at = now
+        if stale:
+            if self._jobs is not None:
+                self._jobs.start('refresh-content', lambda job: self._try_refresh(ac_path))
+            else:
+                self._try_refresh(ac_path)
+        return self
+
+    def _try_refresh(self, ac_path):
+        # A scan already running (e.g. the wizard's) refreshes the index anyway
+        if not self._refresh_lock.acquire(blocking=False):
+            return 0
+        try:
+            return self.refresh(ac_path)
+        finally:
+            self._refresh_lock.release()
+
+    def _entry(self, kind, item_id):
+        with self._lock:
+            entry = self._load()[kind].get(item_id)
+            cold = self._cold
+        if entry is not None or cold is None or not item_id \
+                or item_id in ('.', '..') or os.path.basename(item_id) != item_id:
+            return entry
+        item_path = os.path.join(cold, 'content', kind, item_id)
+        if not os.path.isdir(item_path):
+            return None
+        entry = _refresh_item(kind, item_id, item_path, None)[2]
+        with self._lock:
+            if self._cold == cold:
+                entry = self._data[kind].setdefault(item_id, entry)
+        return entry
+
+    @property
+    def revision(self):
+        with self._lock:
+            return self._load().get('revision', 0)
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def car(self, car_id):
+        return self._entry('cars', car_id)
+
+    def cars(self):
+        with self._lock:
+            return dict(self._load()['cars'])
+
+    def tracks(self):
+        with self._lock:
+            return dict(self._load()['tracks'])
+
+    def car_usable(self, car_id):
+        """Car folder has data/ (mods) or data.acd (Kunos stock cars)."""
+        entry = self.car(car_id)
+        return bool(entry) and (entry['has_data'] or entry['has_acd'])
+
+    def car_skins(self, car_id):
+        entry = self.car(car_id)
+        return entry['skins'] if entry else []
+
+    def skin_preview(self, ac_path, car_id, index=0):
+        """Absolute path of the index-th skin's preview image, or None."""
+        entry = self.car(car_id)
+        if not entry or not entry['skins']:
+            return None
+        skin = entry['skins'][index % len(entry['skins'])]
+        fname = entry['previews'].get(skin)
+        if not fname:
+            return None
+        return os.path.join(ac_path, 'content', 'cars', car_id, 'skins', skin, fname)
+
+    def skin_previews(self, ac_path, car_id):
+        """Absolute paths of every skin preview image of a car."""
+        entry = self.car(car_id)
+        if not entry:
+            return []
+        return [os.path.join(ac_path, 'content', 'cars', car_id, 'skins', skin, fname)
+                for skin, fname in sorted(entry['previews'].items())]
+
+    def track(self, track_id):
+        """Track folder entry for 'folder' or 'folder/layout' ids."""
+        return self._entry('tracks', (track_id or '').split('/')[0])
+
+    def layout(self, track_id):
+        entry = self.track(track_id)
+        if not entry:
+            return None
+        for lay in entry['layouts']:
+            if lay['id'] == track_id:
+                return lay
+        return None
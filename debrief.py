@@ -0,0 +1,336 @@
+"""
+Debrief — field-wide lap analysis for the post-race engineer report.
+
+AC results files carry one flat 'Laps' array with every lap of every driver.
+analyse_race() walks it once, grouping laps per driver, then derives pace,
+consistency, sector bests and theoretical-best laps for the whole field.  The
+player's numbers are compared against the top-5 finishers and the best car of
+the same class, and a least-squares fit over the lap times gives a per-stint
+degradation trend.  Long lap series are downsampled before they reach the
+sparkline.
+
+Extracted from app.py to keep the Flask routes focused on HTTP logic.
+"""
+
+import math
+
+# Laps slower than this factor × the driver's best lap are treated as
+# in/out laps, pit stops or incidents and excluded from pace statistics.
+OUTLIER_FACTOR = 1.5
+
+# Max points sent to the sparkline; longer races are downsampled.
+SPARKLINE_POINTS = 60
+
+# |slope| below this (ms per lap) is reported as a stable stint.
+DEG_STABLE_MS = 50
+
+
+class _DriverLaps:
+    """Per-driver lap accumulator filled during the grouping pass."""
+
+    __slots__ = ('name', 'car', 'lap_nos', 'times', 'sectors', 'cuts', 'tyres')
+
+    def __init__(self, name, car):
+        self.name    = name
+        self.car     = car
+        self.lap_nos = []
+        self.times   = []
+        self.sectors = []
+        self.cuts    = []
+        self.tyres   = []
+
+
+def _group_laps(raw_laps):
+    """Single pass over the results 'Laps' array → {driver_key: _DriverLaps}."""
+    groups = {}
+    for lap in raw_laps:
+        if not isinstance(lap, dict):
+            continue
+        lap_ms = lap.get('LapTime')
+        if not isinstance(lap_ms, (int, float)) or lap_ms <= 0:
+            continue
+        name = lap.get('DriverName', '')
+        key  = name.lower()
+        entry = groups.get(key)
+        if entry is None:
+            entry = groups[key] = _DriverLaps(name, lap.get('CarModel', ''))
+        sectors = lap.get('Sectors') or []
+        if not (len(sectors) == 3 and
+                all(isinstance(v, (int, float)) and v > 0 for v in sectors)):
+            sectors = None
+        entry.lap_nos.append(len(entry.times) + 1)
+        entry.times.append(int(lap_ms))
+        entry.sectors.append(sectors)
+        entry.cuts.append(int(lap.get('Cuts', 0) or 0))
+        entry.tyres.append(lap.get('Tyre', '') or '')
+    return groups
+
+
+def _mean_std(values):
+    """Welford running mean / sample std-dev (std is 0 for < 2 values)."""
+    n, mean, m2 = 0, 0.0, 0.0
+    for v in values:
+        n += 1
+        delta = v - mean
+        mean += delta / n
+        m2 += delta * (v - mean)
+    std = math.sqrt(m2 / (n - 1)) if n >= 2 else 0.0
+    return mean, std
+
+
+def _slope(xs, ys):
+    """Least-squares slope of ys over xs (0.0 when undefined)."""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mx = sum(xs) / n
+    my = sum(ys) / n
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if not sxx:
+        return 0.0
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx
+
+
+def _consistency(std_ms):
+    # 100 = perfect, drops ~1pt per 30ms of std dev
+    return max(0, min(100, int(100 - std_ms / 30)))
+
+
+def _trend_label(slope):
+    if slope > DEG_STABLE_MS:
+        return 'degrading'
+    if slope < -DEG_STABLE_MS:
+        return 'improving'
+    return 'stable'
+
+
+def downsample(xs, ys, max_points=SPARKLINE_POINTS):
+    """Largest-triangle-three-buckets downsampling of a lap series.
+
+    Keeps the first and last point and, per bucket, the point that preserves
+    the most visual shape — so the best lap and spikes survive.
+    """
+    n = len(ys)
+    if n <= max_points or max_points < 3:
+        return list(xs), list(ys)
+    out_x, out_y = [xs[0]], [ys[0]]
+    bucket = (n - 2) / (max_points - 2)
+    prev = 0
+    for i in range(max_points - 2):
+        start = int(i * bucket) + 1
+        end   = int((i + 1) * bucket) + 1
+        nxt_end = min(int((i + 2) * bucket) + 1, n)
+        nxt = range(end, nxt_end) if end < nxt_end else range(n - 1, n)
+        avg_x = sum(xs[j] for j in nxt) / len(nxt)
+        avg_y = sum(ys[j] for j in nxt) / len(nxt)
+        px, py = xs[prev], ys[prev]
+        best_j, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((px - avg_x) * (ys[j] - py) - (px - xs[j]) * (avg_y - py))
+            if area > best_area:
+                best_j, best_area = j, area
+        out_x.append(xs[best_j])
+        out_y.append(ys[best_j])
+        prev = best_j
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+
+
+def _driver_stats(entry):
+    """Pace / consistency / sector stats for one driver's grouped laps."""
+    best = min(entry.times)
+    limit = best * OUTLIER_FACTOR
+    valid = [i for i, t in enumerate(entry.times) if t <= limit]
+    valid_times = [entry.times[i] for i in valid]
+    mean, std = _mean_std(valid_times)
+
+    sector_rows = [entry.sectors[i] for i in valid if entry.sectors[i]]
+    sector_best = None
+    if sector_rows:
+        sector_best = [min(row[s] for row in sector_rows) for s in range(3)]
+
+    return {
+        'valid':       valid,
+        'best_ms':     best,
+        'avg_ms':      mean,
+        'std_ms':      std,
+        'sector_rows': sector_rows,
+        'sector_best': sector_best,
+    }
+
+
+def _stints(entry, valid):
+    """Split valid laps into stints on tyre changes; fit a trend to each."""
+    stints = []
+    current = None
+    for i in valid:
+        tyre = entry.tyres[i]
+        if current is None or (tyre and current['tyre'] and tyre != current['tyre']):
+            current = {'tyre': tyre, 'x': [], 'y': []}
+            stints.append(current)
+        elif tyre and not current['tyre']:
+            current['tyre'] = tyre
+        current['x'].append(entry.lap_nos[i])
+        current['y'].append(entry.times[i])
+
+    out = []
+    for st in stints:
+        xs, ys = st['x'], st['y']
+        # Drop the opening lap of a stint (standing start / out-lap traffic)
+        # when there is enough data left to fit a trend.
+        if len(xs) > 3:
+            xs, ys = xs[1:], ys[1:]
+        slope = _slope(xs, ys)
+        out.append({
+            'from_lap':         st['x'][0],
+            'to_lap':           st['x'][-1],
+            'laps':             len(st['x']),
+            'tyre':             st['tyre'],
+            'slope_ms_per_lap': round(slope, 1),
+            'trend':            _trend_label(slope),
+        })
+    return out
+
+
+def analyse_race(raw_laps, results, player_name, max_points=SPARKLINE_POINTS,
+                 car_class=None):
+    """Build the lap_analysis dict for read-race-result.
+
+    car_class: optional callable, car model → class ('gt3', 'gt4', …; '' when
+    unknown).  Cars of an unknown class only count as the same class as
+    themselves.
+
+    Returns (lap_analysis, player_valid_laps).  lap_analysis is empty when
+    the player has fewer than two representative laps; player_valid_laps is
+    the full (non-downsampled) list used for the engineer report.
+    """
+    groups = _group_laps(raw_laps or [])
+    player_key = (player_name or '').lower()
+    player = groups.get(player_key)
+    if player is None:
+        return {}, []
+
+    stats = {key: _driver_stats(entry) for key, entry in groups.items()}
+    p_stats = stats[player_key]
+    valid = p_stats['valid']
+    valid_laps = [player.times[i] for i in valid]
+    if len(valid_laps) < 2:
+        return {}, valid_laps
+
+    # Finishing order from the results table; drivers without laps drop out.
+    finish_order = []
+    results_car  = {}
+    for row in results or []:
+        if not isinstance(row, dict):
+            continue
+        key = (row.get('DriverName') or '').lower()
+        if key in groups and key not in results_car:
+            finish_order.append(key)
+            results_car[key] = row.get('CarModel', '')
+    for key in sorted(groups, key=lambda k: stats[k]['best_ms']):
+        if key not in results_car:
+            finish_order.append(key)
+            results_car[key] = ''
+
+    def car_of(key):
+        return groups[key].car or results_car.get(key, '')
+
+    field = []
+    for pos, key in enumerate(finish_order, start=1):
+        st = stats[key]
+        sb = st['sector_best']
+        field.append({
+            'name':                groups[key].name,
+            'car':                 car_of(key),
+            'position':            pos,
+            'laps':                len(groups[key].times),
+            'best_ms':             st['best_ms'],
+            'avg_ms':              round(st['avg_ms']),
+            'std_ms':              round(st['std_ms']),
+            'consistency':         _consistency(st['std_ms']),
+            'sector_best':         sb,
+            'theoretical_best_ms': sum(sb) if sb else None,
+            'is_player':           key == player_key,
+        })
+
+    lap_nos = [player.lap_nos[i] for i in valid]
+    spark_x, spark_y = downsample(lap_nos, valid_laps, max_points)
+
+    std_ms = p_stats['std_ms']
+    lap_analysis = {
+        'lap_times':    spark_y,
+        'lap_numbers':  spark_x,
+        'lap_count':    len(valid_laps),
+        'best_lap_ms':  p_stats['best_ms'],
+        'avg_lap_ms':   round(p_stats['avg_ms']),
+        'std_ms':       round(std_ms),
+        'consistency':  _consistency(std_ms),
+        'field':        field,
+    }
+
+    # ── Sector analysis (S1/S2/S3) ───────────────────────────────────────────
+    sector_rows = p_stats['sector_rows']
+    if sector_rows:
+        sector_analysis = []
+        for idx in range(3):
+            mean, std = _mean_std(row[idx] for row in sector_rows)
+            sector_analysis.append({
+                'best_ms': p_stats['sector_best'][idx],
+                'avg_ms':  round(mean),
+                'std_ms':  round(std),
+            })
+        # Weakest sector = highest (avg − best) delta → most room to improve
+        worst_idx = max(range(3), key=lambda i:
+            sector_analysis[i]['avg_ms'] - sector_analysis[i]['best_ms'])
+        lap_analysis['sector_analysis']     = sector_analysis
+        lap_analysis['weakest_sector']      = worst_idx + 1  # 1-indexed
+        lap_analysis['theoretical_best_ms'] = sum(p_stats['sector_best'])
+
+        # ── Sector deltas to the top 5 and the class best ────────────────────
+        p_best = p_stats['sector_best']
+        top5 = [k for k in finish_order if k != player_key
+                and stats[k]['sector_best']][:5]
+        def class_of(key):
+            car = car_of(key)
+            return (car_class(car) if car_class and car else '') or car
+
+        p_class = class_of(player_key)
+        same_class = [k for k in groups if k != player_key
+                      and stats[k]['sector_best'] and p_class and class_of(k) == p_class]
+        deltas = []
+        for idx in range(3):
+            row = {'sector': idx + 1}
+            if top5:
+                ref = sum(stats[k]['sector_best'][idx] for k in top5) / len(top5)
+                row['top5_ms']    = round(ref)
+                row['to_top5_ms'] = round(p_best[idx] - ref)
+            if same_class:
+                ref = min(stats[k]['sector_best'][idx] for k in same_class)
+                row['class_best_ms']    = ref
+                row['to_class_best_ms'] = p_best[idx] - ref
+            deltas.append(row)
+        if top5 or same_class:
+            lap_analysis['sector_deltas'] = deltas
+
+    # ── Stint / degradation trend ────────────────────────────────────────────
+    stints = _stints(player, valid)
+    if stints:
+        main = max(stints, key=lambda s: s['laps'])
+        lap_analysis['stints'] = stints
+        lap_analysis['degradation'] = {
+            'slope_ms_per_lap': main['slope_ms_per_lap'],
+            'trend':            main['trend'],
+        }
+
+    # ── Track cuts ───────────────────────────────────────────────────────────
+    total_cuts = sum(player.cuts[i] for i in valid)
+    if total_cuts:
+        lap_analysis['total_cuts'] = total_cuts
+
+    # ── Tyre compound ────────────────────────────────────────────────────────
+    tyres = [t for t in player.tyres if t]
+    if tyres:
+        lap_analysis['tyre'] = max(set(tyres), key=tyres.count)
+
+    return lap_analysis, valid_laps
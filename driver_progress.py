@@ -56,6 +56,11 @@ def driver_trend_label(entry):
     return 'Stable'
 
 
+def bump_progress_revision(career_data):
+    """Mark driver_progress as changed (profile tables recompute their key)."""
+    career_data['progress_revision'] = int(career_data.get('progress_revision') or 0) + 1
+
+
 def ensure_driver_progress(career_data):
     """Initialise or backfill driver_progress entries for all known drivers."""
     roster = career_data.setdefault('driver_progress', {})
@@ -101,6 +106,8 @@ def ensure_driver_progress(career_data):
             if key not in entry['last_delta']:
                 entry['last_delta'][key] = 0.0
                 changed = True
+    if changed:
+        bump_progress_revision(career_data)
     return changed
 
 
@@ -151,6 +158,7 @@ def evolve_driver_progress_for_race(career_data, race_num, weather=None):
             wet_room = max(0, (90 - ws) / 40)       # 0.75 at ws=60, 0.0 at ws≥90
             wet_delta = 0.15 * wet_room * (potential / 80)
             current['wet_skill'] = round(_clamp(ws + wet_delta, 40.0, 99.0), 2)
+    bump_progress_revision(career_data)
 
 
 def process_retirements(career_data, season):
@@ -191,6 +199,7 @@ def advance_driver_progress_season(career_data):
         current = entry.get('current') or {}
         entry['season_start'] = {k: float(current.get(k, 70)) for k in DRIVER_SKILL_KEYS}
         entry['last_delta'] = {k: 0.0 for k in DRIVER_SKILL_KEYS}
+    bump_progress_revision(career_data)
     # Halve form scores at season boundary (carry some momentum)
     form = career_data.get('form_scores', {})
     for name in list(form):
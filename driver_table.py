@@ -0,0 +1,170 @@
+"""
+Driver Table — effective driver profiles materialized once per career state.
+
+CareerManager.get_driver_profile() used to merge the defaults, the static
+DRIVER_PROFILES entry and the rounded driver_progress 'current' values and
+recompute the style on every call — once per opponent in qualifying, per
+slot in pick_rival, per AI car in race.ini.
+
+ProfileTable does that merge once for every known driver and stores the
+result column-wise: one array('h') per skill, plus lists for nationality,
+nickname and style.  Drivers are addressed by a dense integer id (row 0 is
+the defaults row used for unknown names).  view(name) returns a read-only
+ProfileView — a Mapping over one row, with the same keys and values as the
+dict get_driver_profile() returns.
+
+ProfileTables caches a table per (driver seed, driver_progress values).  The
+key is taken from the values rather than career_data['progress_revision'],
+which is bumped in memory before the save that may yet be rejected: a table
+built from a state that never reached disk must not be served for the next
+state that reaches the same revision.  The driver_progress mutators bump
+progress_revision, so the key is computed once per career dict and revision
+and not on every lookup.
+"""
+
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from driver_data import DRIVER_PROFILES, get_driver_style
+
+PROFILE_DEFAULTS = {"nationality": "GBR", "skill": 80, "aggression": 40,
+                    "wet_skill": 65, "quali_pace": 65, "consistency": 65, "nickname": None}
+
+# Keys overridden by driver_progress (see driver_progress.DRIVER_SKILL_KEYS)
+PROGRESS_KEYS = ('skill', 'aggression', 'wet_skill', 'quali_pace', 'consistency')
+
+# Integer columns; night_skill is optional in DRIVER_PROFILES
+COLUMNS = PROGRESS_KEYS + ('night_skill',)
+_MISSING = -1
+
+# Tables kept in memory (the current career, plus the defaults-only table).
+MAX_TABLES = 4
+# Career dicts whose table key is remembered (one per in-flight request)
+MAX_KEY_MEMO = 4
+
+_KEY_ORDER = ('nationality', 'skill', 'aggression', 'wet_skill', 'quali_pace',
+              'consistency', 'nickname', 'night_skill', 'style')
+
+
+class ProfileView(Mapping):
+    """Read-only profile of one driver (a row of a ProfileTable)."""
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key):
+        t, row = self._table, self._row
+        col = t.columns.get(key)
+        if col is not None:
+            value = col[row]
+            if value == _MISSING:
+                raise KeyError(key)
+            return value
+        if key == 'nationality':
+            return t.nations[row]
+        if key == 'nickname':
+            return t.nicknames[row]
+        if key == 'style':
+            return t.styles[row]
+        raise KeyError(key)
+
+    def __iter__(self):
+        night = self._table.columns['night_skill'][self._row]
+        return (k for k in _KEY_ORDER if k != 'night_skill' or night != _MISSING)
+
+    def __len__(self):
+        return len(_KEY_ORDER) - (self._table.columns['night_skill'][self._row] == _MISSING)
+
+    def __repr__(self):
+        return f'ProfileView({dict(self)!r})'
+
+
+class ProfileTable:
+    def __init__(self, progress=None):
+        progress = progress or {}
+        names = [''] + list(DRIVER_PROFILES)
+        names += sorted(n for n in progress if n not in DRIVER_PROFILES and n)
+        self.ids       = {name: i for i, name in enumerate(names)}
+        self.names     = names
+        self.columns   = {key: array('h') for key in COLUMNS}
+        self.nations   = []
+        self.nicknames = []
+        self.styles    = []
+        for name in names:
+            base = DRIVER_PROFILES.get(name, {}) if name else {}
+            current = (progress.get(name) or {}).get('current') or {}
+            row = {**PROFILE_DEFAULTS, **base}
+            for key in PROGRESS_KEYS:
+                if key in current:
+                    row[key] = int(round(float(current[key])))
+            for key in COLUMNS:
+                self.columns[key].append(int(row[key]) if key in row else _MISSING)
+            self.nations.append(row['nationality'])
+            self.nicknames.append(row['nickname'])
+            self.styles.append(get_driver_style(row['skill'], row['aggression']))
+        self._views = [ProfileView(self, i) for i in range(len(names))]
+
+    def __len__(self):
+        return len(self.names)
+
+    def id(self, name):
+        """Row id of *name*, or None for drivers the table does not know."""
+        return self.ids.get(name)
+
+    def view(self, name):
+        """ProfileView of *name*; unknown names get the defaults row."""
+        return self._views[self.ids.get(name, 0)]
+
+
+def progress_fingerprint(progress):
+    """Everything of driver_progress a ProfileTable depends on."""
+    return tuple((name, tuple(((entry or {}).get('current') or {}).get(k)
+                              for k in PROGRESS_KEYS))
+                 for name, entry in progress.items())
+
+
+class ProfileTables:
+    """ProfileTable per (driver seed, driver_progress values)."""
+
+    def __init__(self):
+        self._tables = OrderedDict()
+        # id(career_data) → (career_data, progress_revision, key); holding the
+        # dict keeps its id from being reused
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, career_data, progress):
+        revision = career_data.get('progress_revision', 0)
+        with self._lock:
+            memo = self._keys.get(id(career_data))
+            if memo is not None and memo[0] is career_data and memo[1] == revision:
+                return memo[2]
+        key = (career_data.get('driver_seed'), progress_fingerprint(progress))
+        with self._lock:
+            self._keys[id(career_data)] = (career_data, revision, key)
+            self._keys.move_to_end(id(career_data))
+            while len(self._keys) > MAX_KEY_MEMO:
+                self._keys.popitem(last=False)
+        return key
+
+    def get(self, career_data=None):
+        """Table for *career_data* (None / no driver_progress → static profiles)."""
+        career_data = career_data or {}
+        progress = career_data.get('driver_progress') or {}
+        key = self._key(career_data, progress) if progress else None
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                return table
+        table = ProfileTable(progress)
+        with self._lock:
+            self._tables[key] = table
+            while len(self._tables) > MAX_TABLES:
+                self._tables.popitem(last=False)
+        return table
@@ -0,0 +1,137 @@
+"""
+Embedded server — the local HTTP server behind the desktop window.
+
+EmbeddedServer runs the Flask app in a background thread on one of two
+backends:
+
+  waitress   production WSGI server: bounded worker thread pool, HTTP/1.1
+             keep-alive, graceful shutdown (in-flight requests finish)
+  werkzeug   Flask's threaded development server; fallback when waitress
+             is not installed, and the baseline in tools/bench_server.py
+
+start() binds the socket before it returns, so the URL is valid (and
+`ready` is set) the moment the call comes back; there is no need to sleep
+and hope.  The preferred port is tried first; if it is taken, a free port
+is picked instead (port=0 always asks the OS for one).  bind() on its own
+reserves the port first, for callers that need to know it before any
+request is served.
+"""
+
+import errno
+import logging
+import socket
+import threading
+import time
+
+try:
+    import waitress.server
+    import waitress.wasyncore
+except ImportError:          # optional: fall back to the Werkzeug server
+    waitress = None
+
+BACKENDS = ('waitress', 'werkzeug')
+# Worker threads: the UI issues a handful of parallel fetches per view
+DEFAULT_THREADS = 8
+# Seconds stop() waits for in-flight requests
+SHUTDOWN_TIMEOUT = 5.0
+
+
+def default_backend():
+    return 'waitress' if waitress is not None else 'werkzeug'
+
+
+class EmbeddedServer:
+    def __init__(self, app, host='127.0.0.1', port=0, threads=DEFAULT_THREADS,
+                 backend=None, fallback_to_free_port=True):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.threads = threads
+        self.backend = backend or default_backend()
+        if self.backend not in BACKENDS:
+            raise ValueError(f'unknown server backend {self.backend!r}')
+        if self.backend == 'waitress' and waitress is None:
+            raise RuntimeError('waitress is not installed')
+        self.fallback_to_free_port = fallback_to_free_port
+        self.ready = threading.Event()
+        self._sock = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}'
+
+    def bind(self):
+        """Bind the listening socket (sets self.port); returns self."""
+        if self._sock is None:
+            try:
+                self._sock = socket.create_server((self.host, self.port))
+            except OSError as e:
+                if not (self.port and self.fallback_to_free_port
+                        and e.errno in (errno.EADDRINUSE, errno.EACCES)):
+                    raise
+                self._sock = socket.create_server((self.host, 0))
+            self.port = self._sock.getsockname()[1]
+        return self
+
+    def start(self):
+        """Bind (unless bind() was called) and start serving in a daemon
+        thread; returns self."""
+        sock, self._sock = self.bind()._sock, None
+        if self.backend == 'waitress':
+            # Quiet "Serving on ..." / queue depth warnings in the desktop app
+            logging.getLogger('waitress').setLevel(logging.ERROR)
+            self._server = waitress.server.create_server(
+                self.app, sockets=[sock], threads=self.threads,
+                ident='ac-career-manager', clear_untrusted_proxy_headers=True)
+            serve = self._server.run
+        else:
+            from werkzeug.serving import make_server
+            self._server = make_server(self.host, self.port, self.app,
+                                       threaded=True, fd=sock.fileno())
+            sock.close()    # Werkzeug serves on a duplicate of it
+            serve = self._server.serve_forever
+        self._thread = threading.Thread(target=serve, name='embedded-server', daemon=True)
+        self._thread.start()
+        self.ready.set()
+        return self
+
+    def wait_ready(self, timeout=None):
+        return self.ready.wait(timeout)
+
+    def stop(self, timeout=SHUTDOWN_TIMEOUT):
+        """Stop accepting connections, let in-flight requests finish (up
+        to *timeout* seconds) and close the rest."""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        self.ready.clear()
+        if self.backend == 'waitress':
+            self._stop_waitress(server, timeout)
+        else:
+            server.shutdown()
+            server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @staticmethod
+    def _stop_waitress(server, timeout):
+        # Sockets may only be closed on the server's own loop thread; the
+        # trigger runs a callable there
+        deadline = time.monotonic() + timeout
+        in_loop = server.trigger.pull_trigger
+        in_loop(lambda: waitress.wasyncore.dispatcher.close(server))
+        server.task_dispatcher.shutdown(cancel_pending=False, timeout=timeout)
+
+        def close_channels():
+            # Keep-alive channels close once their responses are flushed
+            for channel in list(server._map.values()):
+                if channel is not server.trigger:
+                    channel.will_close = True
+        in_loop(close_channels)
+        while len(server._map) > 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        # The loop exits when its map is empty
+        in_loop(lambda: [c.close() for c in list(server._map.values())])
@@ -0,0 +1,121 @@
+"""
+Environment — memoized probe of the local AC / Steam / CSP setup.
+
+Several hot paths need facts about the machine: the AC Documents folder
+(results polling, race_out.json, race.ini), and CSP / Pure presence
+(career status, preflight).  On Linux the Documents folder lives in a
+Proton prefix that is found by walking the Steam libraries.
+
+EnvironmentProbe resolves everything once and keeps it until one of the
+paths it depends on changes.  Revalidation is a handful of stat() calls
+(the AC folder, extension/, extension/weather/, each Steam root's
+libraryfolders.vdf, the resolved Documents folder), and it runs at most
+every VALIDATE_INTERVAL_S seconds.  refresh() drops everything, including
+platform_paths' parsed Steam library list.
+"""
+
+import os
+import platform
+import threading
+import time
+
+from platform_paths import (
+    _STEAM_ROOTS,
+    clear_path_caches,
+    get_ac_docs_path,
+    is_linux,
+    steam_library_roots,
+)
+
+# Minimum time between signature checks; results polling runs every few seconds.
+VALIDATE_INTERVAL_S = 2.0
+
+DOCS_SUBFOLDERS = ('results', 'out', 'cfg')
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _vdf_paths():
+    if not is_linux():
+        return []
+    return [os.path.join(root, 'steamapps', 'libraryfolders.vdf') for root in _STEAM_ROOTS]
+
+
+class EnvironmentProbe:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._env = None
+        self._sig = None
+        self._checked_at = 0.0
+
+    def _signature(self, ac_path, docs):
+        paths = [ac_path,
+                 os.path.join(ac_path, 'extension'),
+                 os.path.join(ac_path, 'extension', 'weather'),
+                 docs]
+        paths += _vdf_paths()
+        return (ac_path,) + tuple(_mtime(p) for p in paths)
+
+    def _resolve(self, ac_path):
+        docs = get_ac_docs_path()
+        env = {
+            'platform':      platform.system(),
+            'ac_install':    ac_path,
+            'ac_install_ok': bool(ac_path) and os.path.isfile(os.path.join(ac_path, 'acs.exe')),
+            'docs':          docs,
+            'docs_exists':   os.path.isdir(docs),
+            'csp_status': {
+                'csp':  bool(ac_path) and os.path.isdir(os.path.join(ac_path, 'extension')),
+                'pure': bool(ac_path) and os.path.isdir(
+                    os.path.join(ac_path, 'extension', 'weather', 'pure')),
+            },
+            'steam_libraries': steam_library_roots() if is_linux() else [],
+            'resolved_at':   time.time(),
+        }
+        for sub in DOCS_SUBFOLDERS:
+            env[sub] = os.path.join(docs, sub)
+        return env, self._signature(ac_path, docs)
+
+    def get(self, ac_path=None):
+        """Resolved environment for *ac_path* (a dict; do not mutate).
+
+        ac_path=None keeps the install path of the last lookup — for callers
+        that only need the Documents folders.
+        """
+        with self._lock:
+            if ac_path is None:
+                ac_path = self._env['ac_install'] if self._env else ''
+            now = time.monotonic()
+            env = self._env
+            if env is not None and env['ac_install'] == ac_path:
+                if now - self._checked_at < VALIDATE_INTERVAL_S:
+                    return env
+                self._checked_at = now
+                # A missing Documents folder may appear in any Steam library
+                # once AC first runs, so keep resolving until it exists.
+                if env['docs_exists'] and self._signature(ac_path, env['docs']) == self._sig:
+                    return env
+            self._env, self._sig = self._resolve(ac_path)
+            self._checked_at = now
+            return self._env
+
+    def refresh(self):
+        """Forget everything; the next get() resolves from scratch."""
+        with self._lock:
+            clear_path_caches()
+            self._env = None
+            self._sig = None
+
+    def docs_path(self, subfolder=''):
+        """AC Documents folder (or a subfolder of it) — memoized get_ac_docs_path()."""
+        docs = self.get()['docs']
+        return os.path.join(docs, subfolder) if subfolder else docs
+
+    def csp(self, ac_path):
+        """{'csp': bool, 'pure': bool} for the AC install."""
+        return dict(self.get(ac_path)['csp_status'])
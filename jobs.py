@@ -0,0 +1,123 @@
+"""
+Jobs — minimal background-job registry for long-running API calls.
+
+A job runs a function on a daemon thread and exposes its progress so the
+frontend can poll GET /api/jobs/<id> instead of holding a request open.
+Jobs that produce results incrementally emit() items; a streaming endpoint
+follows them with wait_items().  Finished jobs are kept (bounded) so a late
+poll still sees the result.
+"""
+
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+
+# Finished jobs kept for polling; oldest are dropped first.
+MAX_FINISHED_JOBS = 20
+
+
+class Job:
+    """State of one background job.  The worker reports via update()."""
+
+    def __init__(self, kind):
+        self.id       = uuid.uuid4().hex[:12]
+        self.kind     = kind
+        self.status   = 'running'      # running | done | error
+        self.progress = {}
+        self.result   = None
+        self.error    = None
+        self.started  = time.time()
+        self.finished = None
+        self.items    = []
+        self._lock    = threading.Condition()
+
+    def update(self, **progress):
+        with self._lock:
+            self.progress.update(progress)
+            self._lock.notify_all()
+
+    def emit(self, item, **progress):
+        """Append a partial result (and optionally update progress)."""
+        with self._lock:
+            self.items.append(item)
+            self.progress.update(progress)
+            self._lock.notify_all()
+
+    def wait_items(self, cursor, timeout=None):
+        """Block until items past *cursor* exist or the job finished.
+
+        Returns (new_items, new_cursor, progress, status).
+        """
+        with self._lock:
+            self._lock.wait_for(
+                lambda: len(self.items) > cursor or self.status != 'running', timeout)
+            new = self.items[cursor:]
+            return new, cursor + len(new), dict(self.progress), self.status
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            self.result   = result
+            self.error    = error
+            self.status   = status
+            self.finished = time.time()
+            self._lock.notify_all()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'id':       self.id,
+                'kind':     self.kind,
+                'status':   self.status,
+                'progress': dict(self.progress),
+                'result':   self.result,
+                'error':    self.error,
+                'elapsed':  round((self.finished or time.time()) - self.started, 2),
+            }
+
+
+class JobRegistry:
+    def __init__(self):
+        self._jobs = OrderedDict()
+        self._lock = threading.RLock()
+
+    def start(self, kind, fn, *args, **kwargs):
+        """Run fn(job, *args, **kwargs) on a daemon thread; returns the Job.
+
+        Only one job of a given kind runs at a time — starting a second one
+        returns the job already running.
+        """
+        with self._lock:
+            running = self.running(kind)
+            if running is not None:
+                return running
+            job = Job(kind)
+            self._jobs[job.id] = job
+            self._prune()
+
+        def _run():
+            try:
+                job._finish('done', result=fn(job, *args, **kwargs))
+            except Exception as e:
+                traceback.print_exc()
+                job._finish('error', error=str(e))
+
+        threading.Thread(target=_run, name=f'job-{kind}', daemon=True).start()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def running(self, kind):
+        with self._lock:
+            for job in self._jobs.values():
+                if job.kind == kind and job.status == 'running':
+                    return job
+            return None
+
+    def _prune(self):
+        finished = [jid for jid, j in self._jobs.items() if j.status != 'running']
+        for jid in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[jid]
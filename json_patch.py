@@ -0,0 +1,224 @@
+"""
+JSON Patch — minimal RFC 6902 diff / apply for API deltas.
+
+diff(src, dst) returns the operations that turn src into dst:
+
+  objects   per-key 'remove' / 'add' / recursive diff
+  arrays    rows with an identity (every item an object with a unique
+            'driver' / 'team' / 'name' / 'id', same set on both sides):
+            'move' ops into the new order, then a recursive diff per row,
+            or — when every row keeps its keys — one 'rows' op, whichever
+            is smaller (see below)
+            otherwise positional: recursive diff per index, then 'remove'
+            from the end or 'add' at the end for a length change
+  scalars   'replace'
+
+A subtree whose operations would serialize larger than its new value is
+sent as a single 'replace' instead.
+
+'rows' is the one extension to RFC 6902, a compact positional diff for
+tables where every row changes a little (standings after a race: points,
+gap, position, races):
+
+  {"op": "rows", "path": P, "order": [old index for each new row] | null,
+   "set": {"points": [value for each new row], ...}}
+
+Only the changed columns are listed.  apply() implements every operation
+diff() produces; static/app.js has the client-side counterpart
+(applyJsonPatch).
+"""
+
+import copy
+import json
+
+# Keys that identify an array row, in order of preference
+ROW_ID_KEYS = ('driver', 'team', 'name', 'id')
+
+
+def _escape(key):
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _unescape(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _same(a, b):
+    # 1 == 1.0 == True in Python, not in JSON — also inside containers, so
+    # == only rules out a difference and the types are checked item by item
+    if type(a) is not type(b) or a != b:
+        return False
+    if isinstance(a, dict):
+        return all(_same(v, b[k]) for k, v in a.items())
+    if isinstance(a, list):
+        return all(map(_same, a, b))
+    return True
+
+
+def _size(value):
+    return len(json.dumps(value, separators=(',', ':'), ensure_ascii=False))
+
+
+def _diff(a, b, path, ops):
+    if a is b or _same(a, b):
+        return
+    if isinstance(a, (dict, list)) and type(a) is type(b) and path:
+        sub = []
+        _diff_container(a, b, path, sub)
+        if _size(sub) < _size(b) + len(path) + 30:
+            ops.extend(sub)
+        else:
+            ops.append({'op': 'replace', 'path': path, 'value': b})
+        return
+    _diff_container(a, b, path, ops)
+
+
+def _diff_container(a, b, path, ops):
+    if isinstance(a, dict) and isinstance(b, dict):
+        for key in a:
+            if key not in b:
+                ops.append({'op': 'remove', 'path': f'{path}/{_escape(key)}'})
+        for key, value in b.items():
+            if key in a:
+                _diff(a[key], value, f'{path}/{_escape(key)}', ops)
+            else:
+                ops.append({'op': 'add', 'path': f'{path}/{_escape(key)}', 'value': value})
+    elif isinstance(a, list) and isinstance(b, list):
+        key = _row_key(a, b)
+        if key is not None:
+            moved = []
+            rows = list(a)
+            ids = [r[key] for r in rows]
+            for i, row in enumerate(b):
+                j = ids.index(row[key], i)
+                if j != i:
+                    moved.append({'op': 'move', 'from': f'{path}/{j}', 'path': f'{path}/{i}'})
+                    rows.insert(i, rows.pop(j))
+                    ids.insert(i, ids.pop(j))
+                _diff(rows[i], row, f'{path}/{i}', moved)
+            compact = _rows_op(a, b, key, path)
+            ops.extend(compact if compact is not None and _size(compact) < _size(moved)
+                       else moved)
+            return
+        for i in range(min(len(a), len(b))):
+            _diff(a[i], b[i], f'{path}/{i}', ops)
+        for i in range(len(a) - 1, len(b) - 1, -1):
+            ops.append({'op': 'remove', 'path': f'{path}/{i}'})
+        for i in range(len(a), len(b)):
+            ops.append({'op': 'add', 'path': f'{path}/-', 'value': b[i]})
+    else:
+        ops.append({'op': 'replace', 'path': path, 'value': b})
+
+
+def _row_key(a, b):
+    """Identity key shared by every row of *a* and *b* (None → positional)."""
+    if len(a) != len(b) or len(a) < 2:
+        return None
+    if not all(isinstance(r, dict) for r in a) or not all(isinstance(r, dict) for r in b):
+        return None
+    for key in ROW_ID_KEYS:
+        try:
+            ids_a = [r[key] for r in a]
+            ids_b = [r[key] for r in b]
+        except KeyError:
+            continue
+        if not all(isinstance(x, str) for x in ids_a):
+            continue
+        if len(set(ids_a)) == len(ids_a) and set(ids_a) == set(ids_b):
+            return key
+        return None
+    return None
+
+
+def _rows_op(a, b, key, path):
+    """[{'op': 'rows', ...}] turning *a* into *b*, or None when a row's keys
+    change (then only add / remove can express it)."""
+    index = {r[key]: i for i, r in enumerate(a)}
+    order = [index[r[key]] for r in b]
+    changed = {}
+    for new, old in zip(b, (a[j] for j in order)):
+        if new.keys() != old.keys():
+            return None
+        for col, value in new.items():
+            if col not in changed and not _same(old[col], value):
+                changed[col] = True
+    op = {'op': 'rows', 'path': path,
+          'order': None if order == list(range(len(order))) else order,
+          'set': {col: [r[col] for r in b] for col in changed}}
+    return [op]
+
+
+def diff(src, dst):
+    """RFC 6902 operations turning *src* into *dst* (JSON-compatible values)."""
+    ops = []
+    _diff(src, dst, '', ops)
+    return ops
+
+
+def _resolve(doc, path):
+    try:
+        for token in path.split('/')[1:]:
+            token = _unescape(token)
+            doc = doc[int(token)] if isinstance(doc, list) else doc[token]
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise ValueError(f'cannot resolve {path}: {e}') from None
+    return doc
+
+
+def _apply_op(doc, kind, path, value):
+    """Apply one add / remove / replace to *doc* in place; returns the root."""
+    if path == '':
+        if kind == 'remove':
+            raise ValueError('cannot remove the document root')
+        return value
+    *parents, last = [_unescape(t) for t in path.split('/')[1:]]
+    target = doc
+    try:
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            index = len(target) if last == '-' else int(last)
+            if not 0 <= index <= len(target) - (kind != 'add'):
+                raise IndexError(index)
+            if kind == 'add':
+                target.insert(index, value)
+            elif kind == 'remove':
+                del target[index]
+            else:
+                target[index] = value
+        elif kind == 'remove':
+            del target[last]
+        elif kind == 'replace' and last not in target:
+            raise KeyError(last)
+        else:
+            target[last] = value
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise ValueError(f'cannot {kind} {path}: {e}') from None
+    return doc
+
+
+def apply(doc, ops):
+    """Return a patched copy of *doc*.  Raises ValueError on a bad path."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        kind, path = op['op'], op['path']
+        if kind == 'move':
+            value = _resolve(doc, op['from'])
+            doc = _apply_op(doc, 'remove', op['from'], None)
+            doc = _apply_op(doc, 'add', path, value)
+        elif kind == 'rows':
+            rows = _resolve(doc, path)
+            if not isinstance(rows, list):
+                raise ValueError(f'cannot apply rows to {path}')
+            if op.get('order') is not None:
+                rows[:] = [rows[j] for j in op['order']]
+            for col, values in op['set'].items():
+                if len(values) != len(rows):
+                    raise ValueError(f'rows {path}: {col} has {len(values)} values')
+                for row, value in zip(rows, values):
+                    row[col] = copy.deepcopy(value)
+        elif kind in ('add', 'remove', 'replace'):
+            doc = _apply_op(doc, kind, path, copy.deepcopy(op.get('value')))
+        else:
+            raise ValueError(f'unsupported op {kind!r}')
+    return doc
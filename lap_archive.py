@@ -0,0 +1,436 @@
+"""
+Lap Archive — columnar, append-only store of every lap from every ingested race.
+
+Each column (lap time, sectors, cuts, driver id, …) is a fixed-width typed
+array in its own file under <user data dir>/lap_archive/.  Files are only ever
+appended to, so queries can memory-map them and slice the rows they need
+instead of loading a whole career of laps into Python objects.
+
+A small JSON index sits next to the columns.  It holds the string tables
+(driver / car / tyre names → compact ids), one row range per race, and
+race lists grouped by track, car and season.  The index is rewritten
+atomically after the columns have been appended, so its row count is the
+source of truth: any rows past it (an interrupted append) are truncated on
+the next open.
+"""
+
+import json
+import mmap
+import os
+import threading
+from array import array
+
+# (column name, array typecode) — order is the on-disk column order.
+# 'I' = uint32, 'H' = uint16, 'B' = uint8.
+COLUMNS = (
+    ('race',   'I'),   # race id (index into index['races'])
+    ('driver', 'H'),   # id into strings['drivers']
+    ('car',    'H'),   # id into strings['cars']
+    ('lap',    'H'),   # 1-based lap number for this driver in this race
+    ('lap_ms', 'I'),
+    ('s1_ms',  'I'),   # 0 when the sector time is missing
+    ('s2_ms',  'I'),
+    ('s3_ms',  'I'),
+    ('cuts',   'B'),
+    ('tyre',   'B'),   # id into strings['tyres']
+    ('flags',  'B'),   # FLAG_* bits
+)
+_TYPECODES = dict(COLUMNS)
+
+FLAG_PLAYER = 0x01
+FLAG_VALID  = 0x02   # within 150% of the driver's best lap in that race
+
+# String tables matched case-insensitively: AC's DriverName does not always
+# keep the spelling of the career's driver name
+_CASEFOLDED = {'drivers'}
+
+_INDEX_FILE = 'index.json'
+_INDEX_VERSION = 1
+
+
+def _empty_index():
+    return {
+        'version': _INDEX_VERSION,
+        'rows':    0,
+        'strings': {'drivers': [], 'cars': [], 'tyres': ['']},
+        'races':   [],
+        'by_track':  {},
+        'by_car':    {},
+        'by_season': {},
+    }
+
+
+def _percentile(sorted_vals, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_vals:
+        return None
+    if len(sorted_vals) == 1:
+        return sorted_vals[0]
+    pos = (len(sorted_vals) - 1) * pct / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return round(sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo))
+
+
+class _MappedColumns:
+    """Read-only memory maps of the requested columns (context manager).
+
+    Each column is exposed as a typed memoryview over the whole file; index
+    it with absolute row numbers rather than keeping slices around.
+    """
+
+    def __init__(self, directory, names, rows):
+        self._directory = directory
+        self._names = names
+        self._rows = rows
+        self._maps = []
+        self._held = []
+        self._views = {}
+
+    def __enter__(self):
+        for name in self._names:
+            tc = _TYPECODES[name]
+            if self._rows == 0:
+                self._views[name] = memoryview(array(tc))
+                continue
+            with open(os.path.join(self._directory, name + '.col'), 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mm)
+            base = memoryview(mm)
+            sized = base[:self._rows * array(tc).itemsize]
+            view = sized.cast(tc)
+            self._held += [view, sized, base]
+            self._views[name] = view
+        return self._views
+
+    def __exit__(self, *exc):
+        self._views.clear()
+        for view in self._held:
+            view.release()
+        self._held.clear()
+        for mm in self._maps:
+            try:
+                mm.close()
+            except BufferError:
+                pass   # a caller still holds a slice; the map closes when it is freed
+        self._maps.clear()
+        return False
+
+
+class LapArchive:
+    """Append-only columnar lap store with a track / car / season index."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index = None
+
+    # ------------------------------------------------------------------
+    # Index handling
+    # ------------------------------------------------------------------
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        path = os.path.join(self.directory, _INDEX_FILE)
+        index = _empty_index()
+        if os.path.isfile(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if loaded.get('version') == _INDEX_VERSION:
+                    index = loaded
+            except (OSError, ValueError):
+                pass
+        self._truncate_to(index['rows'])
+        self._index = index
+        return index
+
+    def _truncate_to(self, rows):
+        """Drop column rows past *rows* (left behind by an interrupted append)."""
+        for name, tc in COLUMNS:
+            path = os.path.join(self.directory, name + '.col')
+            if not os.path.isfile(path):
+                continue
+            want = rows * array(tc).itemsize
+            if os.path.getsize(path) > want:
+                with open(path, 'r+b') as f:
+                    f.truncate(want)
+
+    def _save_index(self, index):
+        path = os.path.join(self.directory, _INDEX_FILE)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _intern(index, table, value):
+        strings = index['strings'][table]
+        fold = str.casefold if table in _CASEFOLDED else None
+        lookup = index.setdefault('_lookup', {}).setdefault(table, None)
+        if lookup is None:
+            lookup = {}
+            for i, s in enumerate(strings):
+                lookup.setdefault(fold(s) if fold else s, i)
+            index['_lookup'][table] = lookup
+        k = fold(value) if fold else value
+        sid = lookup.get(k)
+        if sid is None:
+            sid = len(strings)
+            strings.append(value)
+            lookup[k] = sid
+        return sid
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def has_race(self, key):
+        with self._lock:
+            index = self._load_index()
+            return any(r['key'] == key for r in index['races'])
+
+    def keys(self, min_season=None):
+        """Set of every archived race key — lets bulk imports skip known files.
+        min_season: only races of that season or later (1: career races)."""
+        with self._lock:
+            return {r['key'] for r in self._load_index()['races']
+                    if min_season is None or (r.get('season') or 0) >= min_season}
+
+    def append_race(self, key, laps, track, car, season, tier, race_num, player_name=''):
+        """Append all laps of one race.  Returns the new race id, or None if
+        *key* was already archived or there were no usable laps.
+
+        laps: classic AC 'Laps' dicts — DriverName, LapTime, Sectors, Cuts,
+              Tyre and optionally CarModel (falls back to *car*).
+        """
+        return self.append_races([{
+            'key': key, 'laps': laps, 'track': track, 'car': car,
+            'season': season, 'tier': tier, 'race_num': race_num,
+            'player_name': player_name,
+        }])[0]
+
+    def append_races(self, races):
+        """Batch form of append_race — one index rewrite for the whole batch.
+
+        races: list of dicts with the append_race() keyword arguments.
+        Returns a list of race ids (None for skipped races), in input order.
+        """
+        with self._lock:
+            index = self._load_index()
+            known = {r['key'] for r in index['races']}
+            cols = {name: array(tc) for name, tc in COLUMNS}
+            race_ids = []
+            rows = index['rows']
+
+            for race in races:
+                key = race['key']
+                if key in known:
+                    race_ids.append(None)
+                    continue
+                race_id = len(index['races'])
+                start = rows
+                player = (race.get('player_name') or '').casefold()
+                default_car = race.get('car') or ''
+
+                best = {}
+                usable = []
+                for lap in race.get('laps') or []:
+                    if not isinstance(lap, dict):
+                        continue
+                    lt = lap.get('LapTime')
+                    if not isinstance(lt, (int, float)) or lt <= 0:
+                        continue
+                    name = lap.get('DriverName', '').casefold()
+                    usable.append(lap)
+                    if lt < best.get(name, float('inf')):
+                        best[name] = lt
+                if not usable:
+                    race_ids.append(None)
+                    continue
+
+                lap_no = {}
+                for lap in usable:
+                    display = lap.get('DriverName', '')
+                    name = display.casefold()
+                    lt = int(lap['LapTime'])
+                    sectors = lap.get('Sectors') or []
+                    sec = [int(s) if isinstance(s, (int, float)) and s > 0 else 0
+                           for s in sectors[:3]]
+                    sec += [0] * (3 - len(sec))
+                    flags = FLAG_PLAYER if player and name == player else 0
+                    if lt <= best[name] * 1.5:
+                        flags |= FLAG_VALID
+                    lap_no[name] = lap_no.get(name, 0) + 1
+
+                    cols['race'].append(race_id)
+                    cols['driver'].append(self._intern(index, 'drivers', display))
+                    cols['car'].append(self._intern(index, 'cars',
+                                                    lap.get('CarModel') or default_car))
+                    cols['lap'].append(min(lap_no[name], 0xFFFF))
+                    cols['lap_ms'].append(lt)
+                    cols['s1_ms'].append(sec[0])
+                    cols['s2_ms'].append(sec[1])
+                    cols['s3_ms'].append(sec[2])
+                    cols['cuts'].append(max(0, min(255, int(lap.get('Cuts') or 0))))
+                    cols['tyre'].append(self._intern(index, 'tyres', lap.get('Tyre') or ''))
+                    cols['flags'].append(flags)
+                    rows += 1
+
+                track = race.get('track') or ''
+                season = int(race.get('season') or 0)
+                index['races'].append({
+                    'key':      key,
+                    'track':    track,
+                    'car':      default_car,
+                    'season':   season,
+                    'tier':     race.get('tier'),
+                    'race_num': race.get('race_num'),
+                    'start':    start,
+                    'count':    rows - start,
+                })
+                index['by_track'].setdefault(track, []).append(race_id)
+                index['by_car'].setdefault(default_car, []).append(race_id)
+                index['by_season'].setdefault(str(season), []).append(race_id)
+                known.add(key)
+                race_ids.append(race_id)
+
+            if rows == index['rows']:
+                return race_ids
+
+            os.makedirs(self.directory, exist_ok=True)
+            for name, _ in COLUMNS:
+                with open(os.path.join(self.directory, name + '.col'), 'ab') as f:
+                    cols[name].tofile(f)
+            index['rows'] = rows
+            self._save_index({k: v for k, v in index.items() if k != '_lookup'})
+            return race_ids
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _select_races(self, index, track=None, car=None, season=None):
+        ids = None
+        for key, value in (('by_track', track), ('by_car', car),
+                           ('by_season', None if season is None else str(season))):
+            if value is None:
+                continue
+            found = set(index[key].get(value, []))
+            ids = found if ids is None else ids & found
+        if ids is None:
+            ids = range(len(index['races']))
+        return sorted(ids)
+
+    def _driver_ids(self, index, driver):
+        """Ids of every spelling of *driver* (None = any driver)."""
+        if driver is None:
+            return None
+        folded = driver.casefold()
+        # Archives written before names were casefolded may hold several
+        return frozenset(i for i, s in enumerate(index['strings']['drivers'])
+                         if s.casefold() == folded)
+
+    def _snapshot(self):
+        with self._lock:
+            index = self._load_index()
+            return index, index['rows']
+
+    def personal_bests(self, driver, track=None, car=None):
+        """Best valid lap per (track, car) for *driver*.
+
+        Returns [{track, car, best_ms, season, race_num}, ...] sorted by track.
+        """
+        index, rows = self._snapshot()
+        dids = self._driver_ids(index, driver)
+        if not dids:
+            return []
+        races = index['races']
+        cars = index['strings']['cars']
+        best = {}
+        with _MappedColumns(self.directory, ('driver', 'car', 'lap_ms', 'flags'), rows) as c:
+            for rid in self._select_races(index, track=track, car=car):
+                r = races[rid]
+                drv, car_col, lap_ms, flags = c['driver'], c['car'], c['lap_ms'], c['flags']
+                for i in range(r['start'], r['start'] + r['count']):
+                    if drv[i] not in dids or not flags[i] & FLAG_VALID:
+                        continue
+                    k = (r['track'], cars[car_col[i]])
+                    if k not in best or lap_ms[i] < best[k]['best_ms']:
+                        best[k] = {'track': k[0], 'car': k[1], 'best_ms': lap_ms[i],
+                                   'season': r['season'], 'race_num': r['race_num']}
+        return sorted(best.values(), key=lambda b: (b['track'], b['car']))
+
+    def pace_evolution(self, driver, track, car=None):
+        """Per-race pace of *driver* at *track*, oldest race first.
+
+        Returns [{season, race_num, car, laps, best_ms, median_ms}, ...].
+        """
+        index, rows = self._snapshot()
+        dids = self._driver_ids(index, driver)
+        if not dids:
+            return []
+        races = index['races']
+        out = []
+        with _MappedColumns(self.directory, ('driver', 'lap_ms', 'flags'), rows) as c:
+            for rid in self._select_races(index, track=track, car=car):
+                r = races[rid]
+                drv, lap_ms, flags = c['driver'], c['lap_ms'], c['flags']
+                times = sorted(lap_ms[i] for i in range(r['start'], r['start'] + r['count'])
+                               if drv[i] in dids and flags[i] & FLAG_VALID)
+                if not times:
+                    continue
+                out.append({
+                    'season':    r['season'],
+                    'race_num':  r['race_num'],
+                    'car':       r['car'],
+                    'laps':      len(times),
+                    'best_ms':   times[0],
+                    'median_ms': _percentile(times, 50),
+                })
+        return out
+
+    def sector_percentiles(self, track, driver=None, car=None, percentiles=(10, 50, 90)):
+        """Sector-time percentiles over every valid lap at *track*.
+
+        driver=None covers the whole field.  Returns
+        {'laps': n, 'sectors': [{'p10': ms, 'p50': ms, ...}, ×3]}.
+        """
+        index, rows = self._snapshot()
+        dids = self._driver_ids(index, driver)
+        if dids is not None and not dids:
+            return {'laps': 0, 'sectors': []}
+        races = index['races']
+        samples = ([], [], [])
+        with _MappedColumns(self.directory,
+                            ('driver', 's1_ms', 's2_ms', 's3_ms', 'flags'), rows) as c:
+            for rid in self._select_races(index, track=track, car=car):
+                r = races[rid]
+                drv, flags = c['driver'], c['flags']
+                secs = (c['s1_ms'], c['s2_ms'], c['s3_ms'])
+                for i in range(r['start'], r['start'] + r['count']):
+                    if not flags[i] & FLAG_VALID or (dids is not None and drv[i] not in dids):
+                        continue
+                    if not (secs[0][i] and secs[1][i] and secs[2][i]):
+                        continue
+                    for s in range(3):
+                        samples[s].append(secs[s][i])
+        if not samples[0]:
+            return {'laps': 0, 'sectors': []}
+        sectors = []
+        for vals in samples:
+            vals.sort()
+            sectors.append({f'p{p}': _percentile(vals, p) for p in percentiles})
+        return {'laps': len(samples[0]), 'sectors': sectors}
+
+    def summary(self):
+        """Row / race counts and the tracks, cars and seasons on file."""
+        index, rows = self._snapshot()
+        return {
+            'rows':    rows,
+            'races':   len(index['races']),
+            'tracks':  sorted(index['by_track']),
+            'cars':    sorted(index['by_car']),
+            'seasons': sorted(int(s) for s in index['by_season']),
+        }
@@ -0,0 +1,606 @@
+"""
+Live Telemetry — listener for Assetto Corsa's UDP remote-telemetry protocol.
+
+AC serves telemetry on UDP port 9996 of the machine running the sim.  A
+client sends a 12-byte handshake, gets a 408-byte handshake response (car,
+driver, track), then subscribes to either UPDATE events (one RTCarInfo, 328
+bytes, per physics tick for the player's car) or SPOT events (one RTLap, 212
+bytes, every time any car completes a lap).  A client address can only hold
+one subscription, so LiveTelemetry opens one socket per event type.
+
+Packets are decoded with precompiled struct.Struct objects via unpack_from on
+the received buffer — only the fields the UI needs, straight into a
+fixed-size ring buffer of typed arrays, so the hot path allocates no dicts.
+The asyncio loop runs on its own daemon thread; Flask handlers read
+snapshot() / provisional_result() and the SSE stream wakes on
+wait_for_change().
+
+The provisional result (lap count + summed lap time per car, from SPOT
+events) is marked final as soon as the player completes the expected
+number of laps — before AC has exited and written its results file.
+
+For testing without AC, FakeAcServer answers the handshake and replays a
+capture (recorded with LiveTelemetry(capture_path=…)) or a synthetic race:
+
+    python live_telemetry.py fake --laps 5 --speed 20      # terminal 1
+    python live_telemetry.py listen                         # terminal 2
+"""
+
+import asyncio
+import struct
+import threading
+import time
+from array import array
+
+AC_TELEMETRY_PORT = 9996
+
+OP_HANDSHAKE        = 0
+OP_SUBSCRIBE_UPDATE = 1
+OP_SUBSCRIBE_SPOT   = 2
+OP_DISMISS          = 3
+
+# ── Wire formats (little-endian, AC strings are UTF-16 wchar_t[50]) ───────────
+HANDSHAKER = struct.Struct('<3i')                    # identifier, version, operationId
+HANDSHAKE_RESPONSE = struct.Struct('<100s100sii100s100s')
+RT_CAR_INFO = struct.Struct('<c3xi3f6?2x3f4i5fif56f2f3f')
+RT_LAP = struct.Struct('<ii100s100si')
+
+HANDSHAKE_RESPONSE_SIZE = HANDSHAKE_RESPONSE.size    # 408
+RT_CAR_INFO_SIZE        = RT_CAR_INFO.size           # 328
+RT_LAP_SIZE             = RT_LAP.size                # 212
+
+# RTCarInfo fields read on the hot path (offset, Struct)
+_CAR_SPEED_KMH = (8,   struct.Struct('<f'))
+_CAR_IN_PIT    = (24,  struct.Struct('<?'))
+_CAR_LAPS      = (40,  struct.Struct('<4i'))         # lapTime, lastLap, bestLap, lapCount
+_CAR_GEAR      = (76,  struct.Struct('<i'))
+_CAR_SPLINE    = (308, struct.Struct('<f'))          # carPositionNormalized
+_LAP_HEAD      = struct.Struct('<ii')                # carIdentifierNumber, lap
+_LAP_TIME      = (208, struct.Struct('<i'))
+
+# Resend the handshake when nothing arrived for this long (AC restarted,
+# session changed, or the sim is not running yet).
+RECONNECT_AFTER_S = 3.0
+# SSE wake-ups from car updates are throttled to this interval.
+UPDATE_NOTIFY_S = 0.1
+
+
+def _wstr(raw):
+    """Decode an AC wchar_t[50] field (UTF-16LE, NUL or '%' padded)."""
+    text = raw.decode('utf-16-le', errors='ignore')
+    for stop in ('\x00', '%'):
+        cut = text.find(stop)
+        if cut != -1:
+            text = text[:cut]
+    return text.strip()
+
+
+def _wbytes(text):
+    return text.encode('utf-16-le')[:100].ljust(100, b'\x00')
+
+
+class TelemetryRing:
+    """Fixed-size ring buffer of RTCarInfo samples in typed columns."""
+
+    def __init__(self, capacity=4096):
+        self.capacity  = capacity
+        self.t         = array('d', bytes(8 * capacity))
+        self.speed_kmh = array('f', bytes(4 * capacity))
+        self.lap_time  = array('i', bytes(4 * capacity))
+        self.last_lap  = array('i', bytes(4 * capacity))
+        self.best_lap  = array('i', bytes(4 * capacity))
+        self.lap_count = array('i', bytes(4 * capacity))
+        self.gear      = array('b', bytes(capacity))
+        self.in_pit    = array('b', bytes(capacity))
+        self.spline    = array('f', bytes(4 * capacity))
+        self.count     = 0     # total samples ever written
+
+    def push(self, buf, now):
+        """Decode one RTCarInfo packet straight into the columns; returns slot."""
+        i = self.count % self.capacity
+        self.t[i] = now
+        self.speed_kmh[i] = _CAR_SPEED_KMH[1].unpack_from(buf, _CAR_SPEED_KMH[0])[0]
+        self.in_pit[i] = _CAR_IN_PIT[1].unpack_from(buf, _CAR_IN_PIT[0])[0]
+        (self.lap_time[i], self.last_lap[i],
+         self.best_lap[i], self.lap_count[i]) = _CAR_LAPS[1].unpack_from(buf, _CAR_LAPS[0])
+        self.gear[i] = max(-1, min(127, _CAR_GEAR[1].unpack_from(buf, _CAR_GEAR[0])[0]))
+        self.spline[i] = _CAR_SPLINE[1].unpack_from(buf, _CAR_SPLINE[0])[0]
+        self.count += 1
+        return i
+
+    def latest(self):
+        if not self.count:
+            return None
+        i = (self.count - 1) % self.capacity
+        return {
+            'speed_kmh':   round(self.speed_kmh[i], 1),
+            'lap_time_ms': self.lap_time[i],
+            'last_lap_ms': self.last_lap[i],
+            'best_lap_ms': self.best_lap[i],
+            'lap_count':   self.lap_count[i],
+            'gear':        self.gear[i] - 1,      # AC: 0 = R, 1 = N, 2 = 1st
+            'in_pit':      bool(self.in_pit[i]),
+            'spline':      round(self.spline[i], 4),
+        }
+
+    def recent(self, column, n):
+        """Last *n* values of a column, oldest first."""
+        n = min(n, self.count, self.capacity)
+        col = getattr(self, column)
+        end = self.count % self.capacity
+        if end >= n:
+            return col[end - n:end].tolist()
+        return col[self.capacity - (n - end):].tolist() + col[:end].tolist()
+
+
+class _Channel(asyncio.DatagramProtocol):
+    """One socket = one subscription (UPDATE or SPOT)."""
+
+    def __init__(self, owner, subscribe_op):
+        self.owner = owner
+        self.subscribe_op = subscribe_op
+        self.transport = None
+        self.subscribed = False
+        self.last_packet = 0.0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.last_packet = time.monotonic()
+        self.handshake()
+
+    def handshake(self):
+        self.subscribed = False
+        self.transport.sendto(HANDSHAKER.pack(1, 1, OP_HANDSHAKE))
+
+    def dismiss(self):
+        if self.transport is not None:
+            try:
+                self.transport.sendto(HANDSHAKER.pack(1, 1, OP_DISMISS))
+            except OSError:
+                pass
+
+    def datagram_received(self, data, addr):
+        self.last_packet = time.monotonic()
+        size = len(data)
+        if size == HANDSHAKE_RESPONSE_SIZE:
+            self.owner._on_handshake(data)
+            self.transport.sendto(HANDSHAKER.pack(1, 1, self.subscribe_op))
+            self.subscribed = True
+        elif size == RT_CAR_INFO_SIZE:
+            self.owner._on_car_info(data)
+        elif size == RT_LAP_SIZE:
+            self.owner._on_lap(data)
+        self.owner._capture(data)
+
+    def error_received(self, exc):
+        # ICMP port unreachable while AC is not running — keep retrying
+        pass
+
+
+class LiveTelemetry:
+    def __init__(self, host='127.0.0.1', port=AC_TELEMETRY_PORT, capacity=4096,
+                 capture_path=None):
+        self.host = host
+        self.port = port
+        self.ring = TelemetryRing(capacity)
+        self.capture_path = capture_path
+        self._capture_file = None
+        self._capture_t = 0.0
+        self._cond = threading.Condition()
+        self._version = 0
+        self._last_notify = 0.0
+        self._thread = None
+        self._loop = None
+        self._stop = None
+        self._channels = []
+        self._reset_session('', 0)
+
+    # ── lifecycle ────────────────────────────────────────────────────────────
+
+    def start(self, driver_name='', expected_laps=0):
+        """(Re)arm for a new race and make sure the listener thread runs."""
+        with self._cond:
+            self._reset_session(driver_name, expected_laps)
+        self._notify()
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='live-telemetry', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        loop, stop = self._loop, self._stop
+        if loop is not None and stop is not None:
+            loop.call_soon_threadsafe(stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._main())
+        finally:
+            loop.close()
+            self._loop = None
+            if self._capture_file is not None:
+                self._capture_file.close()
+                self._capture_file = None
+
+    async def _main(self):
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._channels = []
+        for op in (OP_SUBSCRIBE_UPDATE, OP_SUBSCRIBE_SPOT):
+            _, proto = await loop.create_datagram_endpoint(
+                lambda op=op: _Channel(self, op), remote_addr=(self.host, self.port))
+            self._channels.append(proto)
+        try:
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                # SPOT packets only arrive once per lap, so liveness is judged
+                # on the UPDATE channel; a stale one re-handshakes both.
+                now = time.monotonic()
+                update = self._channels[0]
+                if now - update.last_packet > RECONNECT_AFTER_S:
+                    for ch in self._channels:
+                        ch.handshake()
+                    update.last_packet = now
+                connected = update.subscribed and now - update.last_packet < RECONNECT_AFTER_S
+                if connected != self._connected:
+                    self._connected = connected
+                    self._notify()
+        finally:
+            for ch in self._channels:
+                ch.dismiss()
+                ch.transport.close()
+            self._channels = []
+            self._connected = False
+            self._notify()
+
+    # ── packet handlers (listener thread) ────────────────────────────────────
+
+    def _reset_session(self, driver_name, expected_laps):
+        self.driver_name   = driver_name
+        self.expected_laps = int(expected_laps or 0)
+        self.session       = {}
+        self._connected    = False
+        self._car_names    = {}      # car id → (driver, car model)
+        self._lap_events   = []      # (car id, lap time ms) in arrival order
+        self._car_laps     = {}      # car id → [laps, total ms, best ms]
+        self._player_id    = None
+        self._last_lap_count = -1
+
+    def _on_handshake(self, data):
+        car, driver, _, _, track, layout = HANDSHAKE_RESPONSE.unpack(data)
+        with self._cond:
+            self.session = {
+                'car': _wstr(car), 'driver': _wstr(driver),
+                'track': _wstr(track), 'track_config': _wstr(layout),
+            }
+        self._notify()
+
+    def _on_car_info(self, data):
+        slot = self.ring.push(data, time.time())
+        lap_count = self.ring.lap_count[slot]
+        if lap_count < self._last_lap_count:
+            # Lap counter went backwards → new session (practice → quali → race)
+            with self._cond:
+                self._car_names.clear()
+                self._lap_events.clear()
+                self._car_laps.clear()
+        self._last_lap_count = lap_count
+        now = time.monotonic()
+        if now - self._last_notify >= UPDATE_NOTIFY_S:
+            self._notify()
+
+    def _on_lap(self, data):
+        car_id, _ = _LAP_HEAD.unpack_from(data, 0)
+        lap_ms = _LAP_TIME[1].unpack_from(data, _LAP_TIME[0])[0]
+        with self._cond:
+            if car_id not in self._car_names:
+                _, _, driver, car, _ = RT_LAP.unpack(data)
+                name = _wstr(driver)
+                self._car_names[car_id] = (name, _wstr(car))
+                if self.driver_name and name.lower() == self.driver_name.lower():
+                    self._player_id = car_id
+            if lap_ms > 0:
+                self._lap_events.append((car_id, lap_ms))
+                tally = self._car_laps.setdefault(car_id, [0, 0, 0])
+                tally[0] += 1
+                tally[1] += lap_ms
+                tally[2] = lap_ms if not tally[2] else min(tally[2], lap_ms)
+        self._notify()
+
+    def _capture(self, data):
+        if not self.capture_path:
+            return
+        if self._capture_file is None:
+            self._capture_file = open(self.capture_path, 'wb')
+            self._capture_file.write(CAPTURE_MAGIC)
+            self._capture_t = time.monotonic()
+        now = time.monotonic()
+        self._capture_file.write(_CAPTURE_REC.pack(now - self._capture_t, len(data)))
+        self._capture_file.write(data)
+        self._capture_t = now
+
+    # ── change notification (SSE) ────────────────────────────────────────────
+
+    def _notify(self):
+        with self._cond:
+            self._version += 1
+            self._last_notify = time.monotonic()
+            self._cond.notify_all()
+
+    def wait_for_change(self, version, timeout=15.0):
+        """Block until the state version moves past *version*; returns it."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != version, timeout=timeout)
+            return self._version
+
+    # ── read side (Flask threads) ────────────────────────────────────────────
+
+    def _standings(self):
+        """[(car id, laps, total ms, best ms)] in provisional order.  Lock held."""
+        rows = [(cid, t[0], t[1], t[2]) for cid, t in self._car_laps.items()]
+        rows.sort(key=lambda r: (-r[1], r[2]))
+        return rows
+
+    def _player_finished(self):
+        if not self.expected_laps or self._player_id is None:
+            return False
+        tally = self._car_laps.get(self._player_id)
+        return bool(tally) and tally[0] >= self.expected_laps
+
+    def snapshot(self):
+        """Current live state for the UI."""
+        with self._cond:
+            standings = self._standings()
+            position = None
+            for pos, row in enumerate(standings, start=1):
+                if row[0] == self._player_id:
+                    position = pos
+                    break
+            return {
+                'version':       self._version,
+                'listening':     self.running,
+                'connected':     self._connected,
+                'session':       dict(self.session),
+                'player':        self.ring.latest(),
+                'position':      position,
+                'cars':          len(standings),
+                'expected_laps': self.expected_laps,
+                'finished':      self._player_finished(),
+                'recent_speed':  self.ring.recent('speed_kmh', 120),
+            }
+
+    def provisional_result(self):
+        """Classification from SPOT lap events in classic AC results shape.
+
+        {'final', 'position', 'results': [...], 'data': {'Laps': [...]}}
+        — 'data'/'results' feed debrief.analyse_race directly.
+        """
+        with self._cond:
+            standings = self._standings()
+            names = dict(self._car_names)
+            events = list(self._lap_events)
+            final = self._player_finished()
+            player_id = self._player_id
+        results, position = [], None
+        for pos, (cid, laps, total, best) in enumerate(standings, start=1):
+            driver, car = names.get(cid, ('', ''))
+            results.append({'DriverName': driver, 'CarModel': car, 'Laps': laps,
+                            'BestLap': best, 'TotalTime': total})
+            if cid == player_id:
+                position = pos
+        laps = [{'DriverName': names.get(cid, ('', ''))[0],
+                 'CarModel':   names.get(cid, ('', ''))[1],
+                 'LapTime':    ms, 'Sectors': [], 'Cuts': 0, 'Tyre': ''}
+                for cid, ms in events]
+        return {'final': final, 'position': position,
+                'results': results, 'data': {'Laps': laps, '_source': 'telemetry'}}
+
+
+# ── Capture files & fake AC server (testing without the sim) ─────────────────
+
+CAPTURE_MAGIC = b'ACTELEM1'
+_CAPTURE_REC = struct.Struct('<dH')   # seconds since previous packet, length
+
+
+def read_capture(path):
+    """Yield (delay_s, packet) records from a capture file."""
+    with open(path, 'rb') as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f'{path}: not a telemetry capture')
+        while True:
+            head = f.read(_CAPTURE_REC.size)
+            if len(head) < _CAPTURE_REC.size:
+                return
+            delay, length = _CAPTURE_REC.unpack(head)
+            yield delay, f.read(length)
+
+
+def write_capture(path, records):
+    with open(path, 'wb') as f:
+        f.write(CAPTURE_MAGIC)
+        for delay, packet in records:
+            f.write(_CAPTURE_REC.pack(delay, len(packet)))
+            f.write(packet)
+
+
+def pack_handshake_response(car, driver, track, track_config=''):
+    return HANDSHAKE_RESPONSE.pack(_wbytes(car), _wbytes(driver), 1, 1,
+                                   _wbytes(track), _wbytes(track_config))
+
+
+def pack_car_info(speed_kmh=0.0, lap_time=0, last_lap=0, best_lap=0, lap_count=0,
+                  gear=2, spline=0.0, in_pit=False):
+    return RT_CAR_INFO.pack(
+        b'a', RT_CAR_INFO_SIZE, speed_kmh, speed_kmh / 1.609, speed_kmh / 3.6,
+        False, False, False, False, in_pit, False,
+        0.0, 0.0, 0.0,
+        lap_time, last_lap, best_lap, lap_count,
+        0.0, 0.0, 0.0, 0.0, 0.0, gear, 0.0,
+        *([0.0] * 56), spline, 0.0, 0.0, 0.0, 0.0)
+
+
+def pack_lap(car_id, lap, driver, car, time_ms):
+    return RT_LAP.pack(car_id, lap, _wbytes(driver), _wbytes(car), time_ms)
+
+
+def synthetic_race(driver='Player', car='ks_mazda_mx5_cup', cars=6, laps=3,
+                   lap_ms=90000, hz=20):
+    """Capture records for a made-up race: player updates + everyone's laps.
+
+    Timing is compressed to real time (lap_ms); replay with speed > 1.
+    """
+    import random
+    rng = random.Random(1)
+    names = [driver] + [f'AI Driver {i}' for i in range(1, cars)]
+    pace = [lap_ms + (0 if i == 0 else rng.randint(-1500, 2500)) for i in range(cars)]
+    yield 0.0, pack_handshake_response(car, driver, 'magione')
+    step = 1.0 / hz
+    events = []
+    for cid in range(cars):
+        t = 0.0
+        for lap in range(laps):
+            ms = pace[cid] + rng.randint(-400, 400)
+            t += ms / 1000.0
+            events.append((t, cid, lap, ms))
+    events.sort()
+    t, best, last, lap_count, ei = 0.0, 0, 0, 0, 0
+    lap_start = 0.0
+    end = events[-1][0]
+    while t <= end + step:
+        while ei < len(events) and events[ei][0] <= t:
+            et, cid, lap, ms = events[ei]
+            yield 0.0, pack_lap(cid, lap, names[cid], car, ms)
+            if cid == 0:
+                lap_count, last = lap + 1, ms
+                best = ms if not best else min(best, ms)
+                lap_start = et
+            ei += 1
+        cur = int((t - lap_start) * 1000)
+        spline = (cur / pace[0]) % 1.0
+        yield step, pack_car_info(150.0 + 40.0 * (spline - 0.5), cur, last, best,
+                                  lap_count, 4, spline)
+        t += step
+
+
+class FakeAcServer(asyncio.DatagramProtocol):
+    """Stand-in for AC's telemetry server: answers the handshake, then
+    replays *records* (delay, packet) to subscribers — RTCarInfo packets to
+    UPDATE subscribers and RTLap packets to SPOT subscribers."""
+
+    def __init__(self, records, speed=1.0):
+        self.records = list(records)
+        self.speed = speed
+        self.transport = None
+        self.update_clients = set()
+        self.spot_clients = set()
+        self.handshake = next((p for _, p in self.records
+                               if len(p) == HANDSHAKE_RESPONSE_SIZE),
+                              pack_handshake_response('car', 'Player', 'track'))
+        self.done = asyncio.Event()
+        self._task = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if len(data) != HANDSHAKER.size:
+            return
+        op = HANDSHAKER.unpack(data)[2]
+        if op == OP_HANDSHAKE:
+            self.transport.sendto(self.handshake, addr)
+        elif op == OP_SUBSCRIBE_UPDATE:
+            self.update_clients.add(addr)
+        elif op == OP_SUBSCRIBE_SPOT:
+            self.spot_clients.add(addr)
+        elif op == OP_DISMISS:
+            self.update_clients.discard(addr)
+            self.spot_clients.discard(addr)
+        if self._task is None and self.update_clients and self.spot_clients:
+            self._task = asyncio.get_running_loop().create_task(self._replay())
+
+    async def _replay(self):
+        for delay, packet in self.records:
+            if delay > 0:
+                await asyncio.sleep(delay / self.speed)
+            size = len(packet)
+            targets = (self.update_clients if size == RT_CAR_INFO_SIZE else
+                       self.spot_clients if size == RT_LAP_SIZE else ())
+            for addr in list(targets):
+                self.transport.sendto(packet, addr)
+        self.done.set()
+
+
+async def serve_fake(records, host='127.0.0.1', port=AC_TELEMETRY_PORT, speed=1.0):
+    """Run a FakeAcServer until its replay finishes."""
+    loop = asyncio.get_running_loop()
+    transport, proto = await loop.create_datagram_endpoint(
+        lambda: FakeAcServer(records, speed), local_addr=(host, port))
+    try:
+        await proto.done.wait()
+        await asyncio.sleep(0.2)
+    finally:
+        transport.close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='AC UDP telemetry tools.')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+    p_listen = sub.add_parser('listen', help='print live telemetry from AC')
+    p_listen.add_argument('--capture', help='record raw packets to this file')
+    p_replay = sub.add_parser('replay', help='serve a capture file as a fake AC')
+    p_replay.add_argument('file')
+    p_fake = sub.add_parser('fake', help='serve a synthetic race as a fake AC')
+    p_fake.add_argument('--driver', default='Player')
+    p_fake.add_argument('--cars', type=int, default=6)
+    p_fake.add_argument('--laps', type=int, default=3)
+    p_fake.add_argument('--save', help='also write the synthetic race as a capture file')
+    for p in (p_listen, p_replay, p_fake):
+        p.add_argument('--host', default='127.0.0.1')
+        p.add_argument('--port', type=int, default=AC_TELEMETRY_PORT)
+    for p in (p_replay, p_fake):
+        p.add_argument('--speed', type=float, default=1.0, help='replay speed factor')
+    args = parser.parse_args(argv)
+
+    if args.cmd == 'listen':
+        live = LiveTelemetry(args.host, args.port, capture_path=args.capture)
+        live.start()
+        version = 0
+        try:
+            while True:
+                version = live.wait_for_change(version, timeout=5)
+                s = live.snapshot()
+                p = s['player'] or {}
+                print(f"\r{'connected' if s['connected'] else 'waiting  '} "
+                      f"lap {p.get('lap_count', 0)} · P{s['position'] or '-'} · "
+                      f"{p.get('speed_kmh', 0):6.1f} km/h · last {p.get('last_lap_ms', 0)} ms",
+                      end='', flush=True)
+        except KeyboardInterrupt:
+            live.stop()
+        return 0
+
+    if args.cmd == 'replay':
+        records = list(read_capture(args.file))
+    else:
+        records = list(synthetic_race(args.driver, cars=args.cars, laps=args.laps))
+        if args.save:
+            write_capture(args.save, records)
+    asyncio.run(serve_fake(records, args.host, args.port, args.speed))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
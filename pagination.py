@@ -0,0 +1,116 @@
+"""
+Pagination — season / race cursors for the history and news endpoints.
+
+News, driver / team / player history and the swap / retirement logs grow
+with the career.  Their endpoints return one page at a time, newest first:
+
+    ?limit=20                  first page
+    ?cursor=<next_cursor>      the page after it
+    ?tier=gt3&type=race_result filters (where the entries carry the field)
+
+A cursor names the (season, race) of the last entry returned plus how many
+entries of that same (season, race) were on the pages so far, so a page
+boundary inside one race weekend neither repeats nor skips entries, and
+entries added for later races do not shift the pages after it.
+
+Lookups bisect a sorted key index instead of scanning from the start.
+IndexCache keeps each list's index per (revision, list, filters), so only
+the first page after a save sorts; later pages are a bisect.
+"""
+
+import bisect
+import threading
+from collections import OrderedDict
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT     = 100
+
+# Key indexes kept in memory (lists × filters of the current revision)
+MAX_INDEXES = 32
+
+
+def entry_key(entry):
+    """(season, race) of a news / history / log entry (race 0 if absent)."""
+    return (int(entry.get('season') or 0), int(entry.get('race') or 0))
+
+
+def encode_cursor(key, skip):
+    return f'{key[0]}.{key[1]}.{skip}'
+
+
+def decode_cursor(cursor):
+    """(season, race, skip) from a cursor string; ValueError if malformed."""
+    season, race, skip = (int(x) for x in cursor.split('.'))
+    if skip < 0:
+        raise ValueError(cursor)
+    return (season, race), skip
+
+
+def parse_limit(value, default=DEFAULT_LIMIT):
+    """?limit= as an int in 1..MAX_LIMIT; ValueError if not a number."""
+    if value in (None, ''):
+        return default
+    return max(1, min(MAX_LIMIT, int(value)))
+
+
+def filter_entries(entries, **fields):
+    """Entries whose given fields equal the given values (None = any)."""
+    wanted = {k: v for k, v in fields.items() if v not in (None, '')}
+    if not wanted:
+        return entries
+    return [e for e in entries if all(e.get(k) == v for k, v in wanted.items())]
+
+
+class KeyIndex:
+    """Entries sorted newest first by entry_key, with a bisectable key list."""
+
+    def __init__(self, entries, key=entry_key):
+        # Stable sort keeps the original order inside one (season, race)
+        self.entries = sorted(entries, key=key, reverse=True)
+        # Negated keys ascend, which is what bisect needs
+        self._keys = [tuple(-x for x in key(e)) for e in self.entries]
+        self._key = key
+
+    def page(self, cursor=None, limit=DEFAULT_LIMIT):
+        """(entries, next_cursor); next_cursor is None on the last page."""
+        start = 0
+        if cursor:
+            key, skip = decode_cursor(cursor)
+            start = bisect.bisect_left(self._keys, tuple(-x for x in key)) + skip
+        items = self.entries[start:start + limit]
+        end = start + len(items)
+        if end >= len(self.entries) or not items:
+            return items, None
+        last = self._key(items[-1])
+        first_of_group = bisect.bisect_left(self._keys, tuple(-x for x in last))
+        return items, encode_cursor(last, end - first_of_group)
+
+
+class IndexCache:
+    """KeyIndex per (revision, list, filters)."""
+
+    def __init__(self, max_indexes=MAX_INDEXES):
+        self._indexes = OrderedDict()
+        self._max = max_indexes
+        self._lock = threading.Lock()
+
+    def get(self, revision, name, filters, load):
+        """Index of list *name* filtered by *filters* at *revision*.
+
+        load() → (revision, entries) is only called on a miss; the index is
+        stored under the revision load() reports, which is newer than
+        *revision* if a save happened in between.
+        """
+        frozen = tuple(sorted((k, v) for k, v in filters.items() if v not in (None, '')))
+        with self._lock:
+            index = self._indexes.get((revision, name, frozen))
+            if index is not None:
+                self._indexes.move_to_end((revision, name, frozen))
+                return index
+        loaded_revision, entries = load()
+        index = KeyIndex(filter_entries(entries, **filters))
+        with self._lock:
+            self._indexes[(loaded_revision, name, frozen)] = index
+            while len(self._indexes) > self._max:
+                self._indexes.popitem(last=False)
+        return index
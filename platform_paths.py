@@ -83,13 +83,44 @@ def _looks_like_ac_install(path: str) -> bool:
     return bool(path) and os.path.isfile(os.path.join(path, "acs.exe"))
 
 
+# Parsed libraryfolders.vdf results, reused until one of the files changes.
+# get_ac_docs_path() runs on every results poll; without this each call
+# re-reads and regex-parses the vdf of every Steam root.
+_library_cache: dict = {"sig": None, "roots": []}
+
+
+def _vdf_signature(steam_roots: List[str]) -> tuple:
+    sig = []
+    for steam_root in steam_roots:
+        try:
+            sig.append(os.stat(os.path.join(steam_root, "steamapps", "libraryfolders.vdf")).st_mtime_ns)
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
 def _linux_library_roots() -> List[str]:
+    sig = _vdf_signature(_STEAM_ROOTS)
+    if _library_cache["sig"] == sig:
+        return list(_library_cache["roots"])
     roots: List[str] = []
     for steam_root in _STEAM_ROOTS:
         roots.append(steam_root)  # default Steam library lives under Steam root
         vdf = os.path.join(steam_root, "steamapps", "libraryfolders.vdf")
         roots.extend(_parse_steam_libraries(vdf))
-    return _dedupe_keep_order(roots)
+    roots = _dedupe_keep_order(roots)
+    _library_cache.update(sig=sig, roots=roots)
+    return list(roots)
+
+
+def clear_path_caches() -> None:
+    """Forget parsed Steam library folders (next lookup re-reads the vdf files)."""
+    _library_cache.update(sig=None, roots=[])
+
+
+def steam_library_roots() -> List[str]:
+    """Steam library folders for this OS (Steam roots + libraryfolders.vdf)."""
+    return _linux_library_roots() if is_linux() else _windows_library_roots()
 
 
 def _windows_steam_roots() -> List[str]:
@@ -0,0 +1,284 @@
+"""
+Race Config — compiles AC's race.ini from precomputed tables.
+
+Writing race.ini used to rebuild everything per launch and per car: the
+rival set from career_data['rivalries'] inside the car loop, a profile
+lookup for every AI driver, team-development ballast,
+and a long list of string lines.
+
+RaceConfigCompiler splits the work in two:
+
+  DriverTable      per (career revision, tier): every driver's effective
+                   race / qualifying / blend skill offsets, wet / night
+                   skill, track preference, form, AI_LEVEL variance,
+                   aggression (consistency and rivalry boosts applied) and
+                   nationality, plus per-team ballast.
+  session blocks   static [SESSION_n] / [GROOVE] templates formatted once
+                   per launch.
+
+compile() then only applies the per-race factors (AI level, weather, night
+weight, track type) and joins the blocks.  The output is identical to the
+previous line-by-line writer given the same RNG.
+
+Benchmark: python tools/bench_race_config.py
+"""
+
+import random
+import threading
+from collections import OrderedDict
+
+from driver_data import TRACK_PREFERENCES
+
+# Tables kept in memory (one per tier the player launched in recently).
+MAX_TABLES = 4
+
+WET_PRESETS = {'rainy', 'heavy_rain', 'wet', 'light_rain', 'drizzle', 'stormy', 'overcast_wet'}
+
+_PRACTICE = ("[SESSION_{n}]\nNAME=PRACTICE\nTYPE=1\nSPAWN_SET=PIT\n"
+             "DURATION_MINUTES={practice}\nLAPS=0\n")
+_QUALIFY  = ("[SESSION_{n}]\nNAME=QUALIFY\nTYPE=2\nSPAWN_SET=PIT\n"
+             "DURATION_MINUTES={quali}\nLAPS=0\n")
+_RACE     = ("[SESSION_{n}]\nNAME=RACE\nTYPE=3\nSPAWN_SET=START\n"
+             "LAPS={laps}\nDURATION_MINUTES=0\n")
+
+# Session blocks by session_type (split weekend) or mode
+SESSION_TEMPLATES = {
+    'practice':     [_PRACTICE],
+    'qualifying':   [_QUALIFY],
+    'race':         [_RACE],
+    'full_weekend': [_PRACTICE, _QUALIFY, _RACE],
+    'race_only':    [_RACE],
+}
+
+HEADER_BLOCK = "[HEADER]\nVERSION=2\n"
+GROOVE_BLOCK = "[GROOVE]\nVIRTUAL_LAPS=10\nMAX_LAPS=30\nSTARTING_LAPS=0\n"
+
+
+class DriverParams:
+    """AI parameters of one driver, independent of the race being written."""
+
+    __slots__ = ('nation', 's_off', 'wet_adj', 'night_skill', 'pref', 'form_adj',
+                 'dvar', 'aggression')
+
+    def __init__(self, profile, form_score, base_variance, rival):
+        self.nation = profile['nationality']
+        skill = float(profile['skill'])
+        quali = float(profile.get('quali_pace', 75))
+        self.s_off = {
+            'race':       int((skill - 80) * 0.2),
+            'qualifying': int((quali - 80) * 0.2),
+            'blend':      int(((profile['skill'] + profile.get('quali_pace', 75)) / 2 - 80) * 0.2),
+        }
+        self.wet_adj     = round((profile.get('wet_skill', 60) - 50) * 0.08)
+        self.night_skill = profile.get('night_skill', 60)
+        self.pref        = None     # set by DriverTable (depends on the raced name)
+        self.form_adj    = int(form_score * 2.5)
+        cons             = profile.get('consistency', 75)
+        self.dvar        = min(base_variance * (1 + (50 - cons) / 50), 1.5)
+        aggression = profile['aggression']
+        if cons < 50:
+            aggression = min(100, aggression + int((50 - cons) * 0.3))
+        # Rivalry aggression boost (+5 for active rivals)
+        if rival:
+            aggression = min(100, aggression + 5)
+        self.aggression = aggression
+
+    def ai_level(self, ai_lvl, skill_mode, is_wet, night_weight, track_type, rng):
+        n_adj = round((self.night_skill - 60) * 0.12 * night_weight)
+        # Track affinity: +1 on preferred track type, -1 on mismatched
+        if track_type != 'balanced' and self.pref != 'balanced':
+            t_adj = 1 if self.pref == track_type else -1
+        else:
+            t_adj = 0
+        v_adj = rng.uniform(-self.dvar, self.dvar)
+        w_adj = self.wet_adj if is_wet else 0
+        return max(50, min(100, int(ai_lvl + self.s_off[skill_mode] + w_adj + n_adj
+                                    + t_adj + self.form_adj + v_adj)))
+
+
+class DriverTable:
+    """Per-career driver / team parameters for one tier."""
+
+    def __init__(self, career, career_data, tier_key):
+        self.career = career
+        self.career_data = career_data
+        self.base_variance = career.config.get('difficulty', {}).get('ai_level_variance', 1.5)
+        self.form_scores = career_data.get('form_scores', {})
+        self.rivals = set()
+        for r in career_data.get('rivalries', {}).get(tier_key, []):
+            if r.get('intensity', 0) >= 3:
+                self.rivals.update(r['drivers'])
+        self.ballast = {
+            team: max(0, int(-dev.get('rating_offset', 0) * 10))
+            for team, dev in (career_data.get('team_development') or {}).items()
+        }
+        self._drivers = {}
+
+    def driver(self, name):
+        params = self._drivers.get(name)
+        if params is None:
+            profile = self.career.profile_view(name, career_data=self.career_data)
+            params = DriverParams(profile, self.form_scores.get(name, 0),
+                                  self.base_variance, name in self.rivals)
+            params.pref = TRACK_PREFERENCES.get(name, 'balanced')
+            self._drivers[name] = params
+        return params
+
+    def team_ballast(self, team):
+        # +0.5 rating → -5kg ballast (faster); -0.5 → +5kg (slower)
+        return self.ballast.get(team, 0)
+
+
+class RaceConfigCompiler:
+    def __init__(self, career):
+        self.career = career
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def table(self, career_data):
+        """DriverTable for the career's current tier, cached per save revision
+        (saves without a revision get a fresh table)."""
+        tier_key = self.career.tiers[career_data.get('tier', 0)]
+        revision = career_data.get('revision')
+        if revision is None:
+            return DriverTable(self.career, career_data, tier_key)
+        key = (revision, tier_key, career_data.get('driver_seed'), career_data.get('season'))
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                return table
+        table = DriverTable(self.career, career_data, tier_key)
+        with self._lock:
+            self._tables[key] = table
+            while len(self._tables) > MAX_TABLES:
+                self._tables.popitem(last=False)
+        return table
+
+    def compile(self, race_data, ac_path='', mode='race_only', career_data=None,
+                session_type=None, grid=None, rng=None):
+        """race.ini text (see CareerManager._write_race_config for the arguments)."""
+        career           = self.career
+        rng              = rng or random
+        career_data      = career_data or {}
+        table            = self.table(career_data)
+        driver           = race_data.get('driver_name', 'Player')
+        player_nation    = career_data.get('player_nationality', '')
+        car              = race_data['car']
+        laps             = race_data['laps']
+        ai_lvl           = int(race_data['ai_difficulty'])
+        opponents        = race_data.get('opponents', [])
+        weather          = race_data.get('weather', '3_clear')
+
+        # Limit to 19 AI cars (20 total including player)
+        ai_cars = opponents[:19]
+        # When grid is provided its length is exact; otherwise ai_cars already contains
+        # the right number of slots (player replaces their own team's AI entry).
+        total_cars = len(grid) if grid else len(ai_cars)
+
+        # Track can be "folder/layout" or just "folder"
+        track_raw    = race_data['track']
+        parts        = track_raw.split('/')
+        track_folder = parts[0]
+        config_track = parts[1] if len(parts) > 1 else ''
+
+        # Player gets skin index 0; AI cars get 1, 2, 3… so each has a distinct livery
+        skin = race_data.get('skin')
+        if skin is None:
+            skin = career._get_car_skin(car, ac_path, index=0) if ac_path else ''
+
+        race_lines = [
+            "[RACE]",
+            f"TRACK={track_folder}",
+            f"CONFIG_TRACK={config_track}",
+            f"MODEL={car}",
+            "MODEL_CONFIG=",
+            f"SKIN={skin}",
+            "PENALTIES=1",
+            "FIXED_SETUP=0",
+            "DRIFT_MODE=0",
+            f"RACE_LAPS={laps}",
+            f"CARS={total_cars}",
+            f"AI_LEVEL={ai_lvl}",
+            "JUMP_START_PENALTY=0",
+            f"WEATHER_0={weather}",
+        ]
+        if race_data.get('sun_angle') is not None:
+            race_lines.append(f"SUN_ANGLE={race_data['sun_angle']}")
+        if race_data.get('time_of_day_mult') is not None:
+            race_lines.append(f"TIME_OF_DAY_MULT={race_data['time_of_day_mult']}")
+        race_lines.append("")
+
+        # [DRIVE] — AI_LEVEL must be empty; a value tells AC to drive this car.
+        blocks = [
+            "\n".join(race_lines),
+            f"[DRIVE]\nMODEL={car}\nSKIN={skin}\nMODEL_CONFIG=\nAI_LEVEL=\nAI_AGGRESSION=0\n"
+            f"SETUP=\nFIXED_SETUP=0\nVIRTUAL_MIRROR=0\nDRIVER_NAME={driver}\n"
+            f"NATIONALITY={player_nation}\n",
+            HEADER_BLOCK,
+        ]
+        templates = SESSION_TEMPLATES.get(session_type) or SESSION_TEMPLATES.get(mode) \
+            or SESSION_TEMPLATES['race_only']
+        fmt = {'practice': race_data.get('practice_minutes', 10),
+               'quali':    race_data.get('quali_minutes', 10),
+               'laps':     laps}
+        blocks += [t.format(n=n, **fmt) for n, t in enumerate(templates)]
+        blocks.append(GROOVE_BLOCK)
+
+        is_wet = weather.lower() in WET_PRESETS
+        sun_angle = race_data.get('sun_angle')
+        time_mult = race_data.get('time_of_day_mult') or 1
+        if time_mult > 1:
+            night_weight = 0.5   # endurance: ~half the race in darkness
+        elif sun_angle is not None and sun_angle < -30:
+            night_weight = 1.0   # explicit night race
+        else:
+            night_weight = 0.0
+
+        # Success ballast: each P1 in the last 3 races adds 5 kg
+        recent = career_data.get('race_results', [])[-3:]
+        player_ballast = sum(5 for r in recent if r.get('position') == 1)
+
+        track_type = career.TRACK_TYPE.get(track_raw, 'balanced')
+        if session_type == 'qualifying':
+            skill_mode = 'qualifying'
+        elif mode == 'full_weekend':
+            skill_mode = 'blend'
+        else:
+            skill_mode = 'race'
+
+        # Player is CAR_0 (MODEL=-); AI follow in grid order, or in field order
+        # without the player's own team slot.
+        opp_by_name = {(opp.get('driver_name') or ''): opp for opp in ai_cars}
+        player_team = career_data.get('team')
+        if grid:
+            ai_order = [
+                opp_by_name.get(g['name'], {'car': g.get('car', car), 'driver_name': g['name']})
+                for g in grid if not g.get('is_player')
+            ]
+        else:
+            ai_order = [opp for opp in ai_cars
+                        if not (player_team and opp.get('team') == player_team)]
+
+        blocks.append(
+            f"[CAR_0]\nSETUP=\nSKIN={skin}\nMODEL=-\nMODEL_CONFIG=\nBALLAST={player_ballast}\n"
+            f"RESTRICTOR=0\nDRIVER_NAME={driver}\nNATIONALITY={player_nation}\n")
+        driver_lower = driver.lower()
+        for i, opp in enumerate(ai_order, start=1):
+            opp_car  = opp.get('car', car)
+            opp_skin = opp.get('skin')
+            if opp_skin is None:
+                opp_skin = career._get_car_skin(opp_car, ac_path, index=i) if ac_path else ''
+            name = opp.get('driver_name') or career.DRIVER_NAMES[i % len(career.DRIVER_NAMES)]
+            # An AI sharing the player's name would be matched as the player's result
+            if name.lower() == driver_lower:
+                name = name + ' II'
+            params = table.driver(name)
+            level  = params.ai_level(ai_lvl, skill_mode, is_wet, night_weight, track_type, rng)
+            blocks.append(
+                f"[CAR_{i}]\nMODEL={opp_car}\nSKIN={opp_skin}\nMODEL_CONFIG=\n"
+                f"DRIVER_NAME={name}\nNATION_CODE={params.nation}\nAI_LEVEL={level}\n"
+                f"AI_AGGRESSION={params.aggression}\nSETUP=\n"
+                f"BALLAST={table.team_ballast(opp.get('team', ''))}\nRESTRICTOR=0\n")
+
+        return "\n".join(blocks)
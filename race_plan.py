@@ -0,0 +1,112 @@
+"""
+Race Plan — one deterministic plan per upcoming race.
+
+/api/next-race (preview), the preflight check, /api/start-race (launch) and
+the debrief all need the same race: track, laps, weather, AI difficulty, the
+opponent field, the simulated qualifying grid and the skins each car runs.
+Generating it with the global random module meant the previewed race was not
+the one that launched, and every caller did the work again.
+
+RacePlanner builds the plan once with a random.Random seeded from the
+career (driver seed, season, tier, race number), so regenerating it always
+yields the same race.  Plans are cached per (career revision, race number,
+AC path, content-index revision): the revision bumps on every save, so a
+settings change (weather mode, AI offset…) produces a fresh plan.
+
+Plans are shared between requests — treat them as read-only.
+"""
+
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+
+# Plans kept in memory; only the next race is normally asked for.
+MAX_PLANS = 8
+
+
+def plan_seed(career_data, tier_key, race_num):
+    key = (f"race_plan|{career_data.get('driver_seed') or 0}|{career_data.get('season', 1)}"
+           f"|{tier_key}|{race_num}")
+    return int(hashlib.md5(key.encode()).hexdigest()[:8], 16)
+
+
+class RacePlanner:
+    def __init__(self, career):
+        self.career = career
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def plan(self, career_data, tier_key, tier_info, ac_path='', content_revision=None):
+        """Plan for the player's next race (races_completed + 1).
+
+        tier_info: effective tier info (custom track list already applied).
+        Returns {key, seed, race, quali_grid, grid_position}; 'race' has the
+        same shape as CareerManager.generate_race() plus driver_name and the
+        resolved player 'skin' (opponents carry their own 'skin').
+        """
+        race_num = career_data['races_completed'] + 1
+        key = (career_data.get('revision', 0), race_num, career_data.get('season', 1),
+               tier_key, ac_path, content_revision)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = self._build(career_data, tier_key, tier_info, race_num, ac_path)
+        plan['key'] = list(key)
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > MAX_PLANS:
+                self._plans.popitem(last=False)
+        return plan
+
+    def launch_rng(self, plan, mode, session_type=None):
+        """Seeded RNG for race.ini AI_LEVEL variance — stable per launch mode."""
+        return random.Random(f"{plan['seed']}|{mode}|{session_type or ''}")
+
+    def _build(self, career_data, tier_key, tier_info, race_num, ac_path):
+        career = self.career
+        seed = plan_seed(career_data, tier_key, race_num)
+        rng = random.Random(seed)
+        cs = career_data.get('career_settings') or {}
+        weather_mode = cs.get('weather_mode', 'realistic')
+        if not cs.get('dynamic_weather', True):
+            weather_mode = 'always_clear'
+
+        race = career.generate_race(tier_info, race_num, career_data['team'], career_data['car'],
+                                    tier_key=tier_key, season=career_data.get('season', 1),
+                                    weather_mode=weather_mode,
+                                    night_cycle=cs.get('night_cycle', True),
+                                    career_data=career_data, rng=rng)
+        ai_offset = cs.get('ai_offset', 0)
+        if ai_offset:
+            race['ai_difficulty'] = max(60, min(100, race['ai_difficulty'] + ai_offset))
+        race['driver_name'] = career_data.get('driver_name', 'Player')
+
+        # The player always starts P1 in Race Only mode (AC constraint: player =
+        # CAR_0 = P1); the simulated grid orders the AI and feeds the debrief.
+        quali_grid = career.simulate_qualifying(race['opponents'], int(race['ai_difficulty']),
+                                                career_data=career_data, rng=rng)
+
+        # Skins in race.ini order: player index 0, AI 1, 2, 3… in grid order
+        race['skin'] = career._get_car_skin(race['car'], ac_path, index=0) if ac_path else ''
+        by_name = {(o.get('driver_name') or ''): o for o in race['opponents']}
+        skin_index = 1
+        for g in quali_grid:
+            if g.get('is_player'):
+                continue
+            opp = by_name.get(g['name'])
+            if opp is not None:
+                opp['skin'] = (career._get_car_skin(opp['car'], ac_path, index=skin_index)
+                               if ac_path else '')
+            skin_index += 1
+
+        grid_position = next((g['position'] for g in quali_grid if g.get('is_player')), None)
+        return {
+            'seed':          seed,
+            'race':          race,
+            'quali_grid':    quali_grid,
+            'grid_position': grid_position,
+        }
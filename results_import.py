@@ -0,0 +1,308 @@
+"""
+Results Import — bulk ingest of historical Assetto Corsa results folders.
+
+Players often have hundreds of result files from races run before this tool
+(or from older installs).  import_results() lists a folder, skips files that
+an earlier import already scanned (ImportLedger) or that are in the lap
+archive, parses the rest in a worker pool
+(ac_results.summarise_file) and feeds race sessions driven by the player into
+the lap archive in batches.  Career-level stats for those races are returned
+so the caller can merge them into the save (merge_import_stats).
+
+Imported races are archived with season 0 and tier 'imported' so they never
+mix with career seasons in the lap-archive queries.
+
+CLI:
+    python results_import.py "<Documents>/Assetto Corsa/results" [--driver NAME] [--processes]
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from ac_results import result_key, summarise_file
+from career_state import atomic_write
+
+# Races appended to the lap archive per index rewrite.
+BATCH_SIZE = 50
+
+IMPORT_SEASON = 0
+IMPORT_TIER   = 'imported'
+
+
+def list_result_files(folder):
+    """[(path, mtime)] of every *.json in *folder*, oldest first."""
+    files = []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.lower().endswith('.json') and entry.is_file():
+                    try:
+                        files.append((entry.path, entry.stat().st_mtime))
+                    except OSError:
+                        continue
+    except OSError:
+        return []
+    files.sort(key=lambda f: f[1])
+    return files
+
+
+class ImportLedger:
+    """Every result file an import has scanned, with what came of it.
+
+    Most of a results folder is practice and qualifying sessions, races
+    without the player and unreadable files; none of those reach the lap
+    archive, so without the ledger every import would parse them again.
+
+    status per result_key: 'imported' | 'archived' (race already in the lap
+    archive) | 'no_laps' | 'not_race' | 'no_player' | 'unknown' | 'error'.
+    'no_player' files are scanned again when an import looks for a driver
+    name the previous scan did not.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            data = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if not isinstance(data, dict) or not isinstance(data.get('files'), dict):
+                data = {'names': [], 'files': {}}
+            self._data = data
+        return self._data
+
+    def known(self, names):
+        """Set of result keys an import for *names* can skip."""
+        data = self._load()
+        rescan = not {n.casefold() for n in names} <= set(data.get('names') or [])
+        return {key for key, status in data['files'].items()
+                if not (rescan and status == 'no_player')}
+
+    def record(self, key, status):
+        self._load()['files'][key] = status
+
+    def save(self, names=None):
+        """Persist; *names* are the driver names the scan looked for."""
+        data = self._load()
+        if names is not None:
+            data['names'] = sorted({n.casefold() for n in names})
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        atomic_write(self.path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+
+def _empty_stats():
+    return {
+        'races':        0,
+        'wins':         0,
+        'podiums':      0,
+        'position_sum': 0,
+        'laps':         0,
+        'best_laps':    {},     # "track|car" → best lap ms
+    }
+
+
+def _add_race_stats(stats, summary):
+    pos = summary.get('position') or 0
+    stats['races'] += 1
+    stats['position_sum'] += pos
+    if pos == 1:
+        stats['wins'] += 1
+    if 1 <= pos <= 3:
+        stats['podiums'] += 1
+    stats['laps'] += int(summary.get('laps_done') or 0)
+    best = int(summary.get('best_lap') or 0)
+    if best > 0:
+        bkey = f"{summary.get('track', '')}|{summary.get('car', '')}"
+        prev = stats['best_laps'].get(bkey)
+        if prev is None or best < prev:
+            stats['best_laps'][bkey] = best
+
+
+def _archive_entry(summary, driver_name):
+    """lap_archive.append_races() entry; player laps renamed to *driver_name*
+    so aliases used in older results still count as the player."""
+    alias = (summary.get('driver') or '').lower()
+    laps = summary.get('laps') or []
+    if alias and alias != driver_name.lower():
+        laps = [dict(l, DriverName=driver_name)
+                if (l.get('DriverName') or '').lower() == alias else l
+                for l in laps]
+    return {
+        'key':         summary['key'],
+        'laps':        laps,
+        'track':       summary.get('track', ''),
+        'car':         summary.get('car', ''),
+        'season':      IMPORT_SEASON,
+        'tier':        IMPORT_TIER,
+        'race_num':    0,
+        'player_name': driver_name,
+    }
+
+
+def import_results(folder, archive, driver_name, aliases=(), workers=None,
+                   processes=False, progress=None, ledger=None, career_start=None):
+    """Import every result file in *folder* into *archive*.
+
+    driver_name: career driver name (laps are archived under this name).
+    aliases:     other names the player raced under in older results.
+    ledger:      optional ImportLedger; files it lists are skipped and every
+                 file scanned is recorded in it.
+    career_start: epoch seconds the career started; files written since are
+                 career races (already in the save) and are skipped.
+    processes:   parse in a process pool instead of threads (CLI use; JSON
+                 decoding is CPU-bound so this scales past the GIL).
+    progress:    optional callable(**counters), called as files complete.
+
+    Returns a summary dict including 'stats' for merge_import_stats().
+    """
+    names  = [driver_name] + [a for a in aliases if a]
+    files  = list_result_files(folder)
+    listed = len(files)
+    if career_start is not None:
+        files = [f for f in files if f[1] < career_start]
+    known  = archive.keys()
+    if ledger is not None:
+        known |= ledger.known(names)
+    todo   = [(path, key) for path, key in
+              ((path, result_key(path, mtime)) for path, mtime in files)
+              if key not in known]
+    report = {
+        'folder':        folder,
+        'files':         listed,
+        'already_known': len(files) - len(todo),
+        'career_files':  listed - len(files),
+        'parsed':        0,
+        'errors':        0,
+        'sessions':      {},
+        'player_sessions': 0,
+        'races_imported':  0,
+        'stats':         _empty_stats(),
+    }
+    if progress:
+        progress(stage='parsing', done=0, total=len(todo))
+
+    pending = []
+
+    def record(key, status):
+        if ledger is not None:
+            ledger.record(key, status)
+
+    def flush():
+        if not pending:
+            return
+        ids = archive.append_races([_archive_entry(s, driver_name) for s in pending])
+        for summary, race_id in zip(pending, ids):
+            if race_id is not None:
+                report['races_imported'] += 1
+                _add_race_stats(report['stats'], summary)
+            record(summary['key'], 'imported' if race_id is not None else 'archived')
+        pending.clear()
+        if ledger is not None:
+            ledger.save()
+
+    workers = workers or min(8, (os.cpu_count() or 2))
+    pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    parse = partial(summarise_file, driver_names=names)
+    with pool_cls(max_workers=workers) as pool:
+        chunk = 16 if processes else 1
+        summaries = pool.map(parse, [path for path, _ in todo], chunksize=chunk)
+        for i, ((_, key), summary) in enumerate(zip(todo, summaries), start=1):
+            if summary['status'] != 'ok':
+                report['errors'] += summary['status'] == 'error'
+                record(key, summary['status'])
+            else:
+                report['parsed'] += 1
+                stype = summary['type'] or 'UNKNOWN'
+                report['sessions'][stype] = report['sessions'].get(stype, 0) + 1
+                if not summary.get('position'):
+                    record(key, 'no_player')
+                elif stype != 'RACE':
+                    report['player_sessions'] += 1
+                    record(key, 'not_race')
+                elif not summary.get('laps'):
+                    report['player_sessions'] += 1
+                    record(key, 'no_laps')
+                else:
+                    report['player_sessions'] += 1
+                    pending.append(summary)
+                    if len(pending) >= BATCH_SIZE:
+                        flush()
+            if progress and (i % 10 == 0 or i == len(todo)):
+                progress(done=i, imported=report['races_imported'] + len(pending))
+    flush()
+    if ledger is not None:
+        ledger.save(names)
+    if progress:
+        progress(stage='done', done=len(todo), imported=report['races_imported'])
+    return report
+
+
+def merge_import_stats(career_data, stats):
+    """Fold an import's race stats into career_data['imported_stats']."""
+    total = career_data.get('imported_stats') or _empty_stats()
+    for k in ('races', 'wins', 'podiums', 'position_sum', 'laps'):
+        total[k] = total.get(k, 0) + stats.get(k, 0)
+    best = total.setdefault('best_laps', {})
+    for bkey, ms in stats.get('best_laps', {}).items():
+        if bkey not in best or ms < best[bkey]:
+            best[bkey] = ms
+    career_data['imported_stats'] = total
+    return total
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Import historical AC results into the career.')
+    parser.add_argument('folder', help='AC results folder (Documents/Assetto Corsa/results)')
+    parser.add_argument('--driver', action='append', default=[],
+                        help='extra driver name(s) you raced under (the career name is always used)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--processes', action='store_true',
+                        help='parse with a process pool instead of threads')
+    parser.add_argument('--no-stats', action='store_true',
+                        help='only fill the lap archive, leave the career save untouched')
+    args = parser.parse_args(argv)
+
+    # Deferred: app pulls in Flask; only needed for the save + archive paths.
+    from app import (IMPORT_LEDGER_PATH, career_start_time, career_state, lap_archive,
+                     load_career_data)
+
+    career_data = load_career_data()
+    if not career_data.get('driver_name'):
+        print('No career found — start a career in the app first.')
+        return 1
+    driver_name = career_data.get('driver_name', 'Player')
+
+    def show(**p):
+        if 'total' in p:
+            show.total = p['total']
+        if 'done' in p:
+            print(f"\r  {p['done']}/{getattr(show, 'total', '?')} files", end='', flush=True)
+
+    report = import_results(args.folder, lap_archive, driver_name, aliases=args.driver,
+                            workers=args.workers, processes=args.processes, progress=show,
+                            ledger=ImportLedger(IMPORT_LEDGER_PATH),
+                            career_start=career_start_time(career_data))
+    print()
+    if not args.no_stats and report['races_imported']:
+        with career_state.transaction() as career_data:
+            merge_import_stats(career_data, report['stats'])
+    print(f"{report['files']} files · {report['already_known']} already imported · "
+          f"{report['career_files']} from this career · "
+          f"{report['errors']} unreadable · sessions {report['sessions']}")
+    print(f"{report['player_sessions']} sessions as {driver_name} · "
+          f"{report['races_imported']} races added to the lap archive")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
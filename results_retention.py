@@ -0,0 +1,217 @@
+"""
+Results Retention — compressed archival of raw AC result files.
+
+AC never cleans up Documents/Assetto Corsa/results/, and read_race_result
+lists + stats that folder on every poll.  Once a race has been ingested into
+the career, ResultsRetention moves its result file into a per-season zip
+(<user data dir>/results_archive/season_<n>.zip, deflate-compressed) and
+records it in a JSON index, so the debrief can be regenerated later.
+
+A policy from config.json bounds the live folder:
+
+    "retention": {"enabled": false, "max_live_files": 50, "max_live_mb": 20}
+
+When enabled, the oldest remaining files (practice / qualifying sessions,
+races from before the career) are swept into the archive as well until the
+folder is within both limits; a limit of 0 means no limit.  Files older than
+the career go to pre_career.zip rather than the current season's zip.
+Nothing is deleted without first being written to a zip.  out/race_out.json is rewritten by Content Manager every
+session, so it is copied rather than moved.
+"""
+
+import json
+import os
+import threading
+import time
+import zipfile
+
+from ac_results import result_key
+
+_INDEX_FILE = 'index.json'
+
+DEFAULT_POLICY = {'enabled': False, 'max_live_files': 50, 'max_live_mb': 20}
+
+PRE_CAREER_ZIP = 'pre_career.zip'
+
+
+def retention_policy(cfg):
+    """config.json 'retention' block merged over DEFAULT_POLICY."""
+    policy = dict(DEFAULT_POLICY)
+    policy.update((cfg or {}).get('retention') or {})
+    return policy
+
+
+class ResultsRetention:
+    def __init__(self, directory):
+        self.directory = directory
+        self._index = None
+        self._lock = threading.Lock()
+
+    # ── index ────────────────────────────────────────────────────────────────
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        index = {'files': {}}
+        path = os.path.join(self.directory, _INDEX_FILE)
+        if os.path.isfile(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if isinstance(loaded.get('files'), dict):
+                    index = loaded
+            except (OSError, ValueError):
+                pass
+        self._index = index
+        return index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, _INDEX_FILE)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    # ── archiving ────────────────────────────────────────────────────────────
+
+    def _store(self, index, path, season, meta, move):
+        """Write *path* into season_<n>.zip (PRE_CAREER_ZIP for season None)
+        and index it.  Caller holds the lock."""
+        mtime = os.path.getmtime(path)
+        key = result_key(path, mtime)
+        if key in index['files']:
+            if move:
+                os.remove(path)
+            return key
+        base = os.path.basename(path)
+        if base == 'race_out.json':
+            base = f'race_out_{int(mtime)}.json'
+        zip_name = f'season_{season}.zip' if season is not None else PRE_CAREER_ZIP
+        os.makedirs(self.directory, exist_ok=True)
+        with zipfile.ZipFile(os.path.join(self.directory, zip_name), 'a',
+                             compression=zipfile.ZIP_DEFLATED,
+                             strict_timestamps=False) as zf:
+            member = base
+            n = 1
+            existing = set(zf.namelist())
+            while member in existing:
+                n += 1
+                member = f'{n}_{base}'
+            zf.write(path, member)
+        entry = {
+            'zip':         zip_name,
+            'member':      member,
+            'season':      season,
+            'size':        os.path.getsize(path),
+            'mtime':       int(mtime),
+            'archived_at': int(time.time()),
+        }
+        entry.update(meta or {})
+        index['files'][key] = entry
+        if move:
+            os.remove(path)
+        return key
+
+    def archive_race(self, path, season, race_num=None, tier='', track='', driver='',
+                     move=None):
+        """Archive the result file of an ingested career race.
+
+        results/*.json files are moved; race_out.json is copied (move=False
+        copies any file).  Returns the index key, or None if the file is gone.
+        """
+        if not path or not os.path.isfile(path):
+            return None
+        if move is None:
+            move = os.path.basename(path) != 'race_out.json'
+        meta = {'kind': 'race', 'race_num': race_num, 'tier': tier,
+                'track': track, 'driver': driver}
+        with self._lock:
+            index = self._load_index()
+            key = self._store(index, path, season, meta, move)
+            self._save_index()
+        return key
+
+    def _first_race_mtime(self, index):
+        times = [e['mtime'] for e in index['files'].values() if e.get('kind') == 'race']
+        return min(times) if times else None
+
+    def enforce_policy(self, folder, policy, season, career_start=None):
+        """Sweep the oldest files out of *folder* until it is within policy.
+
+        career_start: timestamp the career began; older files are filed in
+        PRE_CAREER_ZIP.  Defaults to the first archived career race.
+        Returns the number of files archived.
+        """
+        if not policy.get('enabled'):
+            return 0
+        # 0 (or missing) = no limit, for both
+        max_files = max(0, int(policy.get('max_live_files') or 0))
+        max_bytes = max(0, float(policy.get('max_live_mb') or 0)) * 1024 * 1024
+        if not max_files and not max_bytes:
+            return 0
+        files = []
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.lower().endswith('.json') and entry.is_file():
+                        st = entry.stat()
+                        files.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            return 0
+        files.sort()
+        total = sum(f[1] for f in files)
+        count = len(files)
+        swept = 0
+        with self._lock:
+            index = self._load_index()
+            if career_start is None:
+                career_start = self._first_race_mtime(index)
+            for mtime, size, path in files:
+                if ((not max_files or count <= max_files)
+                        and (not max_bytes or total <= max_bytes)):
+                    break
+                pre_career = career_start is not None and int(mtime) < career_start
+                try:
+                    self._store(index, path, None if pre_career else season,
+                                {'kind': 'swept'}, move=True)
+                except (OSError, ValueError, zipfile.BadZipFile) as e:
+                    print(f"Warning: could not archive {path}: {e}")
+                    continue
+                count -= 1
+                total -= size
+                swept += 1
+            if swept:
+                self._save_index()
+        return swept
+
+    # ── lookup ───────────────────────────────────────────────────────────────
+
+    def list(self, season=None):
+        """Index entries (newest first), optionally for one season."""
+        with self._lock:
+            files = self._load_index()['files']
+            rows = [dict(v, key=k) for k, v in files.items()
+                    if season is None or v.get('season') == season]
+        rows.sort(key=lambda r: r.get('mtime', 0), reverse=True)
+        return rows
+
+    def find_race(self, season, race_num):
+        """Index entry of an archived career race, or None."""
+        for row in self.list(season):
+            if row.get('kind') == 'race' and row.get('race_num') == race_num:
+                return row
+        return None
+
+    def read(self, key):
+        """Parsed JSON of an archived file, or None."""
+        with self._lock:
+            entry = self._load_index()['files'].get(key)
+        if entry is None:
+            return None
+        try:
+            with zipfile.ZipFile(os.path.join(self.directory, entry['zip'])) as zf:
+                with zf.open(entry['member']) as f:
+                    return json.loads(f.read().decode('utf-8'))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
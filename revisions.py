@@ -0,0 +1,139 @@
+"""
+Revisions — cheap "has anything changed?" checks for read endpoints.
+
+Every career save carries a monotonically increasing 'revision'.
+RevisionTracker knows the revision of the save file on disk without decoding
+it: it remembers the file's stat signature (mtime, size, inode) together
+with the revision last written or read, and only falls back to decoding the
+save when the file changed behind its back.  Files without a revision of
+their own (config.json) get an in-process counter bumped whenever their
+signature changes.
+
+ReadCache memoizes response bodies keyed on (endpoint, args, revisions), so
+an unchanged GET is answered without loading or computing anything.
+
+SnapshotStore keeps the last few payloads per section and delta token, the
+bases /api/dashboard?since= diffs against (json_patch.py).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Response bodies kept in memory
+MAX_BODIES = 256
+# Snapshots kept per delta section (a client more than this many changes
+# behind gets the full payload)
+MAX_SNAPSHOTS = 8
+
+
+def _file_sig(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class RevisionTracker:
+    def __init__(self, path, read_revision=None):
+        """read_revision(): revision stored inside the file (None → counter)."""
+        self.path = path
+        self._read_revision = read_revision
+        self._lock = threading.Lock()
+        self._sig = None
+        self._revision = 0
+        self._known = False
+
+    def get(self):
+        """Current revision of the file."""
+        sig = _file_sig(self.path)
+        with self._lock:
+            if self._known and sig == self._sig:
+                return self._revision
+        if self._read_revision is not None:
+            revision = int(self._read_revision() or 0) if sig is not None else 0
+        else:
+            revision = None
+        with self._lock:
+            if revision is None:
+                revision = self._revision + (1 if self._known else 0)
+            self._sig, self._revision, self._known = sig, revision, True
+            return revision
+
+    def next_revision(self, current=0):
+        """Revision for the next write: above both *current* and anything
+        seen before, so a new career never reuses an old career's revision."""
+        with self._lock:
+            return max(int(current or 0), self._revision) + 1
+
+    def written(self, revision=None):
+        """Record a write made by this process."""
+        sig = _file_sig(self.path)
+        with self._lock:
+            if revision is None:
+                revision = self._revision + 1
+            self._sig, self._revision, self._known = sig, revision, True
+
+
+class ReadCache:
+    def __init__(self, max_bodies=MAX_BODIES):
+        self._bodies = OrderedDict()
+        self._max = max_bodies
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._bodies.get(key)
+            if hit is not None:
+                self._bodies.move_to_end(key)
+            return hit
+
+    def put(self, key, value):
+        with self._lock:
+            self._bodies[key] = value
+            self._bodies.move_to_end(key)
+            while len(self._bodies) > self._max:
+                self._bodies.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._bodies.clear()
+
+
+def delta_token(career_rev, config_rev, sections):
+    """Key of a set of delta sections ({section: JSON text}): the revisions
+    plus a hash of the sections, which also covers what changes without a
+    save (CSP detection, config-derived values)."""
+    digest = hashlib.sha1()
+    for section, text in sorted(sections.items()):
+        digest.update(f'{section}\0{text}\0'.encode('utf-8'))
+    return f'{career_rev}.{config_rev}.{digest.hexdigest()[:16]}'
+
+
+class SnapshotStore:
+    def __init__(self, max_snapshots=MAX_SNAPSHOTS):
+        self._snapshots = {}     # section -> OrderedDict(token -> payload)
+        self._max = max_snapshots
+        self._lock = threading.Lock()
+
+    def put(self, section, token, text):
+        """Retain the payload with JSON *text* as *section* under *token*;
+        returns the retained copy (JSON-normalized, as a client sees it).
+        A token is only ever bound to one payload: the first one is kept."""
+        with self._lock:
+            tokens = self._snapshots.setdefault(section, OrderedDict())
+            payload = tokens.get(token)
+            if payload is None:
+                payload = tokens[token] = json.loads(text)
+            tokens.move_to_end(token)
+            while len(tokens) > self._max:
+                tokens.popitem(last=False)
+        return payload
+
+    def get(self, section, token):
+        """Retained payload (do not mutate), or None when expired."""
+        with self._lock:
+            return self._snapshots.get(section, {}).get(token)
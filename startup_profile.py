@@ -0,0 +1,47 @@
+"""
+Startup profile — per-phase timing of application start.
+
+Enabled by --startup-profile on the command line (checked on import, since
+most phases run while app.py itself is being imported).  app.py marks the
+end of each phase; report() prints the breakdown to stderr:
+
+    phase                          ms    total
+    flask + stdlib imports       212.4    212.4
+    app modules                   18.9    231.3
+    ...
+
+Times start at the first import of this module, i.e. after the interpreter
+(and, in the frozen build, the PyInstaller bootloader) is up;
+tools/bench_startup.py measures the whole process from outside.
+"""
+
+import sys
+import time
+
+_T0 = time.perf_counter()
+ENABLED = '--startup-profile' in sys.argv
+
+_marks = []
+_reported = False
+
+
+def mark(phase):
+    """End of *phase* (no-op unless --startup-profile)."""
+    if ENABLED:
+        _marks.append((phase, time.perf_counter()))
+
+
+def report(file=None):
+    """Print the breakdown once (later calls are ignored)."""
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    file = file or sys.stderr
+    width = max((len(p) for p, _ in _marks), default=5)
+    print(f"{'phase':{width}s}  {'ms':>8s}  {'total':>8s}", file=file)
+    prev = _T0
+    for phase, t in _marks:
+        print(f'{phase:{width}s}  {(t - prev) * 1000:8.1f}  {(t - _T0) * 1000:8.1f}', file=file)
+        prev = t
+    file.flush()
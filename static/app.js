@@ -5,13 +5,18 @@
 let career        = null;
 let config        = null;
 let standings     = [];
-let allStandings  = {};       // { mx5_cup: [...], gt4: [...], ... }
+let allStandings  = {};       // { mx5_cup: {drivers, teams}, ... } — player tier + tabs opened
 let tierProgress  = {};       // { mx5_cup: {done:5, total:12}, ... }
 let standingsTier = 0;        // currently displayed tier index
 let champMode     = 'drivers'; // 'drivers' | 'teams'
 let calendar      = [];
+let seasonPreflight = null;   // /api/preflight-season (missing tracks / cars)
 let pendingRace   = null;
 let nextRacePreview = null;   // cached /api/next-race result for weather preview
+let standingsData = null;     // raw dashboard standings payload (patch base)
+const tierStandingsCache = {}; // tier_key -> {revision, data} from /api/standings/<tk>
+let dashboardRevision = null; // career revision of career / standingsData
+let dashboardToken = null;    // delta_token of the dashboard sections held
 const THEME_PALETTE_KEY = 'ac-theme-palette';
 
 // ── Track name map ──────────────────────────────────────────────────────────
@@ -107,10 +112,12 @@ document.addEventListener('DOMContentLoaded', async () => {
     const ttThumb = document.querySelector('.tt-thumb');
     if (ttThumb) ttThumb.textContent = savedTheme === 'light' ? '☀️' : '🌙';
 
-    await checkSetup();
-    await Promise.all([loadCareer(), loadConfig()]);
-    await Promise.all([loadAllStandings(), loadCalendar()]);
-    loadNextRacePreview().then(() => renderCalendar());
+    const setupChanged = await checkSetup();
+    // The server embeds the dashboard payload in the page; refetch only when
+    // setup just changed the AC path it was built with.
+    const boot = _takeDashboardBootstrap();
+    if (boot && !setupChanged) applyDashboard(boot);
+    else await loadDashboard();
     refresh();
     loadNewsTicker();
     showView('main');
@@ -125,42 +132,133 @@ document.addEventListener('DOMContentLoaded', async () => {
     }
 });
 
-// ── Data loaders ───────────────────────────────────────────────────────────
-async function loadCareer() {
-    try {
-        const r = await fetch('/api/career-status');
-        career  = await r.json();
-    } catch (e) { console.error('loadCareer', e); }
+// ── Career writes ──────────────────────────────────────────────────────────
+// POST to an endpoint that saves the career.  A 409 with code 'stale_write'
+// means another request saved first and nothing was written: reload the
+// career and send the request again (the server applies it to the current
+// save).
+async function postCareer(url, body, retries = 2) {
+    const opts = {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body || {}),
+    };
+    for (let attempt = 0; ; attempt++) {
+        const r = await fetch(url, opts);
+        if (r.status !== 409 || attempt >= retries) return r;
+        const d = await r.clone().json().catch(() => ({}));
+        if (d.code !== 'stale_write') return r;
+        await loadDashboard(['career']);
+    }
 }
-async function loadConfig() {
+
+// ── Data loaders ───────────────────────────────────────────────────────────
+// One request (one save decode) for everything the main view shows.
+// fields: subset of career, config, standings, calendar, preflight, next_race.
+// With a delta token from an earlier response, career and standings come
+// back as JSON Patches.
+async function loadDashboard(fields) {
     try {
-        const r = await fetch('/api/config');
-        config  = await r.json();
-    } catch (e) { console.error('loadConfig', e); }
+        const params = new URLSearchParams();
+        if (fields) params.set('fields', fields.join(','));
+        if (dashboardToken != null) params.set('since', dashboardToken);
+        const r = await fetch('/api/dashboard?' + params);
+        if (!applyDashboard(await r.json())) {
+            // Patch did not apply to what we hold — start over with full sections
+            dashboardToken = null;
+            params.delete('since');
+            const full = await fetch('/api/dashboard?' + params);
+            applyDashboard(await full.json());
+        }
+    } catch (e) { console.error('loadDashboard', e); }
 }
-async function loadAllStandings() {
-    try {
-        const r       = await fetch('/api/all-standings');
-        const d       = await r.json();
-        // allStandings[tier_key] = { drivers: [...], teams: [...] }
-        allStandings  = d.all_standings || {};
-        tierProgress  = d.tier_progress || {};
+function applyDashboard(d) {
+    if (d.patches) {
+        try {
+            if (d.patches.career)    d.career    = applyJsonPatch(career, d.patches.career);
+            if (d.patches.standings) d.standings = applyJsonPatch(standingsData, d.patches.standings);
+        } catch (e) {
+            console.warn('applyDashboard: patch failed', e);
+            return false;
+        }
+    }
+    if ('career' in d)   career = d.career;
+    if ('config' in d)   config = d.config;
+    if ('standings' in d) {
+        standingsData = d.standings;
+        allStandings  = Object.assign({}, d.standings.all_standings || {});
+        tierProgress  = d.standings.tier_progress || {};
         standingsTier = career ? (career.tier || 0) : 0;
         standings     = (allStandings[tierKey(standingsTier)] || {}).drivers || [];
-    } catch (e) { console.error('loadAllStandings', e); }
-}
-async function loadCalendar() {
-    try {
-        const r  = await fetch('/api/season-calendar');
-        calendar = await r.json();
-    } catch (e) { console.error('loadCalendar', e); }
+    }
+    if ('calendar' in d)  calendar = d.calendar;
+    if ('preflight' in d) seasonPreflight = d.preflight;
+    if ('next_race' in d) nextRacePreview = d.next_race;
+    if ('revision' in d)  dashboardRevision = d.revision;
+    if ('delta_token' in d) dashboardToken = d.delta_token;
+    return true;
+}
+// RFC 6902 add / remove / replace / move plus the compact 'rows' op (the
+// operations json_patch.py produces).  Patches *doc* in place and returns it
+// (or the new root).
+function applyJsonPatch(doc, ops) {
+    if (doc == null) throw new Error('no base document');
+    const tokensOf = path => path.split('/').slice(1).map(t => t.replace(/~1/g, '/').replace(/~0/g, '~'));
+    const apply = (kind, path, value) => {
+        const tokens = tokensOf(path);
+        if (!tokens.length) {
+            if (kind === 'remove') throw new Error('cannot remove the root');
+            doc = value;
+            return undefined;
+        }
+        const last = tokens.pop();
+        let target = doc;
+        for (const t of tokens) {
+            target = target[Array.isArray(target) ? Number(t) : t];
+            if (target == null || typeof target !== 'object') throw new Error('bad path ' + path);
+        }
+        if (Array.isArray(target)) {
+            const i = last === '-' ? target.length : Number(last);
+            if (!(i >= 0 && i <= target.length - (kind === 'add' ? 0 : 1))) throw new Error('bad index ' + path);
+            if (kind === 'add') target.splice(i, 0, value);
+            else if (kind === 'remove') return target.splice(i, 1)[0];
+            else target[i] = value;
+        } else {
+            if (kind !== 'add' && !(last in target)) throw new Error('bad path ' + path);
+            if (kind === 'remove') { const v = target[last]; delete target[last]; return v; }
+            target[last] = value;
+        }
+        return undefined;
+    };
+    for (const op of ops) {
+        if (op.op === 'move') apply('add', op.path, apply('remove', op.from));
+        else if (op.op === 'rows') {
+            const tokens = tokensOf(op.path);
+            let rows = doc;
+            for (const t of tokens) rows = rows == null ? rows : rows[Array.isArray(rows) ? Number(t) : t];
+            if (!Array.isArray(rows)) throw new Error('bad rows path ' + op.path);
+            if (op.order) {
+                const old = rows.slice();
+                op.order.forEach((j, i) => {
+                    if (!(j in old)) throw new Error('bad rows order ' + op.path);
+                    rows[i] = old[j];
+                });
+            }
+            for (const [col, values] of Object.entries(op.set)) {
+                if (values.length !== rows.length) throw new Error('bad rows column ' + col);
+                rows.forEach((row, i) => { row[col] = values[i]; });
+            }
+        }
+        else if (op.op === 'add' || op.op === 'remove' || op.op === 'replace') apply(op.op, op.path, op.value);
+        else throw new Error('unsupported op ' + op.op);
+    }
+    return doc;
 }
-async function loadNextRacePreview() {
-    try {
-        if (!career || career.contracts || career.final_position != null) return;
-        const r = await fetch('/api/next-race');
-        nextRacePreview = await r.json();
-    } catch (e) { nextRacePreview = null; }
+function _takeDashboardBootstrap() {
+    const el = document.getElementById('dashboard-bootstrap');
+    if (!el) return null;
+    el.remove();
+    try { return JSON.parse(el.textContent); } catch (e) { return null; }
 }
 
 // ── Full refresh ───────────────────────────────────────────────────────────
@@ -315,9 +413,19 @@ function renderCalendar() {
 
     let nextRound = null;
 
+    // Rounds whose track is not installed (from /api/preflight-season)
+    const missing = {};
+    ((seasonPreflight && seasonPreflight.rounds) || []).forEach(p => {
+        if (!p.ok) missing[p.round] = p.issues.map(i => i.msg).join('\n');
+    });
+
     calendar.forEach(r => {
         const pill = document.createElement('div');
         pill.className = 'round-pill ' + r.status;
+        if (r.status !== 'completed' && missing[r.round]) {
+            pill.classList.add('missing-content');
+            pill.title = missing[r.round];
+        }
 
         // Circle icon: ✓ done | ► next | round number upcoming
         const icon = r.status === 'completed' ? '✓' : r.status === 'next' ? '▶' : r.round;
@@ -376,8 +484,30 @@ function updateTierTabLabels() {
     });
 }
 
-function switchStandingsTier(idx) {
+// Tiers other than the player's are fetched when their tab is first opened
+// and reused until the career revision changes.
+async function ensureTierStandings(tk) {
+    if (allStandings[tk]) return;
+    const cached = tierStandingsCache[tk];
+    if (cached && cached.revision === dashboardRevision) {
+        allStandings[tk] = cached.data;
+        return;
+    }
+    try {
+        const r = await fetch('/api/standings/' + encodeURIComponent(tk));
+        if (!r.ok) return;
+        const d = await r.json();
+        const data = { drivers: d.drivers || [], teams: d.teams || [] };
+        tierStandingsCache[tk] = { revision: d.revision, data };
+        allStandings[tk] = data;
+        if (d.progress) tierProgress[tk] = d.progress;
+    } catch (e) { console.error('ensureTierStandings', e); }
+}
+
+async function switchStandingsTier(idx) {
     standingsTier = idx;
+    await ensureTierStandings(tierKey(idx));
+    if (standingsTier !== idx) return;  // another tab was clicked meanwhile
     standings     = (allStandings[tierKey(idx)] || {}).drivers || [];
     const playerTier = career ? (career.tier || 0) : 0;
     updateTierTabLabels();
@@ -457,7 +587,7 @@ function renderStandings() {
                 : ' onclick="showDriverProfile(\'' + driverName + '\',\'' + (s.car || '') + '\',' + (s.skin_index || 0) + ')"')
             : ' onclick="showTeamProfile(\'' + teamName + '\',\'' + (s.car || '') + '\')"';
         const liveryImg = s.car != null
-            ? '<img class="livery-swatch" src="/api/livery-preview?car=' +
+            ? '<img class="livery-swatch" src="/api/livery-preview?size=sm&car=' +
               encodeURIComponent(s.car) + '&index=' + skinIdxForRow +
               '" onerror="this.style.display=\'none\'" alt="">'
             : '';
@@ -472,6 +602,7 @@ function renderStandings() {
             '</tr>'
         );
     }).join('');
+    if (champMode === 'drivers') prefetchDriverProfiles(data.filter(s => !s.is_player).map(s => s.driver));
 }
 
 // ── Setup ──────────────────────────────────────────────────────────────────
@@ -487,7 +618,9 @@ async function checkSetup() {
             if (input) input.value = d.path || d.default_hint || '';
             document.getElementById('setup-overlay').classList.remove('hidden');
         }
+        return !!d.auto_detected;
     } catch (e) { /* server not ready yet, ignore */ }
+    return false;
 }
 
 async function browseSetupFolder() {
@@ -508,9 +641,7 @@ async function confirmSetup() {
         const d = await r.json();
         if (d.status === 'success') {
             document.getElementById('setup-overlay').classList.add('hidden');
-            await Promise.all([loadCareer(), loadConfig()]);
-            await Promise.all([loadAllStandings(), loadCalendar()]);
-            loadNextRacePreview().then(() => renderCalendar());
+            await loadDashboard();
             refresh();
             showToast('Assetto Corsa found!');
         } else {
@@ -582,6 +713,7 @@ function openConfig() {
 
     pathEl.value  = paths.ac_install || '';
     if (hint) hint.textContent = '';
+    document.getElementById('s-retention').checked = !!(config.retention && config.retention.enabled);
 
     // Race conditions toggles (stored in career_settings, default ON)
     const cs = (career && career.career_settings) || {};
@@ -646,7 +778,7 @@ async function loadNewsTicker() {
     const items = document.getElementById('news-ticker-items');
     if (!card || !items) return;
     try {
-        const news = await fetch('/api/paddock-news').then(r => r.json());
+        const news = (await fetch('/api/paddock-news?limit=10').then(r => r.json())).items;
         if (!news || news.length === 0) { card.style.display = 'none'; return; }
         // Show only the 4 most recent, skip standings_update (they're boring on main page)
         const filtered = news.filter(n => n.type !== 'standings_update').slice(0, 4);
@@ -659,28 +791,52 @@ async function loadNewsTicker() {
     } catch (e) { card.style.display = 'none'; }
 }
 
-async function loadPaddockNews() {
+// Paddock feed is fetched one page at a time; "Load more" follows next_cursor
+const PADDOCK_PAGE = 30;
+let paddockCursor = null;
+let paddockLastHeader = '';
+
+function _paddockNewsHtml(items) {
+    let html = '';
+    for (const item of items) {
+        const header = item.race > 0
+            ? `Season ${item.season}, Race ${item.race}`
+            : `Season ${item.season}, Pre-Season`;
+        if (header !== paddockLastHeader) {
+            html += `<div class="news-header">${header}</div>`;
+            paddockLastHeader = header;
+        }
+        const icon = _TICKER_ICONS[item.icon] || '📌';
+        html += `<div class="news-item">
+            <span class="news-icon">${icon}</span>
+            <span class="news-text">${item.text}</span>
+        </div>`;
+    }
+    return html;
+}
+
+async function loadPaddockNews(more = false) {
     const feed = document.getElementById('paddock-feed');
     if (!feed) return;
     try {
-        const news = await fetch('/api/paddock-news').then(r => r.json());
-        let html = '';
-        let lastHeader = '';
-        for (const item of news) {
-            const header = item.race > 0
-                ? `Season ${item.season}, Race ${item.race}`
-                : `Season ${item.season}, Pre-Season`;
-            if (header !== lastHeader) {
-                html += `<div class="news-header">${header}</div>`;
-                lastHeader = header;
-            }
-            const icon = _TICKER_ICONS[item.icon] || '📌';
-            html += `<div class="news-item">
-                <span class="news-icon">${icon}</span>
-                <span class="news-text">${item.text}</span>
-            </div>`;
+        let url = '/api/paddock-news?limit=' + PADDOCK_PAGE;
+        if (more && paddockCursor) url += '&cursor=' + encodeURIComponent(paddockCursor);
+        const page = await fetch(url).then(r => r.json());
+        if (!more) paddockLastHeader = '';
+        paddockCursor = page.next_cursor;
+        const html = _paddockNewsHtml(page.items || []);
+        const moreBtn = paddockCursor
+            ? '<button class="btn btn-secondary paddock-more" onclick="loadPaddockNews(true)">Load more</button>'
+            : '';
+        if (more) {
+            const old = feed.querySelector('.paddock-more');
+            if (old) old.remove();
+            feed.insertAdjacentHTML('beforeend', html + moreBtn);
+        } else {
+            feed.innerHTML = html
+                ? html + moreBtn
+                : '<p class="muted">No news yet. Complete some races first.</p>';
         }
-        feed.innerHTML = html || '<p class="muted">No news yet. Complete some races first.</p>';
     } catch (e) {
         feed.innerHTML = '<p class="muted">Could not load paddock news.</p>';
     }
@@ -792,6 +948,31 @@ function nationalityFlag(code) { return NATIONALITY_FLAGS[code] || '🏁'; }
 const TIER_LABELS = {mx5_cup:'MX5 Cup', gt4:'GT4', gt3:'GT3', wec:'WEC'};
 let _driverProfileData = null;
 
+// Profile cards by driver name for one career revision (/api/driver-profiles)
+let driverProfileCache = { revision: null, profiles: {} };
+let _profilePrefetchTimer = null;
+
+async function fetchDriverProfiles(names) {
+    if (driverProfileCache.revision !== dashboardRevision) {
+        driverProfileCache = { revision: dashboardRevision, profiles: {} };
+    }
+    const missing = names.filter(n => n && !(n in driverProfileCache.profiles));
+    if (missing.length) {
+        const r = await fetch('/api/driver-profiles?names=' + missing.map(encodeURIComponent).join(','));
+        const d = await r.json();
+        if (d.profiles) Object.assign(driverProfileCache.profiles, d.profiles);
+    }
+    return driverProfileCache.profiles;
+}
+
+// Resolve the visible standings page in one request once the table settles
+function prefetchDriverProfiles(names) {
+    clearTimeout(_profilePrefetchTimer);
+    _profilePrefetchTimer = setTimeout(() => {
+        fetchDriverProfiles(names).catch(e => console.warn('prefetchDriverProfiles', e));
+    }, 400);
+}
+
 function _setDeltaBadge(id, value) {
     const el = document.getElementById(id);
     if (!el) return;
@@ -824,8 +1005,8 @@ async function showDriverProfile(name, car, skinIndex) {
                 liveryEl.classList.add('hidden');
             }
         }
-        const r    = await fetch('/api/driver-profile?name=' + encodeURIComponent(name));
-        const data = await r.json();
+        const data = (await fetchDriverProfiles([name]))[name];
+        if (!data) throw new Error('no profile for ' + name);
         const p    = data.profile  || {};
         const cur  = data.current  || null;
         const hist = (data.history && data.history.seasons) ? data.history.seasons : [];
@@ -1024,13 +1205,14 @@ let wizardState = {
     customTracks:  null,   // null = use config defaults
     scannedTracks: [],
     selectedIds:   new Set(),
+    trackFilter:   'all',
 };
 
 function openNewCareer() {
     // Reset state
     wizardState = {
         page: 1, difficulty: 'pro', weatherMode: 'realistic',
-        customTracks: null, scannedTracks: [], selectedIds: new Set(),
+        customTracks: null, scannedTracks: [], selectedIds: new Set(), trackFilter: 'all',
     };
     showWizardPage(1);
     // Reset preset selections
@@ -1084,12 +1266,88 @@ function selectPreset(type, val, el) {
     else                 wizardState.weatherMode = val;
 }
 
+function _configDefaultTrackIds() {
+    const defaults = new Set();
+    if (config && config.tiers) {
+        Object.values(config.tiers).forEach(t => (t.tracks || []).forEach(id => defaults.add(id)));
+    }
+    return defaults;
+}
+
 async function scanLibrary() {
     const btn = document.getElementById('btn-scan-lib');
     btn.disabled = true;
     document.getElementById('scan-loading').classList.remove('hidden');
     document.getElementById('scan-results').classList.add('hidden');
     document.getElementById('btn-start-wizard').style.display = 'none';
+    wizardState.scannedTracks = [];
+    wizardState.selectedIds   = new Set();
+    try {
+        const r = await fetch('/api/scan-content/start', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: '{}',
+        });
+        const d = await r.json();
+        if (!r.ok || !d.job) { showToast(d.error || d.message || 'Scan failed', 'error'); _scanDone(); return; }
+        if (!window.EventSource) { await _scanLibraryBlocking(); return; }
+        _followScan(d.job.id);
+    } catch (e) {
+        showToast('Scan failed: ' + e.message, 'error');
+        _scanDone();
+    }
+}
+
+// Tracks arrive in batches while the scan runs; the checklist is usable
+// immediately and keeps the player's ticks as more tracks are added.
+function _followScan(jobId) {
+    const defaults = _configDefaultTrackIds();
+    const label    = document.querySelector('#scan-loading span');
+    let renderTimer = null;
+    const render = () => {
+        renderTimer = null;
+        renderTrackChecklist(wizardState.trackFilter || 'all');
+        _updateTrackCount();
+    };
+
+    const es = new EventSource('/api/scan-content/stream?job=' + encodeURIComponent(jobId));
+    es.onmessage = ev => {
+        const msg = JSON.parse(ev.data);
+        const tracks = (msg.items || []).filter(i => i.type === 'track');
+        tracks.forEach(t => {
+            wizardState.scannedTracks.push({ id: t.id, name: t.name, length: t.length });
+            if (defaults.has(t.id)) wizardState.selectedIds.add(t.id);
+        });
+        const p = msg.progress || {};
+        if (p.total) label.textContent = 'Scanning AC content folder… ' + p.done + '/' + p.total;
+        if (tracks.length) {
+            document.getElementById('scan-results').classList.remove('hidden');
+            document.getElementById('btn-start-wizard').style.display = '';
+            if (!renderTimer) renderTimer = setTimeout(render, 250);
+        }
+    };
+    es.addEventListener('done', ev => {
+        es.close();
+        if (renderTimer) clearTimeout(renderTimer);
+        const data = JSON.parse(ev.data);
+        // Final list is length-sorted; ticks made during the scan survive
+        wizardState.scannedTracks = data.tracks || [];
+        _showScanResults();
+        _scanDone();
+    });
+    es.addEventListener('failed', ev => {
+        es.close();
+        showToast('Scan failed: ' + JSON.parse(ev.data).error, 'error');
+        _scanDone();
+    });
+    es.onerror = () => {
+        if (es.readyState === EventSource.CLOSED) return;
+        es.close();
+        _scanLibraryBlocking().catch(e => { showToast('Scan failed: ' + e.message, 'error'); _scanDone(); });
+    };
+}
+
+async function _scanLibraryBlocking() {
     try {
         const r    = await fetch('/api/scan-content');
         const data = await r.json();
@@ -1098,27 +1356,32 @@ async function scanLibrary() {
         wizardState.scannedTracks = data.tracks || [];
 
         // Pre-select tracks that match the current config defaults
-        const defaults = new Set();
-        if (config && config.tiers) {
-            Object.values(config.tiers).forEach(t => (t.tracks || []).forEach(id => defaults.add(id)));
-        }
+        const defaults = _configDefaultTrackIds();
         wizardState.selectedIds = new Set(
             wizardState.scannedTracks.map(t => t.id).filter(id => defaults.has(id))
         );
-
-        renderTrackChecklist('all');
-        document.getElementById('scan-results').classList.remove('hidden');
-        document.getElementById('btn-start-wizard').style.display = '';
-        _updateTrackCount();
-    } catch (e) {
-        showToast('Scan failed: ' + e.message, 'error');
+        _showScanResults();
     } finally {
-        document.getElementById('scan-loading').classList.add('hidden');
-        btn.disabled = false;
+        _scanDone();
     }
 }
 
+function _showScanResults() {
+    renderTrackChecklist(wizardState.trackFilter || 'all');
+    document.getElementById('scan-results').classList.remove('hidden');
+    document.getElementById('btn-start-wizard').style.display = '';
+    _updateTrackCount();
+}
+
+function _scanDone() {
+    const loading = document.getElementById('scan-loading');
+    loading.classList.add('hidden');
+    loading.querySelector('span').textContent = 'Scanning AC content folder…';
+    document.getElementById('btn-scan-lib').disabled = false;
+}
+
 function filterTracks(filter, btn) {
+    wizardState.trackFilter = filter;
     document.querySelectorAll('.scan-filter-btn').forEach(b => b.classList.remove('active'));
     btn.classList.add('active');
     renderTrackChecklist(filter);
@@ -1193,9 +1456,7 @@ async function startCareerFromWizard() {
         const d = await r.json();
         closeModal('modal-new-career');
         if (d.status === 'success') {
-            await Promise.all([loadCareer(), loadConfig()]);
-            await Promise.all([loadAllStandings(), loadCalendar()]);
-            loadNextRacePreview().then(() => renderCalendar());
+            await loadDashboard();
             refresh();
             showView('main');
             showToast('Career started! Good luck, ' + name + '! \uD83C\uDFC1');
@@ -1230,9 +1491,9 @@ async function goToContracts() {
     }
     // End-season not yet processed — trigger it now
     try {
-        const r = await fetch('/api/end-season', { method: 'POST' });
+        const r = await postCareer('/api/end-season');
         const d = await r.json();
-        await Promise.all([loadCareer(), loadAllStandings(), loadCalendar()]);
+        await loadDashboard(['career', 'standings', 'calendar', 'preflight']);
         refresh();
         _pendingContracts = d.contracts || [];
         _lastRecap = d.recap
@@ -1344,8 +1605,35 @@ function resumeResultCheckOnReturn() {
 document.addEventListener('visibilitychange', resumeResultCheckOnReturn);
 window.addEventListener('focus', resumeResultCheckOnReturn);
 
+// ── Live telemetry (SSE) while waiting for the result ───────────────────────
+let _liveSource = null;
+function startLiveTelemetry() {
+    const el = document.getElementById('live-telemetry');
+    if (!el || !window.EventSource || _liveSource) return;
+    _liveSource = new EventSource('/api/live/stream');
+    _liveSource.onmessage = (ev) => {
+        const s = JSON.parse(ev.data);
+        const p = s.player;
+        if (!s.connected || !p) { el.classList.add('hidden'); return; }
+        const total = s.expected_laps ? '/' + s.expected_laps : '';
+        const parts = ['Lap ' + Math.min(p.lap_count + 1, s.expected_laps || Infinity) + total];
+        if (s.position) parts.push('P' + s.position + (s.cars ? '/' + s.cars : ''));
+        if (p.last_lap_ms) parts.push('last ' + fmtMs(p.last_lap_ms));
+        if (p.best_lap_ms) parts.push('best ' + fmtMs(p.best_lap_ms));
+        if (s.finished) parts.unshift('🏁 Provisional');
+        el.innerHTML = '<span class="live-dot"></span>' + parts.join(' · ');
+        el.classList.remove('hidden');
+    };
+}
+function stopLiveTelemetry() {
+    if (_liveSource) { _liveSource.close(); _liveSource = null; }
+    const el = document.getElementById('live-telemetry');
+    if (el) el.classList.add('hidden');
+}
+
 function startResultPolling() {
     if (_resultPollTimer) clearInterval(_resultPollTimer);
+    startLiveTelemetry();
     let attempts = 0;
     const statusEl = document.getElementById('result-auto-status');
     if (statusEl) {
@@ -1357,6 +1645,7 @@ function startResultPolling() {
         if (attempts > POLL_MAX_ATTEMPTS) {
             clearInterval(_resultPollTimer);
             _resultPollTimer = null;
+            stopLiveTelemetry();
             if (statusEl) {
                 statusEl.textContent = 'Timed out. Click the button to try again.';
                 statusEl.className   = 'result-auto-status warning';
@@ -1369,6 +1658,7 @@ function startResultPolling() {
             if (d.status === 'found' || d.status === 'incomplete') {
                 clearInterval(_resultPollTimer);
                 _resultPollTimer = null;
+                stopLiveTelemetry();
                 fetchRaceResult();   // reuse existing display logic
             }
         } catch (_) { /* network hiccup — keep polling */ }
@@ -1378,11 +1668,7 @@ function startResultPolling() {
 async function confirmStartRace(mode) {
     mode = mode || 'race_only';
     try {
-        const r = await fetch('/api/start-race', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ mode }),
-        });
+        const r = await postCareer('/api/start-race', { mode });
         const d = await r.json();
         closeModal('modal-race');
 
@@ -1429,6 +1715,7 @@ async function fetchRaceResult() {
         const d = await r.json();
 
         if (d.status === 'found') {
+            stopLiveTelemetry();
             document.getElementById('rf-position').textContent = 'P' + d.position;
             document.getElementById('rf-best-lap').textContent = d.best_lap || '–';
             document.getElementById('rf-laps').textContent     = d.laps_completed + ' / ' + d.expected_laps;
@@ -1481,6 +1768,7 @@ function renderDebrief(analysis, position) {
     // Lap sparkline (mini bar chart)
     const lapsEl = document.getElementById('debrief-laps');
     const laps   = analysis.lap_times || [];
+    const lapNos = analysis.lap_numbers || [];   // server-downsampled for long races
     if (lapsEl && laps.length >= 2) {
         const minLt = Math.min(...laps);
         const maxLt = Math.max(...laps);
@@ -1489,12 +1777,12 @@ function renderDebrief(analysis, position) {
             const pct    = 100 - Math.round(((lt - minLt) / range) * 75); // 25–100%
             const isBest = (lt === minLt);
             return '<div class="lap-bar' + (isBest ? ' lap-bar-best' : '') +
-                   '" style="height:' + pct + '%" title="Lap ' + (i + 1) + ': ' + fmtMs(lt) + '"></div>';
+                   '" style="height:' + pct + '%" title="Lap ' + (lapNos[i] || i + 1) + ': ' + fmtMs(lt) + '"></div>';
         }).join('');
         lapsEl.innerHTML =
             '<div class="lap-bars">' + bars + '</div>' +
             '<div class="lap-sparkline-label">' +
-            laps.length + ' laps &nbsp;·&nbsp; &#9650; taller = faster &nbsp;·&nbsp; best: ' + fmtMs(minLt) +
+            (analysis.lap_count || laps.length) + ' laps &nbsp;·&nbsp; &#9650; taller = faster &nbsp;·&nbsp; best: ' + fmtMs(minLt) +
             ' &nbsp;·&nbsp; avg: ' + fmtMs(analysis.avg_lap_ms) +
             '</div>';
     } else if (lapsEl) {
@@ -1504,14 +1792,27 @@ function renderDebrief(analysis, position) {
     // Sector breakdown (S1/S2/S3 best + avg, weakest highlighted)
     const secEl = document.getElementById('debrief-sectors');
     const sa    = analysis.sector_analysis;
+    const sd    = analysis.sector_deltas || [];
     if (secEl && sa && sa.length === 3) {
         const labels = ['S1', 'S2', 'S3'];
+        const fmtDelta = ms => (ms > 0 ? '+' : ms < 0 ? '−' : '±') + (Math.abs(ms) / 1000).toFixed(3);
         secEl.innerHTML = sa.map((s, i) => {
             const isWeak = (analysis.weakest_sector === i + 1);
+            const d      = sd[i] || {};
+            let deltas = '';
+            if (d.to_top5_ms !== undefined) {
+                deltas += '<div class="sector-delta' + (d.to_top5_ms <= 0 ? ' sector-delta-gain' : '') +
+                          '" title="vs average of top-5 finishers">top5 ' + fmtDelta(d.to_top5_ms) + '</div>';
+            }
+            if (d.to_class_best_ms !== undefined) {
+                deltas += '<div class="sector-delta' + (d.to_class_best_ms <= 0 ? ' sector-delta-gain' : '') +
+                          '" title="vs best car of the same class">class ' + fmtDelta(d.to_class_best_ms) + '</div>';
+            }
             return '<div class="sector-card' + (isWeak ? ' sector-weak' : '') + '">' +
                 '<div class="sector-label">' + labels[i] + (isWeak ? ' ⚠' : '') + '</div>' +
                 '<div class="sector-best">' + fmtMs(s.best_ms) + '</div>' +
                 '<div class="sector-avg">avg ' + fmtMs(s.avg_ms) + '</div>' +
+                deltas +
                 '</div>';
         }).join('');
         secEl.classList.remove('hidden');
@@ -1526,6 +1827,13 @@ function renderDebrief(analysis, position) {
         if (analysis.gap_to_leader_ms) {
             parts.push('⏱ +' + fmtMs(analysis.gap_to_leader_ms) + ' to leader');
         }
+        if (analysis.theoretical_best_ms) {
+            parts.push('◎ ideal ' + fmtMs(analysis.theoretical_best_ms));
+        }
+        if (analysis.degradation && analysis.degradation.trend !== 'stable') {
+            const slope = analysis.degradation.slope_ms_per_lap;
+            parts.push((slope > 0 ? '📉 +' : '📈 −') + (Math.abs(slope) / 1000).toFixed(2) + 's/lap');
+        }
         if (analysis.tyre) {
             parts.push('🏎 ' + analysis.tyre);
         }
@@ -1588,11 +1896,8 @@ async function submitResult(e) {
 
 async function _postFinishRace(pos, lapTime, marginMs) {
     try {
-        const r = await fetch('/api/finish-race', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ position: pos, lap_time: lapTime, margin_ms: marginMs }),
-        });
+        const r = await postCareer('/api/finish-race',
+            { position: pos, lap_time: lapTime, margin_ms: marginMs });
         const d = await r.json();
 
         if (d.status === 'season_complete') {
@@ -1601,8 +1906,7 @@ async function _postFinishRace(pos, lapTime, marginMs) {
             const pts = d.result ? d.result.points : 0;
             const aiMsg = d.ai_change ? (' AI ' + (d.ai_change > 0 ? '+' : '') + d.ai_change + ' (offset ' + d.ai_offset + ')') : '';
             showToast(fmtPos(pos) + ' — +' + pts + ' pts!' + aiMsg);
-            await Promise.all([loadCareer(), loadAllStandings(), loadCalendar()]);
-            loadNextRacePreview().then(() => renderCalendar());
+            await loadDashboard(['career', 'standings', 'calendar', 'preflight', 'next_race']);
             refresh();
             loadNewsTicker();
             showView('main');
@@ -1617,7 +1921,7 @@ let _pendingContracts = [];
 let _lastRecap = null;  // cached for End Season button re-entry
 
 async function handleSeasonComplete(data) {
-    await Promise.all([loadCareer(), loadAllStandings(), loadCalendar()]);
+    await loadDashboard(['career', 'standings', 'calendar', 'preflight']);
     refresh();
     loadNewsTicker();
 
@@ -1734,19 +2038,13 @@ function renderContracts(contracts) {
 
 async function acceptContract(contractId) {
     try {
-        const r = await fetch('/api/accept-contract', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ contract_id: contractId }),
-        });
+        const r = await postCareer('/api/accept-contract', { contract_id: contractId });
         const d = await r.json();
         if (d.status === 'success') {
             _lastRecap = null;
             _pendingContracts = [];
             showToast('Welcome to ' + d.new_team + '! 🏎');
-            await Promise.all([loadCareer(), loadConfig()]);
-            await Promise.all([loadAllStandings(), loadCalendar()]);
-            loadNextRacePreview().then(() => renderCalendar());
+            await loadDashboard();
             refresh();
             loadNewsTicker();
             showView('main');
@@ -1766,6 +2064,48 @@ async function browseAcFolder() {
     }
 }
 
+// Bulk import of historical AC results — runs as a background job
+async function importPastResults() {
+    const btn  = document.getElementById('s-import-btn');
+    const hint = document.getElementById('s-import-hint');
+    btn.disabled = true;
+    try {
+        const r = await fetch('/api/import-results', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: '{}',
+        });
+        const d = await r.json();
+        if (!r.ok || !d.job) {
+            hint.textContent = d.message || 'Import failed';
+            btn.disabled = false;
+            return;
+        }
+        const jobId = d.job.id;
+        const poll = async () => {
+            const j = await (await fetch('/api/jobs/' + jobId)).json();
+            const p = j.progress || {};
+            if (j.status === 'running') {
+                hint.textContent = 'Importing… ' + (p.done || 0) + '/' + (p.total || '?') + ' files';
+                setTimeout(poll, 500);
+                return;
+            }
+            btn.disabled = false;
+            if (j.status === 'error') {
+                hint.textContent = 'Import failed: ' + j.error;
+            } else {
+                const res = j.result || {};
+                hint.textContent = res.races_imported + ' races imported (' +
+                    res.files + ' files, ' + res.already_known + ' already known)';
+            }
+        };
+        poll();
+    } catch (e) {
+        hint.textContent = 'Import failed';
+        btn.disabled = false;
+    }
+}
+
 async function saveSettings() {
     const aiLevel        = parseFloat(document.getElementById('s-ai-level').value);
     const aiVar          = parseFloat(document.getElementById('s-ai-var').value);
@@ -1780,6 +2120,8 @@ async function saveSettings() {
     updated.difficulty.ai_variance   = aiVar;
     // races_per_tier is now auto-derived from track list length — not saved here
     if (acPath) updated.paths.ac_install = acPath;
+    updated.retention = Object.assign({}, updated.retention || {},
+        { enabled: document.getElementById('s-retention').checked });
 
     try {
         const [r1, r2] = await Promise.all([
@@ -1788,11 +2130,8 @@ async function saveSettings() {
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify(updated),
             }),
-            fetch('/api/career-settings', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ dynamic_weather: dynamicWeather, night_cycle: nightCycle }),
-            }),
+            postCareer('/api/career-settings',
+                { dynamic_weather: dynamicWeather, night_cycle: nightCycle }),
         ]);
         const d = await r1.json();
         if (d.status === 'success') {
@@ -6,18 +6,11 @@ Run with venv active:
     venv/Scripts/python.exe take_screenshots.py
 """
 
-import json, os, shutil, sys, threading, time
-import types
-
-# ── Mock pywebview so Flask can start without a real window ─────────────────
-mock_wv = types.ModuleType('webview')
-mock_wv.FOLDER_DIALOG = 0
-class _Win:
-    def create_file_dialog(self, *a, **kw): return None
-mock_wv.windows = [_Win()]
-sys.modules['webview'] = mock_wv
+import json, os, shutil, sys
 
+# Importing app pulls in no GUI modules (pywebview is only used by its GUI entry point)
 from app import app
+from embedded_server import EmbeddedServer
 
 CAREER_DATA_PATH = os.path.join(os.path.dirname(__file__), 'career_data.json')
 OUT = os.path.join(os.path.dirname(__file__), 'docs', 'screenshots')
@@ -131,10 +124,7 @@ def restore():
 
 # ── Start Flask in background ───────────────────────────────────────────────
 write_demo()
-t = threading.Thread(target=lambda: app.run(host='127.0.0.1', port=5000,
-                                             debug=False, use_reloader=False), daemon=True)
-t.start()
-time.sleep(2)
+server = EmbeddedServer(app, port=5000, fallback_to_free_port=False).start()
 print("Flask started")
 
 # ── Playwright ──────────────────────────────────────────────────────────────
@@ -0,0 +1,135 @@
+"""
+Thumbnails — downscaled livery previews cached on disk.
+
+Skin preview.jpg files are often 1–2 MB at 1920×1080, while the standings
+swatch is 56×32 and the profile / team modals are at most ~460 px wide.
+ThumbnailCache renders each preview once per size into
+<user data dir>/thumbnails/ and hands back the cached file afterwards.
+
+Cache files are named after the source path, its mtime and the size, so a
+re-installed skin produces a new file; stale variants of the same source
+are removed when the new one is written.
+
+Pillow is optional (it is only needed here and for make_icon.py): without
+it thumbnail() returns the original preview path and callers serve that.
+"""
+
+import hashlib
+import os
+import threading
+
+# Pillow is imported on first use (it is the slowest import at start-up);
+# None once it turned out not to be installed — originals are served then
+_PIL_UNSET = object()
+_Image = _PIL_UNSET
+
+# name → (max width, max height); 2× the CSS box for HiDPI screens.
+SIZES = {
+    'sm': (112, 64),    # standings swatch
+    'md': (640, 360),   # driver / team / player profile modals
+}
+DEFAULT_SIZE = 'md'
+
+JPEG_QUALITY = 82
+
+
+def _pil_image():
+    global _Image
+    if _Image is _PIL_UNSET:
+        try:
+            from PIL import Image
+        except ImportError:     # Pillow not installed — serve originals
+            Image = None
+        _Image = Image
+    return _Image
+
+
+def available():
+    return _pil_image() is not None
+
+
+class ThumbnailCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._pending = {}      # cache path → Lock while it is being rendered
+        self._failed = set()    # cache paths whose source could not be decoded
+
+    def _paths(self, src, size, mtime):
+        stem = hashlib.sha1(os.path.normcase(src).encode('utf-8')).hexdigest()[:16]
+        name = f'{stem}_{size}_{int(mtime)}.jpg'
+        return stem, os.path.join(self.directory, name)
+
+    def thumbnail(self, src, size=DEFAULT_SIZE):
+        """Path of the cached *size* thumbnail of *src* (rendered on first use).
+
+        Returns *src* itself when Pillow is unavailable or the image cannot be
+        decoded, and None if *src* does not exist.
+        """
+        if size not in SIZES:
+            size = DEFAULT_SIZE
+        try:
+            mtime = os.path.getmtime(src)
+        except OSError:
+            return None
+        if _pil_image() is None:
+            return src
+        stem, path = self._paths(src, size, mtime)
+        if os.path.isfile(path):
+            return path
+        if path in self._failed:
+            return src
+
+        # One render per file; concurrent requests for it wait for the first
+        with self._lock:
+            lock = self._pending.setdefault(path, threading.Lock())
+        with lock:
+            try:
+                if not os.path.isfile(path):
+                    self._render(src, path, SIZES[size])
+                    self._drop_stale(stem, size, path)
+            except (OSError, ValueError) as e:
+                print(f"Warning: thumbnail failed for {src}: {e}")
+                self._failed.add(path)
+                return src
+            finally:
+                with self._lock:
+                    self._pending.pop(path, None)
+        return path
+
+    def _render(self, src, path, box):
+        os.makedirs(self.directory, exist_ok=True)
+        Image = _pil_image()
+        with Image.open(src) as img:
+            # JPEG draft mode decodes at 1/2..1/8 scale — much cheaper than a
+            # full decode followed by a resize.
+            img.draft('RGB', box)
+            img = img.convert('RGB')
+            img.thumbnail(box, Image.LANCZOS)
+            tmp = path + '.tmp'
+            img.save(tmp, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+        os.replace(tmp, path)
+
+    def _drop_stale(self, stem, size, keep):
+        prefix = f'{stem}_{size}_'
+        try:
+            with os.scandir(self.directory) as it:
+                stale = [e.path for e in it
+                         if e.name.startswith(prefix) and e.path != keep]
+        except OSError:
+            return
+        for p in stale:
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+    def warm(self, sources, sizes=('sm',), progress=None):
+        """Render thumbnails for every source path (background-job body)."""
+        sources = list(sources)
+        for i, src in enumerate(sources, start=1):
+            for size in sizes:
+                self.thumbnail(src, size)
+            if progress:
+                progress(done=i, total=len(sources))
+        return len(sources)
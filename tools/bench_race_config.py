@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark race.ini generation (race_config.RaceConfigCompiler).
+
+Times compile() for a 19-car and a 40-car grid:
+  cold   driver table rebuilt for every launch (no save revision)
+  warm   driver table cached for the career revision (the normal launch path)
+
+Usage:
+    python tools/bench_race_config.py [--runs 2000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from career_manager import CareerManager   # noqa: E402
+from driver_data import DRIVER_NAMES       # noqa: E402
+
+
+def _fixture(mgr, cars):
+    """(race_data, career_data, grid) for a field of *cars* AI cars."""
+    tier_info = mgr.get_tier_info(2)
+    teams = tier_info['teams']
+    names = DRIVER_NAMES[:cars]
+    opponents = [{
+        'number':      i + 1,
+        'team':        teams[i % len(teams)]['name'],
+        'car':         teams[i % len(teams)]['car'],
+        'driver_name': name,
+        'skin':        f'skin_{i + 1}',
+    } for i, name in enumerate(names)]
+    career_data = {
+        'tier': 2, 'season': 3, 'team': teams[0]['name'], 'driver_name': 'Bench Driver',
+        'race_results': [{'position': 1}, {'position': 4}, {'position': 1}],
+        'form_scores': {n: 0.4 for n in names[::3]},
+        'rivalries': {'gt3': [{'drivers': names[:2], 'intensity': 4}]},
+        'team_development': {t['name']: {'rating_offset': -0.3} for t in teams[::2]},
+        'revision': 1,
+    }
+    race = {
+        'track': 'spa', 'car': teams[0]['car'], 'laps': 30, 'ai_difficulty': 92.4,
+        'weather': 'wet', 'sun_angle': 40, 'time_of_day_mult': 12,
+        'practice_minutes': 10, 'quali_minutes': 10,
+        'driver_name': 'Bench Driver', 'skin': 'skin_0', 'opponents': opponents,
+    }
+    grid = [{'name': 'PLAYER', 'is_player': True}] + [
+        {'name': o['driver_name'], 'car': o['car'], 'is_player': False} for o in opponents]
+    return race, career_data, grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(ROOT, 'config.json'), 'r', encoding='utf-8') as f:
+        mgr = CareerManager(json.load(f))
+    compiler = mgr.race_config
+
+    print(f"{'grid':>6}  {'cold µs':>9}  {'warm µs':>9}  {'bytes':>7}")
+    for cars in (19, 40):
+        race, career_data, grid = _fixture(mgr, cars)
+        # The stock field is capped at 19 AI; a bigger grid comes from the quali order
+        race['opponents'] = race['opponents'][:19] if cars <= 19 else race['opponents']
+        cold_data = dict(career_data)
+        del cold_data['revision']
+        rng = random.Random(1)
+
+        def cold():
+            compiler.compile(race, mode='full_weekend', career_data=cold_data, grid=grid, rng=rng)
+
+        def warm():
+            compiler.compile(race, mode='full_weekend', career_data=career_data, grid=grid, rng=rng)
+
+        warm()  # build the cached table
+        t_cold = min(timeit.repeat(cold, number=args.runs // 10 or 1, repeat=3)) / (args.runs // 10 or 1)
+        t_warm = min(timeit.repeat(warm, number=args.runs, repeat=3)) / args.runs
+        size = len(compiler.compile(race, mode='full_weekend', career_data=career_data,
+                                    grid=grid, rng=rng))
+        print(f"{cars + 1:>6}  {t_cold * 1e6:>9.1f}  {t_warm * 1e6:>9.1f}  {size:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
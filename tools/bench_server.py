@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent dashboard refreshes against the embedded server.
+
+Each simulated client keeps one HTTP/1.1 connection open and repeats what
+the dashboard does on a refresh: GET /api/dashboard, the news ticker page
+and the player's standings tier.  Every backend in embedded_server.py
+(waitress, Werkzeug's threaded dev server) is measured the same way:
+
+  refreshes/s   completed refreshes per second over all clients
+  p50 / p95     latency of one refresh (three requests)
+
+The app runs on a throwaway copy of the user data directory (config and
+career save), so nothing real is touched; without one a new career is
+started in the copy.
+
+Usage:
+    python tools/bench_server.py [--clients 16] [--refreshes 50] [--threads 8]
+"""
+
+import argparse
+import http.client
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from platform_paths import get_user_data_dir    # noqa: E402
+
+
+def sandbox_data_dir():
+    """Point the app at a temporary copy of the user data directory."""
+    src = get_user_data_dir()
+    tmp = tempfile.mkdtemp(prefix='ac-career-bench-')
+    os.environ['XDG_DATA_HOME'] = tmp
+    os.environ['APPDATA'] = tmp
+    dst = get_user_data_dir()
+    if os.path.isdir(src):
+        shutil.copytree(src, dst)
+    return tmp
+
+
+def _refresh_paths(app_module):
+    career_data = app_module.load_career_data()
+    tier_key = app_module.career.tiers[career_data.get('tier', 0)]
+    return ['/api/dashboard', '/api/paddock-news?limit=10', f'/api/standings/{tier_key}']
+
+
+def _client(port, paths, refreshes, latencies, errors, start):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    start.wait()
+    for _ in range(refreshes):
+        t0 = time.perf_counter()
+        for path in paths:
+            try:
+                conn.request('GET', path)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    errors.append(resp.status)
+            except (OSError, http.client.HTTPException) as e:
+                errors.append(type(e).__name__)
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def run(app_module, backend, clients, refreshes, threads):
+    from embedded_server import EmbeddedServer
+    server = EmbeddedServer(app_module.app, backend=backend, threads=threads).start()
+    paths = _refresh_paths(app_module)
+    latencies, errors = [], []
+    start = threading.Event()
+    workers = [threading.Thread(target=_client,
+                                args=(server.port, paths, refreshes, latencies, errors, start))
+               for _ in range(clients)]
+    for w in workers:
+        w.start()
+    t0 = time.perf_counter()
+    start.set()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - t0
+    server.stop()
+    latencies.sort()
+    return {
+        'rate': len(latencies) / elapsed,
+        'p50':  statistics.median(latencies) * 1000,
+        'p95':  latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'errors': len(errors),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--refreshes', type=int, default=50, help='per client')
+    parser.add_argument('--threads', type=int, default=8, help='waitress worker threads')
+    args = parser.parse_args(argv)
+
+    tmp = sandbox_data_dir()
+    try:
+        import logging
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        import app as app_module
+        import embedded_server
+        if not app_module.load_career_data().get('team'):
+            client = app_module.app.test_client()
+            client.post('/api/new-career', json={'driver_name': 'Bench Driver'},
+                        headers={'Origin': f'http://127.0.0.1:{app_module.DEFAULT_PORT}'})
+
+        print(f'{args.clients} clients x {args.refreshes} refreshes '
+              f'({len(_refresh_paths(app_module))} requests each)')
+        for backend in embedded_server.BACKENDS:
+            if backend == 'waitress' and embedded_server.waitress is None:
+                print(f'  {backend:9s}  not installed')
+                continue
+            r = run(app_module, backend, args.clients, args.refreshes, args.threads)
+            print(f"  {backend:9s}  {r['rate']:8.1f} refreshes/s   p50 {r['p50']:6.1f} ms   "
+                  f"p95 {r['p95']:6.1f} ms   errors {r['errors']}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
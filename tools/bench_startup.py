@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold start: process launch → server ready → first page served.
+
+Starts the app headless (`--headless --port 0 --startup-profile`) several
+times, as a script (python app.py) and — with --exe — as the frozen
+PyInstaller build, and reports the median of
+
+  ready   launch until the "serving on" line (server bound)
+  page    launch until GET / has been answered
+  phases  the app's own --startup-profile breakdown (median per phase)
+
+The GUI adds the toolkit and window phases on top; run the app with
+--startup-profile (no --headless) to see those.
+
+The app runs on a throwaway copy of the user data directory.
+
+Usage:
+    python tools/bench_startup.py [--runs 5] [--exe dist/AC_Career_GT_Edition.exe]
+"""
+
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_server import sandbox_data_dir    # noqa: E402  (tools/ is sys.path[0])
+
+_SERVING = re.compile(r'serving on (http://\S+)')
+_PHASE = re.compile(r'^(.+?)\s+(\d+\.\d)\s+(\d+\.\d)$')
+
+
+def _launch(cmd, timeout=60):
+    """(ready s, page s, {phase: ms}) for one cold start of *cmd*."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd + ['--headless', '--port', '0', '--startup-profile'],
+                            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, bufsize=1)
+    phases = {}
+
+    def read_profile():
+        for line in proc.stderr:
+            m = _PHASE.match(line.strip())
+            if m:
+                phases[m.group(1)] = float(m.group(2))
+
+    reader = threading.Thread(target=read_profile, daemon=True)
+    reader.start()
+    try:
+        url = None
+        for line in proc.stdout:
+            m = _SERVING.search(line)
+            if m:
+                url = m.group(1)
+                break
+        ready = time.perf_counter() - t0
+        if url is None:
+            raise RuntimeError(f'{cmd[0]} exited before serving')
+        deadline = t0 + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(url + '/', timeout=timeout) as resp:
+                    resp.read()
+                break
+            except OSError:
+                if time.perf_counter() > deadline:
+                    raise
+                time.sleep(0.01)
+        page = time.perf_counter() - t0
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    reader.join(1)
+    return ready, page, phases
+
+
+def bench(label, cmd, runs):
+    results = [_launch(cmd) for _ in range(runs)]
+    ready = statistics.median(r[0] for r in results) * 1000
+    page  = statistics.median(r[1] for r in results) * 1000
+    print(f'{label}: ready {ready:7.1f} ms   first page {page:7.1f} ms   (median of {runs})')
+    for phase in results[0][2]:
+        values = [r[2][phase] for r in results if phase in r[2]]
+        print(f'    {phase:28s} {statistics.median(values):7.1f} ms')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--exe', help='frozen build to benchmark as well')
+    parser.add_argument('--no-script', action='store_true', help='only the frozen build')
+    args = parser.parse_args(argv)
+
+    tmp = sandbox_data_dir()
+    try:
+        if not args.no_script:
+            bench('script', [sys.executable, os.path.join(ROOT, 'app.py')], args.runs)
+        if args.exe:
+            bench('frozen', [os.path.abspath(args.exe)], args.runs)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())